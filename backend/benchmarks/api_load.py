@@ -0,0 +1,423 @@
+"""
+Load test of the API hot paths against a real server and database.
+
+For each catalog size, the benchmark seeds a database with synthetic products drawn from the
+`product_data.csv` distribution (rows sampled with replacement, ±5% noise on the numeric columns)
+and three verified users, starts `uvicorn main:app` on it, waits for /ready and then drives
+every scenario at every concurrency level for a fixed duration:
+
+- login: POST /auth/login (bcrypt verification);
+- list_products: GET /products/ first page, as a dashboard refresh does;
+- list_products_filtered: GET /products/ with a random category and minimum price;
+- create_product: POST /products/ (pricing and demand model scoring, statistics upsert);
+- forecast: POST /products/forecast for a random batch of product ids.
+
+Each result reports requests/sec, p50/p95/p99 latency, the status codes and the peak resident
+memory of the server (process and children, sampled from /proc on Linux). The load generator
+runs on the same machine, so absolute numbers include its overhead; compare runs made on the
+same host.
+
+Usage (from the backend directory, after `pip install -r benchmarks/requirements.txt`):
+    python -m benchmarks.api_load run [--catalogs 1000 100000 1000000] [--concurrency 1 10 50]
+        [--duration SECONDS] [--scenarios NAME ...] [--database-url URL] [--output PATH]
+    python -m benchmarks.api_load compare BASELINE.json CURRENT.json [--threshold 0.1]
+
+`--database-url` defaults to one SQLite file per catalog size; "{products}" in the URL is
+replaced by the catalog size. Pass a PostgreSQL URL (postgresql+asyncpg://...) to test against
+a local server; its products table is emptied and reseeded for every catalog. `compare` prints
+the change of every (catalog, scenario, concurrency) result and exits with status 1 if the
+requests/sec dropped or the p95 latency grew by more than the threshold.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+# The models import the application's engine, which needs a database URL; seeding uses its own engine
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///api_benchmark.db")
+
+import httpx
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from database.config import Base
+from models.product import Product
+from models.product_stats import ProductStats
+from models.user import User, UserRole
+from services.demand_forecaster import to_demand_percentage
+from utils.bulk import bulk_insert
+from utils.password import pwd_context
+
+PASSWORD = "benchmark-password"
+USERS = {role: f"{role}@benchmark.local" for role in ("supplier", "admin", "buyer")}
+NUMERIC_COLUMNS = ["cost_price", "selling_price", "stock_available", "units_sold", "demand_forecast", "optimized_price"]
+SEED_CHUNK_SIZE = 10000
+FORECAST_BATCH_SIZE = 100
+
+
+def load_profiles(path: str) -> pd.DataFrame:
+    """
+    Reads the product rows the synthetic catalog is sampled from.
+    """
+    return pd.read_csv(path, usecols=["name", "cost_price", "selling_price", "category", "stock_available",
+                                      "units_sold", "customer_rating", "demand_forecast", "optimized_price"])
+
+
+def synthetic_products(profiles: pd.DataFrame, n: int, supplier_id: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Samples `n` products from `profiles` with ±5% noise on the numeric columns.
+
+    Returns:
+        pd.DataFrame: Product rows with ids 1..n, ready to insert.
+    """
+    rng = np.random.default_rng(seed)
+    products = profiles.sample(n, replace=True, random_state=seed).reset_index(drop=True)
+    for column in NUMERIC_COLUMNS:
+        products[column] = products[column] * rng.uniform(0.95, 1.05, size=n)
+    for column in ["stock_available", "units_sold"]:
+        products[column] = products[column].round().astype(int)
+    for column in ["cost_price", "selling_price", "optimized_price"]:
+        products[column] = products[column].round(2)
+    # The CSV holds demand in units; the products table stores it as a percentage of stock
+    products["demand_forecast"] = np.round(to_demand_percentage(products["demand_forecast"], products["stock_available"]), 2)
+    products["customer_rating"] = products["customer_rating"].astype(float)
+    ids = np.arange(1, n + 1)
+    products["name"] = products["name"] + " #" + ids.astype(str)
+    products["description"] = "Synthetic benchmark product"
+    products["supplier_id"] = supplier_id
+    products.insert(0, "id", ids)
+    return products
+
+
+async def seed_database(database_url: str, profiles: pd.DataFrame, n_products: int) -> dict:
+    """
+    Creates the schema, the benchmark users and a fresh catalog of `n_products` products.
+
+    Returns:
+        dict: The id of each benchmark user, by role.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database and os.path.exists(url.database):
+        os.remove(url.database)
+
+    engine = create_async_engine(database_url)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_factory() as db:
+        await db.execute(delete(ProductStats))
+        await db.execute(delete(Product))
+        user_ids = {}
+        for role, email in USERS.items():
+            user = (await db.execute(User.__table__.select().where(User.email == email))).first()
+            if user is None:
+                user = User(email=email, hashed_password=pwd_context.hash(PASSWORD), full_name=f"Benchmark {role}",
+                            is_verified=True, role=UserRole[role])
+                db.add(user)
+                await db.flush()
+            user_ids[role] = user.id
+        await db.commit()
+
+        products = synthetic_products(profiles, n_products, user_ids["supplier"])
+        for start in range(0, n_products, SEED_CHUNK_SIZE):
+            await bulk_insert(db, Product.__table__, products.iloc[start:start + SEED_CHUNK_SIZE].to_dict("records"))
+            await db.commit()
+        if url.get_backend_name() == "postgresql":
+            # Explicit ids do not advance the sequence used by create_product
+            await db.execute(text("SELECT setval(pg_get_serial_sequence('products', 'id'), :n)"), {"n": n_products})
+            await db.commit()
+    await engine.dispose()
+    return user_ids
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def process_tree_rss_mb(pid: int):
+    """
+    Returns the resident memory of a process and its descendants in MB, or None without /proc.
+    """
+    total_kb = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                total_kb += next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+            with open(f"/proc/{current}/task/{current}/children") as f:
+                pending.extend(int(child) for child in f.read().split())
+        except (OSError, StopIteration, ValueError):
+            if current == pid:
+                return None
+    return total_kb / 1024
+
+
+async def start_server(database_url: str, port: int, log_path: str, ready_timeout: float):
+    """
+    Starts uvicorn on `database_url` and waits until /ready reports the models as loaded.
+
+    Returns:
+        subprocess.Popen: The server process.
+    """
+    env = dict(os.environ, DATABASE_URL=database_url)
+    log = open(log_path, "w")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    deadline = time.monotonic() + ready_timeout
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError(f"The server exited during startup, see {log_path}")
+            try:
+                if (await client.get("/ready")).status_code == 200:
+                    return server
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.5)
+    server.terminate()
+    raise RuntimeError(f"The server was not ready after {ready_timeout}s, see {log_path}")
+
+
+async def login(client: httpx.AsyncClient, role: str) -> dict:
+    response = await client.post("/auth/login", data={"username": USERS[role], "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def random_product(context: dict, rng: random.Random) -> dict:
+    profile = context["profiles"][rng.randrange(len(context["profiles"]))]
+    noise = lambda value: value * rng.uniform(0.95, 1.05)
+    return {
+        "name": f"{profile['name']} (load test)",
+        "description": "Created by the load test",
+        "cost_price": round(noise(profile["cost_price"]), 2),
+        "selling_price": round(noise(profile["selling_price"]), 2),
+        "category": profile["category"],
+        "stock_available": int(round(noise(profile["stock_available"]))),
+        "units_sold": int(round(noise(profile["units_sold"]))),
+        "customer_rating": float(profile["customer_rating"]),
+    }
+
+
+async def scenario_login(client, context, rng):
+    return await client.post("/auth/login", data={"username": USERS["supplier"], "password": PASSWORD})
+
+
+async def scenario_list_products(client, context, rng):
+    return await client.get("/products/", params={"limit": 100}, headers=context["headers"]["supplier"])
+
+
+async def scenario_list_products_filtered(client, context, rng):
+    params = {"limit": 100, "category": rng.choice(context["categories"]), "min_price": rng.randint(0, 200)}
+    return await client.get("/products/", params=params, headers=context["headers"]["supplier"])
+
+
+async def scenario_create_product(client, context, rng):
+    return await client.post("/products/", json=random_product(context, rng), headers=context["headers"]["supplier"])
+
+
+async def scenario_forecast(client, context, rng):
+    product_ids = [rng.randint(1, context["products"]) for _ in range(FORECAST_BATCH_SIZE)]
+    return await client.post("/products/forecast", json={"product_ids": product_ids}, headers=context["headers"]["admin"])
+
+
+SCENARIOS = {
+    "login": scenario_login,
+    "list_products": scenario_list_products,
+    "list_products_filtered": scenario_list_products_filtered,
+    "create_product": scenario_create_product,
+    "forecast": scenario_forecast,
+}
+
+
+def percentile_ms(latencies, q):
+    return round(float(np.percentile(latencies, q) * 1000), 2) if latencies else None
+
+
+async def run_scenario(base_url: str, scenario, context: dict, concurrency: int, duration: float,
+                       server_pid: int, seed: int = 0) -> dict:
+    """
+    Sends requests from `concurrency` workers for `duration` seconds.
+
+    Returns:
+        dict: The request count, requests/sec, latency percentiles, status counts and peak RSS.
+    """
+    latencies = []
+    statuses = Counter()
+    peak_rss = [process_tree_rss_mb(server_pid)]
+    done = asyncio.Event()
+
+    async def sample_rss():
+        while not done.is_set():
+            rss = process_tree_rss_mb(server_pid)
+            if rss is not None and (peak_rss[0] is None or rss > peak_rss[0]):
+                peak_rss[0] = rss
+            await asyncio.sleep(0.05)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker(index: int):
+            rng = random.Random(seed * 1000 + index)
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await scenario(client, context, rng)
+                except httpx.HTTPError:
+                    statuses["error"] += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+                statuses[str(response.status_code)] += 1
+
+        sampler = asyncio.create_task(sample_rss())
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await sampler
+
+    successful = sum(count for status, count in statuses.items() if status.startswith("2"))
+    return {
+        "requests": sum(statuses.values()),
+        "successful": successful,
+        "requests_per_second": round(successful / elapsed, 2),
+        "p50_ms": percentile_ms(latencies, 50),
+        "p95_ms": percentile_ms(latencies, 95),
+        "p99_ms": percentile_ms(latencies, 99),
+        "statuses": dict(statuses),
+        "peak_rss_mb": round(peak_rss[0], 1) if peak_rss[0] is not None else None,
+    }
+
+
+async def benchmark_catalog(args, profiles: pd.DataFrame, n_products: int) -> list:
+    database_url = args.database_url.replace("{products}", str(n_products))
+    print(f"Seeding {n_products} products into {make_url(database_url).render_as_string(hide_password=True)}")
+    started = time.perf_counter()
+    await seed_database(database_url, profiles, n_products)
+    print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    log_path = os.path.join(os.path.dirname(os.path.abspath(args.output)), f"api_benchmark_server_{n_products}.log")
+    server = await start_server(database_url, port, log_path, args.ready_timeout)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            context = {
+                "products": n_products,
+                "profiles": profiles.to_dict("records"),
+                "categories": sorted(profiles["category"].unique()),
+                "headers": {role: await login(client, role) for role in ("supplier", "admin")},
+            }
+
+        results = []
+        for name in args.scenarios:
+            for concurrency in args.concurrency:
+                result = await run_scenario(base_url, SCENARIOS[name], context, concurrency, args.duration, server.pid)
+                result = {"catalog": n_products, "scenario": name, "concurrency": concurrency, **result}
+                results.append(result)
+                print(f"{n_products:>8} {name:<23} c={concurrency:<4} {result['requests_per_second']:>9.1f} req/s  "
+                      f"p50 {result['p50_ms']}ms  p95 {result['p95_ms']}ms  p99 {result['p99_ms']}ms  "
+                      f"rss {result['peak_rss_mb']}MB  {result['statuses']}")
+        return results
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args):
+    profiles = load_profiles(args.data)
+    results = []
+    for n_products in args.catalogs:
+        results.extend(await benchmark_catalog(args, profiles, n_products))
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": make_url(args.database_url).get_backend_name(),
+        "duration": args.duration,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+def compare(args) -> int:
+    """
+    Prints the change between two result files and returns 1 if any result regressed.
+    """
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    baseline_results = {(r["catalog"], r["scenario"], r["concurrency"]): r for r in baseline["results"]}
+
+    print(f"Baseline {baseline.get('commit')} -> current {current.get('commit')}")
+    regressions = 0
+    for result in current["results"]:
+        key = (result["catalog"], result["scenario"], result["concurrency"])
+        before = baseline_results.get(key)
+        if before is None or not before["requests_per_second"] or not before["p95_ms"] or result["p95_ms"] is None:
+            continue
+        rps_change = result["requests_per_second"] / before["requests_per_second"] - 1
+        p95_change = result["p95_ms"] / before["p95_ms"] - 1
+        regressed = rps_change < -args.threshold or p95_change > args.threshold
+        regressions += regressed
+        print(f"{key[0]:>8} {key[1]:<23} c={key[2]:<4} req/s {before['requests_per_second']:>9.1f} -> "
+              f"{result['requests_per_second']:>9.1f} ({rps_change:+.1%})  p95 {before['p95_ms']}ms -> "
+              f"{result['p95_ms']}ms ({p95_change:+.1%}){'  REGRESSION' if regressed else ''}")
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the API hot paths.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Seed catalogs, start the server and measure every scenario.")
+    run_parser.add_argument("--catalogs", type=int, nargs="+", default=[1000, 100000, 1000000], help="Catalog sizes to seed.")
+    run_parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50], help="Concurrent clients.")
+    run_parser.add_argument("--duration", type=float, default=10.0, help="Seconds per scenario and concurrency level.")
+    run_parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    run_parser.add_argument("--database-url", default="sqlite+aiosqlite:///api_benchmark_{products}.db",
+                            help='Database to seed and serve; "{products}" is replaced by the catalog size.')
+    run_parser.add_argument("--data", default="product_data.csv", help="CSV the synthetic products are sampled from.")
+    run_parser.add_argument("--ready-timeout", type=float, default=300.0, help="Seconds to wait for the server to be ready.")
+    run_parser.add_argument("--output", default="api_benchmark.json", help="Where the JSON results are written.")
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="Allowed relative change, e.g. 0.1 for 10%%.")
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        sys.exit(compare(args))
+    asyncio.run(run(args))
@@ -0,0 +1,148 @@
+"""
+Benchmark of random forest configurations for the demand model.
+
+Each configuration is trained on the same data with `DemandForecaster`, then measured for
+training time, single-product and batch prediction latency (scikit-learn, plus the compiled
+forest for single products), in-memory model size and test MSE,
+so a latency/accuracy trade-off can be picked for the DEMAND_MODEL_* settings.
+
+The bundled product_data.csv is small; `--rows` upsamples it (with a little noise on the
+numeric columns) to get timings closer to a production catalog.
+
+Usage (from the backend directory):
+    python -m benchmarks.forest_configs [--data PATH] [--rows N] [--configs PATH] [--output PATH]
+
+`--configs` points to a JSON list of {"name", "hyperparameters", "n_jobs", "predict_n_jobs"}
+objects; the built-in grid in `DEFAULT_CONFIGS` is used otherwise. Results are printed as a table
+and written as JSON to `--output`.
+"""
+import argparse
+import json
+import pickle
+import time
+import numpy as np
+import pandas as pd
+from services.demand_forecaster import DemandForecaster, FEATURE_COLUMNS
+from services.training_data import CsvTrainingSource, TARGET_COLUMN
+
+DEFAULT_CONFIGS = [
+    {"name": "baseline", "hyperparameters": {"random_state": 42}, "n_jobs": 1, "predict_n_jobs": 1},
+    {"name": "baseline-parallel", "hyperparameters": {"random_state": 42}, "n_jobs": -1, "predict_n_jobs": 1},
+    {"name": "50-trees", "hyperparameters": {"random_state": 42, "n_estimators": 50}, "n_jobs": -1, "predict_n_jobs": 1},
+    {"name": "depth-12", "hyperparameters": {"random_state": 42, "max_depth": 12}, "n_jobs": -1, "predict_n_jobs": 1},
+    {"name": "leaf-5", "hyperparameters": {"random_state": 42, "min_samples_leaf": 5}, "n_jobs": -1, "predict_n_jobs": 1},
+    {"name": "samples-0.5", "hyperparameters": {"random_state": 42, "max_samples": 0.5}, "n_jobs": -1, "predict_n_jobs": 1},
+    {"name": "compact", "hyperparameters": {"random_state": 42, "n_estimators": 50, "max_depth": 12,
+                                            "min_samples_leaf": 3, "max_samples": 0.5}, "n_jobs": -1, "predict_n_jobs": 1},
+    {"name": "compact-parallel-predict", "hyperparameters": {"random_state": 42, "n_estimators": 50, "max_depth": 12,
+                                                             "min_samples_leaf": 3, "max_samples": 0.5}, "n_jobs": -1, "predict_n_jobs": -1},
+]
+
+
+def load_training_data(path: str, rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Reads the training CSV and upsamples it to `rows` rows when larger than the file.
+
+    Upsampled rows get ±5% multiplicative noise on the numeric columns, so that the forest
+    does not simply memorize duplicates.
+    """
+    data = CsvTrainingSource(path).read()
+    if rows <= len(data):
+        return data
+    rng = np.random.default_rng(seed)
+    sample = data.sample(rows, replace=True, random_state=seed).reset_index(drop=True)
+    for column in ['cost_price', 'selling_price', 'units_sold', TARGET_COLUMN]:
+        sample[column] = sample[column] * rng.uniform(0.95, 1.05, size=rows)
+    return sample
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q) * 1000)
+
+
+def benchmark_config(config: dict, data: pd.DataFrame, single_repeats: int, batch_size: int) -> dict:
+    """
+    Trains one configuration and measures it.
+
+    Returns:
+        dict: The configuration and its train time, predict latencies, model size and MSE.
+    """
+    started = time.perf_counter()
+    forecaster = DemandForecaster(
+        hyperparameters=config["hyperparameters"],
+        training_data=data,
+        n_jobs=config.get("n_jobs", 1),
+        predict_n_jobs=config.get("predict_n_jobs", 1),
+    )
+    train_seconds = time.perf_counter() - started
+
+    rows = data[FEATURE_COLUMNS]
+    single, compiled_single = [], []
+    for i in range(single_repeats):
+        row = rows.iloc[[i % len(rows)]]
+        started = time.perf_counter()
+        forecaster.model.predict(row)
+        single.append(time.perf_counter() - started)
+        if forecaster.compiled is not None:
+            started = time.perf_counter()
+            forecaster.compiled.predict(row)
+            compiled_single.append(time.perf_counter() - started)
+
+    batch = rows.sample(batch_size, replace=len(rows) < batch_size, random_state=0)
+    batch_times = []
+    for _ in range(5):
+        started = time.perf_counter()
+        forecaster.model.predict(batch)
+        batch_times.append(time.perf_counter() - started)
+
+    regressor = forecaster.model.named_steps['regressor']
+    return {
+        "name": config["name"],
+        "hyperparameters": config["hyperparameters"],
+        "n_jobs": config.get("n_jobs", 1),
+        "predict_n_jobs": config.get("predict_n_jobs", 1),
+        "train_seconds": round(train_seconds, 3),
+        "single_predict_p50_ms": round(percentile_ms(single, 50), 3),
+        "single_predict_p95_ms": round(percentile_ms(single, 95), 3),
+        "batch_size": batch_size,
+        "batch_predict_ms": round(percentile_ms(batch_times, 50), 3),
+        "compiled_single_predict_p50_ms": round(percentile_ms(compiled_single, 50), 3) if compiled_single else None,
+        "model_bytes": len(pickle.dumps(forecaster.model, protocol=pickle.HIGHEST_PROTOCOL)),
+        "compiled_bytes": forecaster.compiled.nbytes if forecaster.compiled is not None else None,
+        "total_nodes": int(sum(tree.tree_.node_count for tree in regressor.estimators_)),
+        "mse": round(forecaster.mse, 4),
+    }
+
+
+def main(args):
+    configs = DEFAULT_CONFIGS
+    if args.configs:
+        with open(args.configs) as f:
+            configs = json.load(f)
+
+    data = load_training_data(args.data, args.rows)
+    print(f"Benchmarking {len(configs)} configurations on {len(data)} rows")
+    results = []
+    for config in configs:
+        result = benchmark_config(config, data, args.single_repeats, args.batch_size)
+        results.append(result)
+        print(f"{result['name']:<26} train {result['train_seconds']:>8.2f}s  "
+              f"single p50 {result['single_predict_p50_ms']:>7.2f}ms "
+              f"(compiled {result['compiled_single_predict_p50_ms'] or float('nan'):>6.2f}ms)  "
+              f"batch({args.batch_size}) {result['batch_predict_ms']:>8.2f}ms  "
+              f"size {result['model_bytes'] / 1e6:>8.2f}MB  mse {result['mse']:.2f}")
+
+    with open(args.output, "w") as f:
+        json.dump({"rows": len(data), "data": args.data, "results": results}, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark random forest configurations of the demand model.")
+    parser.add_argument("--data", default="product_data.csv", help="Training CSV.")
+    parser.add_argument("--rows", type=int, default=50000, help="Upsample the CSV to this many rows.")
+    parser.add_argument("--configs", default=None, help="JSON list of configurations. Defaults to the built-in grid.")
+    parser.add_argument("--single-repeats", type=int, default=200, help="Single-row predictions per configuration.")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per batch prediction.")
+    parser.add_argument("--output", default="forest_benchmark.json", help="Where the JSON results are written.")
+    main(parser.parse_args())
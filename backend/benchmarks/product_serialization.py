@@ -0,0 +1,167 @@
+"""
+Benchmark of the product listing serialization paths.
+
+Walks the whole products table page by page with keyset pagination, as GET /products does,
+and measures rows/sec for:
+
+- "orm_pydantic": ORM entities validated into `ProductResponse` one at a time (plus a masked
+  copy per row for buyers) and dumped with a pydantic TypeAdapter, the previous listing path;
+- "columnar_orjson": plain column tuples with the buyer masking done in the SELECT, dumped with
+  orjson by `utils.export.rows_to_json`, the current listing path.
+
+Both paths are checked to produce the same JSON before timing.
+
+Usage (from the backend directory, after `pip install -r benchmarks/requirements.txt`):
+    python -m benchmarks.product_serialization [--rows N] [--page-size N] [--repeats N] [--output PATH]
+
+The database is taken from DATABASE_URL and defaults to a local SQLite file, which is seeded
+with generated products up to `--rows`.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import List
+
+# The models import the application's engine, which needs a database URL
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///product_serialization_benchmark.db")
+
+import numpy as np
+from pydantic import TypeAdapter
+from sqlalchemy import func, insert, null
+from sqlalchemy.future import select
+from database.config import Base, async_session, engine
+from models.product import Product
+from models.user import User  # noqa: F401 - configures the Product.user relationship
+from schemas.product import ProductResponse
+from utils.export import rows_to_json
+
+PRODUCT_FIELDS = list(ProductResponse.model_fields)
+BUYER_HIDDEN_FIELDS = {"optimized_price", "demand_forecast"}
+PRODUCT_LIST_ADAPTER = TypeAdapter(List[ProductResponse])
+CATEGORIES = ["Electronics", "Books", "Toys", "Clothing", "Home", "Sports", "Beauty", "Grocery"]
+
+
+async def seed_products(rows: int, chunk_size: int = 10000, seed: int = 42) -> int:
+    """
+    Inserts generated products until the table holds at least `rows` products.
+
+    Returns:
+        int: The number of products in the table.
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_session() as db:
+        existing = await db.scalar(select(func.count()).select_from(Product))
+        rng = np.random.default_rng(seed)
+        for start in range(existing, rows, chunk_size):
+            n = min(chunk_size, rows - start)
+            cost = rng.uniform(1, 500, n).round(2)
+            await db.execute(insert(Product), [
+                {
+                    "name": f"Product {start + i}",
+                    "description": f"Generated product {start + i}",
+                    "cost_price": float(cost[i]),
+                    "selling_price": float(round(cost[i] * rng.uniform(1.1, 2.0), 2)),
+                    "category": CATEGORIES[(start + i) % len(CATEGORIES)],
+                    "stock_available": int(rng.integers(0, 1000)),
+                    "units_sold": int(rng.integers(0, 5000)),
+                    "customer_rating": float(round(rng.uniform(1, 5), 1)),
+                    "demand_forecast": float(round(rng.uniform(0, 100), 2)),
+                    "optimized_price": float(round(cost[i] * rng.uniform(1.1, 2.0), 2)),
+                    "supplier_id": 1,
+                }
+                for i in range(n)
+            ])
+            await db.commit()
+        return max(existing, rows)
+
+
+async def orm_pydantic_page(db, after_id: int, page_size: int, is_buyer: bool):
+    result = await db.execute(select(Product).where(Product.id > after_id).order_by(Product.id).limit(page_size))
+    products = [ProductResponse.model_validate(product) for product in result.scalars().all()]
+    if is_buyer:
+        products = [product.model_copy(update=dict.fromkeys(BUYER_HIDDEN_FIELDS)) for product in products]
+    last_id = products[-1].id if products else None
+    return PRODUCT_LIST_ADAPTER.dump_json(products), len(products), last_id
+
+
+async def columnar_orjson_page(db, after_id: int, page_size: int, is_buyer: bool):
+    columns = [null().label(field) if is_buyer and field in BUYER_HIDDEN_FIELDS else getattr(Product, field)
+               for field in PRODUCT_FIELDS]
+    result = await db.execute(select(*columns).where(Product.id > after_id).order_by(Product.id).limit(page_size))
+    rows = result.all()
+    last_id = rows[-1][PRODUCT_FIELDS.index("id")] if rows else None
+    return rows_to_json(PRODUCT_FIELDS, rows), len(rows), last_id
+
+
+PATHS = {
+    "orm_pydantic": orm_pydantic_page,
+    "columnar_orjson": columnar_orjson_page,
+}
+
+
+async def walk_catalog(page_function, page_size: int, is_buyer: bool) -> dict:
+    """
+    Serializes every product page by page and returns the timing.
+    """
+    rows = 0
+    total_bytes = 0
+    after_id = 0
+    started = time.perf_counter()
+    async with async_session() as db:
+        while True:
+            body, count, last_id = await page_function(db, after_id, page_size, is_buyer)
+            if not count:
+                break
+            rows += count
+            total_bytes += len(body)
+            after_id = last_id
+    seconds = time.perf_counter() - started
+    return {"rows": rows, "seconds": seconds, "bytes": total_bytes}
+
+
+async def check_equivalence(page_size: int):
+    async with async_session() as db:
+        for is_buyer in (False, True):
+            expected, _, _ = await orm_pydantic_page(db, 0, page_size, is_buyer)
+            actual, _, _ = await columnar_orjson_page(db, 0, page_size, is_buyer)
+            if json.loads(expected) != json.loads(actual):
+                raise AssertionError(f"Serialization paths disagree (buyer={is_buyer})")
+
+
+async def main(args):
+    total = await seed_products(args.rows)
+    await check_equivalence(args.page_size)
+    print(f"Serializing {total} products in pages of {args.page_size}")
+
+    results = []
+    for role, is_buyer in (("supplier", False), ("buyer", True)):
+        for name, page_function in PATHS.items():
+            runs = [await walk_catalog(page_function, args.page_size, is_buyer) for _ in range(args.repeats)]
+            best = min(runs, key=lambda run: run["seconds"])
+            result = {
+                "path": name,
+                "role": role,
+                "rows": best["rows"],
+                "seconds": round(best["seconds"], 3),
+                "rows_per_second": round(best["rows"] / best["seconds"]),
+                "bytes": best["bytes"],
+            }
+            results.append(result)
+            print(f"{role:<9} {name:<16} {result['seconds']:>8.3f}s  {result['rows_per_second']:>10} rows/sec")
+
+    with open(args.output, "w") as f:
+        json.dump({"products": total, "page_size": args.page_size, "results": results}, f, indent=2)
+    print(f"Results written to {args.output}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the product listing serialization paths.")
+    parser.add_argument("--rows", type=int, default=100000, help="Seed the products table up to this many rows.")
+    parser.add_argument("--page-size", type=int, default=1000, help="Products per page.")
+    parser.add_argument("--repeats", type=int, default=3, help="Walks per path; the fastest is reported.")
+    parser.add_argument("--output", default="serialization_benchmark.json", help="Where the JSON results are written.")
+    asyncio.run(main(parser.parse_args()))
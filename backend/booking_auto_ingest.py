@@ -1,47 +1,136 @@
 # ingest_bookings_async.py
+"""
+Streaming, idempotent loader for the booking metadata CSV feed.
 
-import pandas as pd
+The CSV is read in chunks of `--chunk-size` rows, converted column-wise and upserted with
+`INSERT ... ON CONFLICT (booking_id) DO UPDATE`, one transaction per chunk, so re-running the
+loader over the same feed updates rows instead of failing on duplicate keys. After every
+committed chunk the number of processed rows is written to a checkpoint file; `--resume`
+skips those rows on the next run.
+
+Usage:
+    python booking_auto_ingest.py [csv_path] [--chunk-size N] [--checkpoint PATH] [--resume]
+"""
+
+import argparse
 import asyncio
-from datetime import datetime
+import os
+import time
+import pandas as pd
 from models.booking import BookingMetadata
-from database.config import get_db, Base, engine
+from database.config import Base, engine, async_session
+from utils.bulk import bulk_upsert
+from utils.checkpoint import read_checkpoint, write_checkpoint
+
+BOOKING_COLUMNS = ["booking_id", "check_in_date", "check_out_date", "guest_count", "room_number"]
+
+
+def convert_chunk(df: pd.DataFrame):
+    """
+    Converts a raw CSV chunk to booking rows, column by column.
+
+    Args:
+        df (pd.DataFrame): A chunk of the booking CSV, read with all columns as strings.
+
+    Returns:
+        Tuple[List[dict], int]: The valid booking rows and the number of rejected rows.
+    """
+    bookings = pd.DataFrame({
+        "booking_id": df["booking_id"].str.strip(),
+        "check_in_date": pd.to_datetime(df["check_in_date"], errors="coerce").dt.date,
+        "check_out_date": pd.to_datetime(df["check_out_date"], errors="coerce").dt.date,
+        "guest_count": pd.to_numeric(df["guest_count"], errors="coerce"),
+        "room_number": df["room_number"].str.strip(),
+    })
+    valid = bookings.notna().all(axis=1) & (bookings["booking_id"] != "") & (bookings["guest_count"] % 1 == 0)
+    bookings = bookings[valid].astype({"guest_count": int})
+    # Keep the last occurrence of a booking within a chunk; ON CONFLICT cannot touch a row twice
+    bookings = bookings.drop_duplicates("booking_id", keep="last")
+    return bookings.to_dict("records"), int((~valid).sum())
+
+
+def read_ingest_checkpoint(checkpoint_path: str, csv_path: str) -> int:
+    """
+    Returns the number of rows of `csv_path` already committed by a previous run.
+    """
+    checkpoint = read_checkpoint(checkpoint_path) or {}
+    if checkpoint.get("csv_path") != os.path.abspath(csv_path):
+        return 0
+    return int(checkpoint.get("rows_processed", 0))
 
-async def ingest_bookings(csv_path: str):
-    df = pd.read_csv(csv_path, parse_dates=["check_in_date", "check_out_date"])
 
-    # Convert DataFrame rows to ORM model instances
-    bookings = [
-        BookingMetadata(
-            booking_id=row["booking_id"],
-            check_in_date=row["check_in_date"].date(),
-            check_out_date=row["check_out_date"].date(),
-            guest_count=int(row["guest_count"]),
-            room_number=str(row["room_number"])
-        )
-        for _, row in df.iterrows()
-    ]
+def write_ingest_checkpoint(checkpoint_path: str, csv_path: str, rows_processed: int):
+    """
+    Atomically records the number of rows of `csv_path` committed so far.
+    """
+    write_checkpoint(checkpoint_path, {"csv_path": os.path.abspath(csv_path), "rows_processed": rows_processed})
 
-    async for session in get_db():
-        async with session.begin():
-            session.add_all(bookings)
 
-    print("✅ Async ingestion complete.")
+async def ingest_bookings(csv_path: str, chunk_size: int = 10000, checkpoint_path: str = None, resume: bool = False):
+    """
+    Streams the booking CSV into the booking_metadata table.
+
+    Args:
+        csv_path (str): The path to the booking CSV.
+        chunk_size (int, optional): Rows per chunk and transaction. Defaults to 10000.
+        checkpoint_path (str, optional): Where progress is recorded. Defaults to "<csv_path>.checkpoint.json".
+        resume (bool, optional): Skip the rows committed by a previous run. Defaults to False.
+
+    Returns:
+        int: The number of rows upserted.
+    """
+    checkpoint_path = checkpoint_path or f"{csv_path}.checkpoint.json"
+    skip = read_ingest_checkpoint(checkpoint_path, csv_path) if resume else 0
+    if skip:
+        print(f"Resuming after {skip} rows")
+
+    reader = pd.read_csv(
+        csv_path,
+        usecols=BOOKING_COLUMNS,
+        dtype=str,
+        chunksize=chunk_size,
+        skiprows=range(1, skip + 1) if skip else None,
+    )
+
+    rows_processed = skip
+    upserted = 0
+    rejected = 0
+    started = time.perf_counter()
+    for df in reader:
+        bookings, chunk_rejected = convert_chunk(df)
+        async with async_session() as session:
+            async with session.begin():
+                await bulk_upsert(session, BookingMetadata.__table__, bookings, index_elements=["booking_id"])
+
+        rows_processed += len(df)
+        upserted += len(bookings)
+        rejected += chunk_rejected
+        write_ingest_checkpoint(checkpoint_path, csv_path, rows_processed)
+
+        elapsed = time.perf_counter() - started
+        print(f"{rows_processed} rows processed, {upserted} upserted, {rejected} rejected "
+              f"({upserted / elapsed:.0f} rows/sec)")
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Async ingestion complete: {upserted} rows in {elapsed:.2f}s "
+          f"({upserted / elapsed if elapsed else 0:.0f} rows/sec), {rejected} rejected.")
+    return upserted
 
 async def setup():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
-if __name__ == "__main__":
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
-
-    if loop and loop.is_running():
-        # If there's already a running loop (e.g., in Jupyter or a threaded server)
-        task = loop.create_task(ingest_bookings("booking_metadata.csv"))
-        loop.run_until_complete(task)
-    else:
-        asyncio.run(ingest_bookings("booking_metadata.csv"))
+async def main(args):
+    await setup()
+    await ingest_bookings(args.csv_path, args.chunk_size, args.checkpoint, args.resume)
+    await engine.dispose()
 
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load the booking metadata CSV into the database.")
+    parser.add_argument("csv_path", nargs="?", default="booking_metadata.csv")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Rows per chunk and transaction.")
+    parser.add_argument("--checkpoint", default=None, help="Progress file. Defaults to <csv_path>.checkpoint.json.")
+    parser.add_argument("--resume", action="store_true", help="Skip the rows committed by a previous run.")
+    asyncio.run(main(parser.parse_args()))
@@ -9,5 +9,93 @@ class Settings:
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "default_jwt_secret_key")
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+    # Password hashing. Stored hashes with a different cost are rehashed at login
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", 12))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))
+
+    # Database engine and connection pool. Size the pool so that
+    # uvicorn workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays below the server's max_connections
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # asyncpg prepared statement cache (per connection) and SQLAlchemy compiled statement cache
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))
+    DB_QUERY_CACHE_SIZE: int = int(os.getenv("DB_QUERY_CACHE_SIZE", 500))
+
+    # Authenticated user cache. A TTL of 0 disables it
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", 60))
+    USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", 10000))
+
+    # Demand model settings
+    # Training data: a CSV of observed demand. The products table only holds the model's own
+    # forecasts, so it is not a training source
+    PRODUCT_DATA_PATH: str = os.getenv("PRODUCT_DATA_PATH", "product_data.csv")
+    # Random forest size and parallelism. DEMAND_MODEL_MAX_DEPTH=0 grows trees fully and
+    # DEMAND_MODEL_MAX_SAMPLES=0 bootstraps as many rows as the training set; n_jobs=-1 uses all cores
+    DEMAND_MODEL_N_ESTIMATORS: int = int(os.getenv("DEMAND_MODEL_N_ESTIMATORS", 100))
+    DEMAND_MODEL_MAX_DEPTH: int = int(os.getenv("DEMAND_MODEL_MAX_DEPTH", 0))
+    DEMAND_MODEL_MIN_SAMPLES_LEAF: int = int(os.getenv("DEMAND_MODEL_MIN_SAMPLES_LEAF", 1))
+    DEMAND_MODEL_MAX_SAMPLES: float = float(os.getenv("DEMAND_MODEL_MAX_SAMPLES", 0))
+    DEMAND_MODEL_N_JOBS: int = int(os.getenv("DEMAND_MODEL_N_JOBS", -1))
+    # Single-row predictions are slower with several jobs, so inference defaults to one core
+    DEMAND_MODEL_PREDICT_N_JOBS: int = int(os.getenv("DEMAND_MODEL_PREDICT_N_JOBS", 1))
+    # Predict with the array-backed compiled forest instead of the scikit-learn pipeline
+    # for batches of up to DEMAND_MODEL_COMPILED_MAX_BATCH rows
+    DEMAND_MODEL_COMPILED: bool = os.getenv("DEMAND_MODEL_COMPILED", "true").lower() == "true"
+    DEMAND_MODEL_COMPILED_MAX_BATCH: int = int(os.getenv("DEMAND_MODEL_COMPILED_MAX_BATCH", 256))
+    # Keep the scikit-learn pipeline in memory next to the compiled forest. By default it is dropped
+    # once compiled, which roughly halves the model's memory; large batches then also use the
+    # compiled forest, which is slower on them than the pipeline
+    DEMAND_MODEL_KEEP_PIPELINE: bool = os.getenv("DEMAND_MODEL_KEEP_PIPELINE", "false").lower() == "true"
+    MODEL_ARTIFACT_DIR: str = os.getenv("MODEL_ARTIFACT_DIR", "model_artifacts")
+    # Incremental retraining from rows appended to PRODUCT_DATA_PATH. RETRAIN_INTERVAL_SECONDS=0 disables the schedule
+    RETRAIN_INTERVAL_SECONDS: float = float(os.getenv("RETRAIN_INTERVAL_SECONDS", 3600))
+    RETRAIN_MIN_NEW_ROWS: int = int(os.getenv("RETRAIN_MIN_NEW_ROWS", 50))
+    RETRAIN_TREES_PER_UPDATE: int = int(os.getenv("RETRAIN_TREES_PER_UPDATE", 10))
+    RETRAIN_MAX_ESTIMATORS: int = int(os.getenv("RETRAIN_MAX_ESTIMATORS", 500))
+    RETRAIN_VALIDATION_FRACTION: float = float(os.getenv("RETRAIN_VALIDATION_FRACTION", 0.2))
+    # A grown model is swapped in only if its validation MSE is at most this multiple of the current model's
+    RETRAIN_MAX_MSE_RATIO: float = float(os.getenv("RETRAIN_MAX_MSE_RATIO", 1.0))
+    # Maximum number of product IDs bound into a single IN (...) query
+    FORECAST_QUERY_CHUNK_SIZE: int = int(os.getenv("FORECAST_QUERY_CHUNK_SIZE", 1000))
+    # Maximum products x price points scored by one demand curve request
+    DEMAND_CURVE_MAX_ROWS: int = int(os.getenv("DEMAND_CURVE_MAX_ROWS", 100000))
+    # Load the pricing rules and the demand model in the background at startup instead of on first use
+    MODEL_WARMUP_ON_STARTUP: bool = os.getenv("MODEL_WARMUP_ON_STARTUP", "true").lower() == "true"
+
+    # Pricing rules file, reloaded automatically when it changes
+    PRICING_RULES_PATH: str = os.getenv("PRICING_RULES_PATH", "pricing_rules.json")
+    # Price variation: "hash" (stable per product inputs), "random" (new on every call) or "off"
+    PRICING_VARIATION_MODE: str = os.getenv("PRICING_VARIATION_MODE", "hash").lower()
+    # Memoized (optimized price, demand forecast) results of single-product scoring. 0 disables it
+    SCORE_MEMO_SIZE: int = int(os.getenv("SCORE_MEMO_SIZE", 10000))
+
+    # ML worker pools. INFERENCE_THREAD_WORKERS=0 picks min(4, CPU count)
+    INFERENCE_THREAD_WORKERS: int = int(os.getenv("INFERENCE_THREAD_WORKERS", 0))
+    INFERENCE_MAX_PENDING: int = int(os.getenv("INFERENCE_MAX_PENDING", 64))
+    TRAINING_PROCESS_WORKERS: int = int(os.getenv("TRAINING_PROCESS_WORKERS", 1))
+    TRAINING_MAX_PENDING: int = int(os.getenv("TRAINING_MAX_PENDING", 2))
+
+    # Product listing page sizes
+    PRODUCT_PAGE_DEFAULT_LIMIT: int = int(os.getenv("PRODUCT_PAGE_DEFAULT_LIMIT", 100))
+    PRODUCT_PAGE_MAX_LIMIT: int = int(os.getenv("PRODUCT_PAGE_MAX_LIMIT", 1000))
+    # Product listing response cache: "memory" (entries per process, invalidations shared through the
+    # database), "redis" (entries and invalidations shared by all workers) or "off". A TTL of 0 disables it
+    RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_REDIS_URL: str = os.getenv("RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0")
+    RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 300))
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 128))
+    # Rows fetched per server-side cursor round trip when exporting
+    EXPORT_CHUNK_SIZE: int = int(os.getenv("EXPORT_CHUNK_SIZE", 1000))
+    # Bulk product import: rows per parsed chunk and transaction, and reported row errors
+    IMPORT_CHUNK_SIZE: int = int(os.getenv("IMPORT_CHUNK_SIZE", 5000))
+    IMPORT_MAX_ERRORS: int = int(os.getenv("IMPORT_MAX_ERRORS", 1000))
+    # Catalog repricing job: products scored and written per chunk, and where its cursor is saved
+    REPRICE_CHUNK_SIZE: int = int(os.getenv("REPRICE_CHUNK_SIZE", 5000))
+    REPRICE_CHECKPOINT_PATH: str = os.getenv("REPRICE_CHECKPOINT_PATH", "reprice_checkpoint.json")
 
 settings = Settings()
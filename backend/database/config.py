@@ -1,13 +1,51 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
+from core.config import settings
+from database.pool import TimedAsyncQueuePool
 import os
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+
+def engine_options(database_url: str) -> dict:
+    """
+    Builds the `create_async_engine` keyword arguments from the DB_* settings.
+
+    In-memory SQLite keeps SQLAlchemy's default single-connection pool; every other database gets
+    an instrumented queue pool sized by the settings.
+
+    Args:
+        database_url (str): The database URL.
+
+    Returns:
+        dict: The engine keyword arguments.
+    """
+    url = make_url(database_url)
+    options = {
+        "echo": settings.DB_ECHO,
+        "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+    }
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+
+    options.update({
+        "poolclass": TimedAsyncQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    })
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return options
+
+
+engine = create_async_engine(DATABASE_URL, **engine_options(DATABASE_URL))
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 Base = declarative_base()
 
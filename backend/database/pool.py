@@ -0,0 +1,83 @@
+"""
+This module provides an instrumented connection pool for the async engine.
+
+Classes:
+    PoolMetrics: Counters for connection checkouts and the time spent acquiring them.
+    TimedAsyncQueuePool: An AsyncAdaptedQueuePool that records how long each checkout waits.
+
+Variables:
+    pool_metrics: The metrics shared by every pool of the application engine.
+"""
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, wait_seconds: float, timed_out: bool = False):
+        """
+        Records one connection acquisition attempt and how long it took.
+        """
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def snapshot(self, pool=None):
+        """
+        Returns the counters, plus the live state of `pool` when given.
+
+        Args:
+            pool (QueuePool, optional): The pool whose size and usage are reported.
+
+        Returns:
+            dict: Checkout and timeout counts, average and maximum acquisition time in milliseconds,
+                and the pool size, checked-in, checked-out and overflow connection counts.
+        """
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            metrics = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_seconds / attempts * 1000, 3) if attempts else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            metrics.update({
+                "pool_size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            })
+        return metrics
+
+
+pool_metrics = PoolMetrics()
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records the time spent acquiring each connection, including
+    waiting for a free slot and opening new connections, in `pool_metrics`.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_metrics.record(time.perf_counter() - started)
+        return connection
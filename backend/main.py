@@ -4,37 +4,91 @@ This module initializes and configures a FastAPI application for a price optimiz
 Modules:
     - fastapi: The FastAPI framework.
     - fastapi.middleware.cors: Middleware for handling Cross-Origin Resource Sharing (CORS).
-    - routers: Custom modules for handling product, user, and authentication routes.
+    - routers: Custom modules for handling product, user, authentication and metrics routes.
     - database.config: Configuration for the database engine and base models.
 
 Functions:
     - init_models: Asynchronously initializes the database models.
-    - lifespan: Context manager for the application lifespan, ensuring database models are initialized.
+    - warm_up_models: Loads the pricing rules and the demand model in the background.
+    - lifespan: Context manager for the application lifespan, ensuring database models and the product statistics are initialized,
+      running the outbound email queue, the model warmup and the incremental retraining schedule, and stopping any catalog repricing run and the worker pools on exit. The app serves requests while the models load.
+    - ready: Readiness probe; 503 until the demand model is loaded.
+    - executor_saturated_handler: Maps saturated worker pools to 503 Service Unavailable.
 
 Variables:
     - app: The FastAPI application instance.
     - origins: List of allowed origins for CORS.
 """
 
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from routers import product, user, auth
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from routers import product, user, auth, metrics
 from database.config import engine, Base
+from core.config import settings
+from services.model_registry import demand_forecaster_registry
+from services.incremental_training import run_retrain_schedule
+from services.product_stats import ensure_product_stats
+from services.inference_executor import shutdown_executors
+from utils.password import password_executor
+from utils.email import email_queue
+from utils.executors import ExecutorSaturatedError
 
 # Initialize the database
 async def init_models():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+async def warm_up_models():
+    """
+    Loads the pricing rules and the demand model so the first product request does not wait
+    for them. Failures are recorded for the readiness probe; the models are loaded again on
+    first use.
+    """
+    try:
+        await asyncio.to_thread(product.price_optimizer.rules.get)
+        await demand_forecaster_registry.aget()
+        app.state.model_warmup_error = None
+    except Exception as e:
+        app.state.model_warmup_error = str(e)
+        print(f"Model warmup failed: {e}")
+
 from contextlib import asynccontextmanager
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_models()
+    await ensure_product_stats()
+    await email_queue.start()
+    app.state.model_warmup_error = None
+    warmup_task = None
+    if settings.MODEL_WARMUP_ON_STARTUP:
+        warmup_task = asyncio.create_task(warm_up_models())
+    retrain_task = None
+    if settings.RETRAIN_INTERVAL_SECONDS > 0:
+        retrain_task = asyncio.create_task(run_retrain_schedule(interval=settings.RETRAIN_INTERVAL_SECONDS))
     yield
+    for task in (warmup_task, retrain_task):
+        if task is not None:
+            task.cancel()
+    # An interrupted repricing run keeps its checkpoint and can be resumed
+    await product.repricing_job.cancel()
+    await email_queue.stop()
+    shutdown_executors()
+    password_executor.shutdown(wait=False)
 
 app = FastAPI(lifespan=lifespan)
 
+@app.exception_handler(ExecutorSaturatedError)
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturatedError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
 origins = ["http://localhost:3000"]  
 
 app.add_middleware(
@@ -42,13 +96,15 @@ app.add_middleware(
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],  
-    allow_headers=["*"] 
+    allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Cache"]
 )
 
 # Include Routers
 app.include_router(product.router)
 app.include_router(user.router)
 app.include_router(auth.router)
+app.include_router(metrics.router)
 
 from contextlib import asynccontextmanager
 
@@ -60,3 +116,21 @@ async def lifespan(app: FastAPI):
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Product Management API"}
+
+@app.get("/ready")
+async def ready():
+    """
+    Reports whether the ML services are loaded. Returns 503 until the demand model is ready, so
+    load balancers only route product traffic to warmed-up workers; liveness checks should use "/".
+    """
+    demand_model = demand_forecaster_registry.status()
+    is_ready = demand_model["loaded"]
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if is_ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=jsonable_encoder({
+            "ready": is_ready,
+            "demand_model": demand_model,
+            "pricing_rules_loaded": product.price_optimizer.rules.loaded,
+            "warmup_error": getattr(app.state, "model_warmup_error", None),
+        }),
+    )
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, BigInteger
+from database.config import Base
+
+class CacheGeneration(Base):
+    """
+    The invalidation generation of one response cache, shared by every process using the database.
+
+    Attributes:
+        name (str): The cache namespace, e.g. "products:list".
+        generation (int): Incremented on every write to the cached data.
+    """
+    __tablename__ = "cache_generations"
+
+    name = Column(String, primary_key=True)
+    generation = Column(BigInteger, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from database.config import Base
 
@@ -19,8 +19,16 @@ class Product(Base):
         optimized_price (float, optional): The optimized price for the product.
         supplier_id (int): The foreign key referencing the user (seller) who supplies the product.
         user (User): The relationship to the User model, indicating the product belongs to a user.
+    Indexes:
+        The (category, id), (supplier_id, id) and (selling_price, id) indexes back the filtered,
+        keyset-paginated product listing.
     """
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_category_id", "category", "id"),
+        Index("ix_products_supplier_id_id", "supplier_id", "id"),
+        Index("ix_products_selling_price_id", "selling_price", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
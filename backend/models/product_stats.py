@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, Float
+from database.config import Base
+
+class ProductStats(Base):
+    """
+    Running totals of the products of one supplier in one category.
+
+    Sums and non-null counts are stored instead of averages, so that adding, changing or removing
+    a product only adds a delta to one row (see `services.product_stats`). Averages are computed
+    when the statistics are read.
+    Attributes:
+        category (str): The product category; "" for products without one.
+        supplier_id (int): The supplier; 0 for products without one.
+        product_count (int): The number of products.
+        sum_cost_price, sum_selling_price (float): Price totals.
+        sum_optimized_price (float), optimized_price_count (int): Total and count of the optimized prices set.
+        total_stock (int): The total number of units in stock.
+        total_units_sold (int): The total number of units sold.
+        sum_customer_rating (float), customer_rating_count (int): Total and count of the ratings set.
+        sum_demand_forecast (float), demand_forecast_count (int): Total and count of the demand forecasts set.
+    """
+    __tablename__ = "product_stats"
+
+    category = Column(String, primary_key=True)
+    supplier_id = Column(Integer, primary_key=True)
+    product_count = Column(Integer, nullable=False, default=0)
+    sum_cost_price = Column(Float, nullable=False, default=0.0)
+    sum_selling_price = Column(Float, nullable=False, default=0.0)
+    sum_optimized_price = Column(Float, nullable=False, default=0.0)
+    optimized_price_count = Column(Integer, nullable=False, default=0)
+    total_stock = Column(Integer, nullable=False, default=0)
+    total_units_sold = Column(Integer, nullable=False, default=0)
+    sum_customer_rating = Column(Float, nullable=False, default=0.0)
+    customer_rating_count = Column(Integer, nullable=False, default=0)
+    sum_demand_forecast = Column(Float, nullable=False, default=0.0)
+    demand_forecast_count = Column(Integer, nullable=False, default=0)
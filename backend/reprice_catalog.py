@@ -0,0 +1,53 @@
+"""
+Reprices the whole product catalog from the command line.
+
+Runs the same job as POST /products/reprice: products are read in keyset-ordered chunks of
+`--chunk-size`, scored with one batched call to each model and the changed optimized prices and
+demand forecasts are written back with one bulk UPDATE per chunk. The cursor is saved to a
+checkpoint file after every chunk; `--resume` continues an interrupted run.
+
+Usage:
+    python reprice_catalog.py [--chunk-size N] [--checkpoint PATH] [--resume]
+"""
+
+import argparse
+import asyncio
+import sys
+from core.config import settings
+from database.config import engine
+# Product.user refers to User by name; import it so the mappers can be configured
+from models.user import User  # noqa: F401
+from services.inference_executor import shutdown_executors
+from services.price_optimizer import PriceOptimizer
+from services.repricing import RepricingJob
+
+
+def print_progress(status: dict):
+    total = status["total"] or 0
+    print(f"{status['processed']}/{total} products processed, {status['updated']} updated "
+          f"({status['rows_per_second']:.0f} rows/sec)")
+
+
+async def main(args) -> int:
+    job = RepricingJob(PriceOptimizer(), chunk_size=args.chunk_size, checkpoint_path=args.checkpoint)
+    try:
+        status = await job.run(resume=args.resume, on_progress=print_progress)
+    finally:
+        await engine.dispose()
+        shutdown_executors()
+
+    if status["state"] != "completed":
+        print(f"❌ Repricing failed after product {status['last_id']}: {status['error']}")
+        print("Run again with --resume to continue.")
+        return 1
+    print(f"✅ Repricing complete: {status['processed']} products, {status['updated']} updated "
+          f"({status['rows_per_second']:.0f} rows/sec).")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute the optimized price and demand forecast of every product.")
+    parser.add_argument("--chunk-size", type=int, default=settings.REPRICE_CHUNK_SIZE, help="Products per chunk and transaction.")
+    parser.add_argument("--checkpoint", default=settings.REPRICE_CHECKPOINT_PATH, help="Progress file.")
+    parser.add_argument("--resume", action="store_true", help="Continue after the last chunk committed by a previous run.")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -4,47 +4,32 @@ Routes:
     - /auth/login: Handles user login by verifying credentials and generating an access token.
     - /auth/verify-email: Verifies the user's email address using the provided token.
 Functions:
-    - verify_password(plain_password: str, hashed_password: str) -> bool:
-        Verifies if the provided plain password matches the hashed password.
     - login_user(form_data: security.OAuth2PasswordRequestForm, db: AsyncSession) -> dict:
+        Verifies the password off the event loop and rehashes it if the bcrypt cost changed.
     - verify_email(token: str, db: AsyncSession) -> dict:
         Verifies the user's email address using the provided token.
 """
 from fastapi import APIRouter, HTTPException, Depends, security, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from passlib.context import CryptContext
 from models.user import User
 from database.config import get_db
 from utils.jwt import create_access_token
 from utils.jwt import verify_access_token
-from utils.dependencies import hash_password
+from utils.password import verify_and_update_password
+from utils.user_cache import user_cache
 from typing import Any
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-# Password verification function
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """
-    Verify if the provided plain password matches the hashed password.
-
-    Args:
-        plain_password (str): The plain text password to verify.
-        hashed_password (str): The hashed password to compare against.
-
-    Returns:
-        bool: True if the plain password matches the hashed password, False otherwise.
-    """
-    return pwd_context.verify(plain_password, hashed_password)
-
-
 @router.post("/login", response_model=Any)
 async def login_user(form_data: security.OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     """
     Handles user login by verifying credentials and generating an access token.
 
+    The password is verified on the password hashing pool. If the stored hash was created with a
+    different bcrypt cost than `BCRYPT_ROUNDS`, it is replaced with a hash at the current cost.
+
     Args:
         form_data (security.OAuth2PasswordRequestForm): The form data containing the username and password.
         db (AsyncSession): The database session dependency.
@@ -54,15 +39,22 @@ async def login_user(form_data: security.OAuth2PasswordRequestForm = Depends(),
 
     Raises:
         HTTPException: If the credentials are invalid or the email is not verified.
+        ExecutorSaturatedError: If the password hashing pool is saturated (served as 503).
     """
-    print("Someone is trying to login")
     result = await db.execute(select(User).where(User.email == form_data.username))
     db_user = result.scalars().first()
-    print(db_user.full_name, db_user.hashed_password)
 
-    if db_user is None or not verify_password(form_data.password, db_user.hashed_password):
+    if db_user is None:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    valid, new_hash = await verify_and_update_password(form_data.password, db_user.hashed_password)
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    if new_hash:
+        db_user.hashed_password = new_hash
+        await db.commit()
+
     if not db_user.is_verified:
         raise HTTPException(status_code=403, detail="Email not verified")
 
@@ -94,4 +86,5 @@ async def verify_email(token: str, db: AsyncSession = Depends(get_db)):
     
     db_user.is_verified = True
     await db.commit()
+    user_cache.invalidate(email)
     return {"msg": "Email successfully verified"}
@@ -0,0 +1,38 @@
+"""
+This module exposes operational metrics of the API.
+Routes:
+    - GET /metrics/db-pool: Database connection pool usage and checkout wait times.
+    - GET /metrics/email-queue: Outbound email queue depth and send counters.
+    All routes are accessible by users with the "admin" role.
+"""
+from fastapi import APIRouter, Depends
+from database.config import engine
+from database.pool import pool_metrics
+from utils.dependencies import has_role
+from utils.email import email_queue
+
+router = APIRouter(prefix="/metrics", tags=["metrics"], dependencies=[Depends(has_role(["admin"]))])
+
+
+@router.get("/db-pool")
+async def get_db_pool_metrics():
+    """
+    Report the state of the database connection pool.
+
+    Returns:
+        dict: The pool size, checked-in, checked-out and overflow connections, and the number of
+            checkouts and timeouts with their average and maximum wait in milliseconds.
+    """
+    return pool_metrics.snapshot(engine.pool)
+
+
+@router.get("/email-queue")
+async def get_email_queue_metrics():
+    """
+    Report the state of the outbound email queue.
+
+    Returns:
+        dict: The number of queued emails (of which waiting for a retry) and in-flight emails, the
+            sent, failed and retried counts, and the consecutive failed SMTP connection attempts.
+    """
+    return email_queue.metrics()
@@ -5,8 +5,17 @@ Routes:
         Create a new product with an optimized price.
         Accessible by users with the "supplier" role.
     - GET /products/:
-        List all products.
+        List products one page at a time, with filters and sorting applied in SQL.
         Accessible by all authenticated users. Buyers do not see "optimized_price" and "demand_forecast" fields.
+    - GET /products/export:
+        Stream the product catalog as NDJSON or CSV.
+        Accessible by all authenticated users, with the same field masking for buyers.
+    - POST /products/import:
+        Bulk-create products from a CSV or NDJSON upload, with optimized prices and demand forecasts.
+        Accessible by users with the "supplier" role.
+    - GET /products/stats:
+        Product counts, totals and averages per category, supplier or both, from the maintained statistics table.
+        Accessible by all authenticated users. Buyers do not see the average optimized price and demand forecast.
     - PUT /products/{product_id}:
         Update an existing product.
         Accessible by users with "admin" or "supplier" roles. Suppliers can only update their own products.
@@ -15,6 +24,24 @@ Routes:
     - POST /products/forecast:
         Get forecasted demand for a list of product IDs.
         Accessible by users with "admin" or "supplier" roles.
+    - POST /products/demand-curve:
+        Forecast demand over a grid of candidate prices and return the revenue- and profit-maximizing prices.
+        Accessible by users with "admin" or "supplier" roles.
+    - POST /products/model/reload:
+        Load or retrain the demand model and swap it in as a new version.
+        Accessible by users with the "admin" role.
+    - POST /products/model/retrain:
+        Grow the demand model with the rows appended to its training data, if it validates.
+        Accessible by users with the "admin" role.
+    - POST /products/reprice:
+        Start repricing the whole catalog in the background, optionally resuming an interrupted run.
+        Accessible by users with the "admin" role.
+    - GET /products/reprice/status:
+        Progress and throughput of the current or last catalog repricing run.
+        Accessible by users with the "admin" role.
+    - POST /products/pricing-rules/reload:
+        Recompile the pricing rules file. Changes are also picked up automatically.
+        Accessible by users with the "admin" role.
 Dependencies:
     - has_role: Dependency to check if the user has the required role.
     - get_current_user: Dependency to get the current authenticated user.
@@ -27,28 +54,127 @@ Schemas:
     - ProductResponse: Schema for the product response.
     - ForecastRequest: Schema for the forecast request.
     - ForecastResponse: Schema for the forecast response.
+    - DemandCurveRequest: Schema for the demand curve request.
+    - DemandCurveResponse: Schema for the demand curve of one product.
+    - ProductImportResponse: Schema for the bulk import report.
+    - ModelStatusResponse: Schema for the demand model status.
+    - RetrainResponse: Schema for the incremental retraining report.
+    - RepricingStatusResponse: Schema for the catalog repricing progress.
+    - ProductStatsResponse: Schema for the statistics of one category and/or supplier.
+    - PricingRulesResponse: Schema for the active pricing rules.
 Services:
-    - forecast_demand: Service to forecast product demand.
+    - demand_forecaster_registry: Shared registry holding the trained demand model.
     - PriceOptimizer: Service to optimize product prices.
+    - score_memo: Memo of single-product scores, so unchanged products are not re-scored.
+    - repricing_job: Background job rescoring the whole catalog.
+    - apply_stats_changes: Keeps the per-category/supplier statistics in step with every product write.
 Utilities:
+    - product_list_cache: Cache of serialized product listing pages, invalidated on every product write.
     - pandas (pd): Utility for data manipulation and analysis.
 """
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, File, Query, Request, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import null, or_, tuple_, update
 from sqlalchemy.future import select
+from core.config import settings
 from models.product import Product
-from schemas.product import ProductCreate, ProductResponse, ForecastRequest, ForecastResponse
+from schemas.product import ProductCreate, ProductResponse, ForecastRequest, ForecastResponse, DemandCurveRequest, DemandCurveResponse, ModelStatusResponse, RetrainResponse, RepricingStatusResponse, ProductStatsResponse, ProductImportResponse, PricingRulesResponse
 from utils.dependencies import has_role, get_current_user
-from models.user import User
+from models.user import User, UserRole
 from database.config import get_db
-from typing import List
-from utils.mapper import convert_to_product_create
+from typing import List, Optional
+from utils.pagination import encode_cursor, decode_cursor
+from utils.export import rows_to_json, stream_rows, EXPORT_MEDIA_TYPES
+from utils.bulk import bulk_insert
+from utils.mapper import convert_to_feature_batch
+from utils.response_cache import CachedResponse, conditional_response, product_list_cache
 from services.price_optimizer import PriceOptimizer
-from services.demand_forecaster import DemandForecaster
+from services.demand_forecaster import to_demand_percentage
+from services.model_registry import demand_forecaster_registry
+from services.incremental_training import retrain_incrementally
+from services.inference_executor import inference_executor
+from services.product_import import read_product_chunks, validate_product_chunk
+from services.scoring import score_products, score_memo
+from services.demand_curve import demand_curves
+from services.repricing import RepricingJob
+from services.product_stats import apply_stats_changes, lock_products, read_product_stats, stats_row
+from utils.executors import ExecutorSaturatedError
 
 router = APIRouter(prefix="/products", tags=["products"])
 price_optimizer = PriceOptimizer() 
-demand_forecaster = DemandForecaster()
+repricing_job = RepricingJob(price_optimizer)
+
+# Columns the product listing can be sorted by; each is paired with `id` for keyset pagination
+PRODUCT_SORT_KEYS = {
+    "id": Product.id,
+    "name": Product.name,
+    "selling_price": Product.selling_price,
+}
+BUYER_HIDDEN_FIELDS = {"optimized_price", "demand_forecast"}
+# Fields of a listed product, in ProductResponse order
+PRODUCT_FIELDS = list(ProductResponse.model_fields)
+EXPORT_FIELDS = ["id"] + list(ProductCreate.model_fields)
+
+
+def filter_products(query, category=None, supplier_id=None, min_price=None, max_price=None, search=None):
+    """
+    Applies the optional product listing filters to a select statement.
+    """
+    if search:
+        query = query.where(or_(
+            Product.name.icontains(search, autoescape=True),
+            Product.description.icontains(search, autoescape=True),
+            Product.category.icontains(search, autoescape=True),
+        ))
+    if category is not None:
+        query = query.where(Product.category == category)
+    if supplier_id is not None:
+        query = query.where(Product.supplier_id == supplier_id)
+    if min_price is not None:
+        query = query.where(Product.selling_price >= min_price)
+    if max_price is not None:
+        query = query.where(Product.selling_price <= max_price)
+    return query
+
+
+async def score_product(product: ProductCreate):
+    """
+    Computes the optimized price and demand forecast of a single product.
+
+    With deterministic pricing, results are memoized on the scoring inputs and the pricing rules
+    and demand model versions, so re-saving a product whose relevant fields did not change skips
+    both models.
+
+    Args:
+        product (ProductCreate): The product to score.
+    Returns:
+        Tuple[float, Optional[float]]: The optimized price and the demand forecast percentage,
+            both rounded to 2 decimals. The forecast is None if the demand model failed.
+    Raises:
+        ExecutorSaturatedError: If the model workers are saturated.
+    """
+    # Score a missing rating as 0.0 in both models, as the batch paths do
+    if product.customer_rating is None:
+        product = product.model_copy(update={"customer_rating": 0.0})
+    demand_forecaster = await demand_forecaster_registry.aget()
+    memo_key = None
+    if price_optimizer.deterministic:
+        memo_key = score_memo.key(product, price_optimizer.rules.get().version, demand_forecaster_registry.version)
+        scores = score_memo.get(memo_key)
+        if scores is not None:
+            return scores
+
+    optimized_price = round(float(price_optimizer.predict(product)), 2)
+    demand = await inference_executor.submit(demand_forecaster.predict, product)
+    if demand is None:
+        return optimized_price, None
+
+    demand_percentage = round(float(to_demand_percentage(demand, product.stock_available)), 2)
+    if memo_key is not None:
+        score_memo.set(memo_key, (optimized_price, demand_percentage))
+    return optimized_price, demand_percentage
 
 # Suppliers can create or update products
 @router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(has_role(["supplier"]))])
@@ -66,59 +192,273 @@ async def create_product(product: ProductCreate, db: AsyncSession = Depends(get_
     Raises:
         HTTPException: If there is an error during the product creation process, 
                        an HTTP 500 error is raised with the error details.
+        ExecutorSaturatedError: If the model workers are saturated (served as 503).
     """
    
     try:
         
-        optimized_price = price_optimizer.predict(product)
-        product_obj = convert_to_product_create(product)
-        demand = demand_forecaster.predict(product_obj) 
+        optimized_price, demand_percentage = await score_product(product)
         
         product_dict = product.dict()
         
         if optimized_price:
-            product_dict["optimized_price"] = round(float(optimized_price),2)
+            product_dict["optimized_price"] = optimized_price
         
-        if demand:
-            total = product_obj.stock_available
-            demand_percentage = min((demand/total)*100, 100)
-            product_dict["demand_forecast"] = round(float(demand_percentage),2)
+        if demand_percentage is not None:
+            product_dict["demand_forecast"] = demand_percentage
 
         
         db_product = Product(
             **product_dict, supplier_id=current_user.id
         )
         db.add(db_product)
+        await apply_stats_changes(db, added=[stats_row(db_product)])
         await db.commit()
         await db.refresh(db_product)
+        await product_list_cache.invalidate()
         return db_product
+    except ExecutorSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
 # Buyers can read all products excluding 'optimized_price' and 'demand_forecast'
 @router.get("/", response_model=List[ProductResponse])
-async def list_products(db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def list_products(
+    request: Request,
+    limit: int = Query(settings.PRODUCT_PAGE_DEFAULT_LIMIT, ge=1, le=settings.PRODUCT_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+    supplier_id: Optional[int] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    search: Optional[str] = None,
+    sort: str = "id",
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
     """
-    List all products from the database.
+    List one page of products from the database.
+
+    Filters and sorting are applied in SQL and pages are keyset-paginated on (sort key, id), so the
+    cost of a page does not depend on the catalog size. When more rows are available, the cursor of
+    the next page is returned in the `X-Next-Cursor` response header. If the current user has the
+    role of "buyer", the "optimized_price" and "demand_forecast" fields are left empty.
 
-    This function retrieves all products from the database and returns them. If the current user has the role of "buyer",
-    the function excludes the "optimized_price" and "demand_forecast" fields from the product data.
+    Only the product columns are selected, as plain tuples; the buyer masking is done in the
+    SELECT and the page is serialized with orjson, without a model instance per row.
+    Serialized pages are cached per role view and query parameters until the next product write
+    (see `utils.response_cache`). Every page carries an ETag; a request whose If-None-Match
+    matches it gets an empty 304 Not Modified.
 
     Args:
+        request (Request): The incoming request, used for If-None-Match.
+        limit (int): The maximum number of products to return.
+        cursor (str, optional): The `X-Next-Cursor` value of the previous page.
+        category (str, optional): Only return products of this category.
+        supplier_id (int, optional): Only return products of this supplier.
+        min_price (float, optional): Only return products selling at or above this price.
+        max_price (float, optional): Only return products selling at or below this price.
+        search (str, optional): Only return products whose name, description or category contains
+            this text, ignoring case.
+        sort (str): The sort key ("id", "name" or "selling_price"), prefixed with "-" for descending order.
         db (AsyncSession): The database session dependency.
         current_user (User): The current authenticated user dependency.
 
     Returns:
-        List[dict]: A list of products. If the user is a buyer, certain fields are excluded from the product data.
+        List[ProductResponse]: A page of products, as JSON or 304 Not Modified. If the user is a buyer, certain fields are excluded from the product data.
+
+    Raises:
+        HTTPException: If the sort key or the cursor is invalid (400).
+    """
+    descending = sort.startswith("-")
+    sort_column = PRODUCT_SORT_KEYS.get(sort.lstrip("-"))
+    if sort_column is None:
+        raise HTTPException(status_code=400, detail=f"Invalid sort key, expected one of: {', '.join(PRODUCT_SORT_KEYS)}")
+    key_columns = [Product.id] if sort_column is Product.id else [sort_column, Product.id]
+    is_buyer = current_user.role.name == "buyer"
+
+    cache_key = None
+    if product_list_cache.enabled:
+        generation = await product_list_cache.generation()
+        if generation is not None:
+            cache_key = product_list_cache.key(
+                generation, is_buyer, limit, cursor, category, supplier_id, min_price, max_price, search, sort
+            )
+            cached = await product_list_cache.get(cache_key)
+            if cached is not None:
+                return conditional_response(cached, request, "HIT")
+
+    # Plain column tuples, with the fields hidden from buyers selected as NULL
+    columns = [null().label(field) if is_buyer and field in BUYER_HIDDEN_FIELDS else getattr(Product, field)
+               for field in PRODUCT_FIELDS]
+    query = filter_products(select(*columns), category, supplier_id, min_price, max_price, search)
+
+    if cursor:
+        try:
+            values = decode_cursor(cursor, [column.type.python_type for column in key_columns])
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        key = tuple_(*key_columns) if len(key_columns) > 1 else key_columns[0]
+        after = tuple_(*values) if len(values) > 1 else values[0]
+        query = query.where(key < after if descending else key > after)
+
+    query = query.order_by(*(column.desc() if descending else column.asc() for column in key_columns))
+    result = await db.execute(query.limit(limit + 1))
+    rows = result.all()
+
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        headers["X-Next-Cursor"] = encode_cursor([last[PRODUCT_FIELDS.index(column.key)] for column in key_columns])
+
+    entry = CachedResponse.build(rows_to_json(PRODUCT_FIELDS, rows), headers)
+    if cache_key is not None:
+        await product_list_cache.set(cache_key, entry)
+    return conditional_response(entry, request, "MISS" if cache_key is not None else "BYPASS")
+
+@router.get("/stats", response_model=List[ProductStatsResponse])
+async def get_product_stats(
+    group_by: str = Query("category", pattern="^(category|supplier|category_supplier)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
     """
-    result = await db.execute(select(Product))
-    products = result.scalars().all()
+    Get product statistics per category, per supplier or per (category, supplier) pair.
+
+    The statistics are read from the `product_stats` table, which every product write keeps up
+    to date, so the cost depends on the number of categories and suppliers rather than on the
+    number of products. If the current user has the role of "buyer", the average optimized
+    price and demand forecast are left empty.
 
-    if current_user.role == "buyer":
-        products = [product.dict(exclude={"optimized_price", "demand_forecast"}) for product in products]
+    Args:
+        group_by (str): "category", "supplier" or "category_supplier".
+        db (AsyncSession): The database session dependency.
+        current_user (User): The current authenticated user dependency.
 
-    return products
+    Returns:
+        List[ProductStatsResponse]: The product count, stock and units sold totals and the average
+            prices, rating and demand forecast of each group, ordered by the group keys.
+    """
+    stats = await read_product_stats(db, group_by)
+    if current_user.role.name == "buyer":
+        stats = [dict(group, avg_optimized_price=None, avg_demand_forecast=None) for group in stats]
+    return stats
+
+@router.get("/export")
+async def export_products(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    category: Optional[str] = None,
+    supplier_id: Optional[int] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Stream the product catalog as NDJSON or CSV.
+
+    Rows are read from a server-side cursor in chunks and written to the response as they arrive,
+    so memory use does not grow with the catalog size. Buyers do not receive the
+    "optimized_price" and "demand_forecast" columns.
+
+    Args:
+        format (str): Either "ndjson" (one JSON object per line) or "csv".
+        category (str, optional): Only export products of this category.
+        supplier_id (int, optional): Only export products of this supplier.
+        min_price (float, optional): Only export products selling at or above this price.
+        max_price (float, optional): Only export products selling at or below this price.
+        current_user (User): The current authenticated user dependency.
+
+    Returns:
+        StreamingResponse: The exported products, ordered by id.
+    """
+    fields = EXPORT_FIELDS
+    if current_user.role.name == "buyer":
+        fields = [field for field in fields if field not in BUYER_HIDDEN_FIELDS]
+
+    query = select(*(getattr(Product, field) for field in fields))
+    query = filter_products(query, category, supplier_id, min_price, max_price).order_by(Product.id)
+
+    return StreamingResponse(
+        stream_rows(query, fields, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=products.{format}"},
+    )
+
+@router.post("/import", response_model=ProductImportResponse, dependencies=[Depends(has_role(["supplier"]))])
+async def import_products(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Bulk-create products for the current supplier from a CSV or NDJSON upload.
+
+    The upload uses the columns of `product_data.csv` (description and customer_rating are
+    optional; product_id, demand_forecast and optimized_price are ignored). It is parsed in
+    chunks of `IMPORT_CHUNK_SIZE` rows; each chunk is validated, scored with one batched call to
+    each model and inserted in its own transaction, so chunks imported before an unparseable
+    part of the file are kept.
+
+    Args:
+        file (UploadFile): The uploaded CSV or NDJSON file.
+        format (str, optional): "csv" or "ndjson". Defaults to NDJSON for .ndjson/.jsonl files and CSV otherwise.
+        db (AsyncSession, optional): The database session dependency. Defaults to Depends(get_db).
+        current_user (User, optional): The current authenticated user. Defaults to Depends(get_current_user).
+
+    Returns:
+        ProductImportResponse: The number of inserted and rejected rows, and the first
+            `IMPORT_MAX_ERRORS` row errors.
+
+    Raises:
+        HTTPException: If the file cannot be parsed (400).
+        ExecutorSaturatedError: If the model workers are saturated (served as 503).
+    """
+    import_format = format or ("ndjson" if (file.filename or "").lower().endswith((".ndjson", ".jsonl")) else "csv")
+    demand_forecaster = await demand_forecaster_registry.aget()
+
+    inserted = 0
+    failed = 0
+    errors = []
+    try:
+        chunks = await run_in_threadpool(read_product_chunks, file.file, import_format, settings.IMPORT_CHUNK_SIZE)
+        while True:
+            chunk = await run_in_threadpool(next, chunks, None)
+            if chunk is None:
+                break
+
+            products, row_errors = validate_product_chunk(chunk)
+            failed += len(row_errors)
+            errors.extend(row_errors[:settings.IMPORT_MAX_ERRORS - len(errors)])
+            if products.empty:
+                continue
+
+            optimized_price, demand_forecast = await inference_executor.submit(
+                score_products, price_optimizer, demand_forecaster, products
+            )
+            products["optimized_price"] = optimized_price
+            products["demand_forecast"] = demand_forecast
+            products["supplier_id"] = current_user.id
+
+            rows = products.to_dict("records")
+            await bulk_insert(db, Product.__table__, rows)
+            await apply_stats_changes(db, added=rows)
+            await db.commit()
+            inserted += len(rows)
+    except ValueError as e:
+        if inserted:
+            await product_list_cache.invalidate()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Could not parse the uploaded file after importing {inserted} products: {e}",
+        )
+
+    if inserted:
+        await product_list_cache.invalidate()
+    return ProductImportResponse(inserted=inserted, failed=failed, errors=errors)
 
 # Admin can update any product, supplier can only update their own products
 @router.put("/{product_id}", response_model=ProductResponse, dependencies=[Depends(has_role(["admin", "supplier"]))])
@@ -133,31 +473,31 @@ async def update_product(product_id: int, product: ProductCreate, db: AsyncSessi
     Raises:
         HTTPException: If the product is not found (404).
         HTTPException: If the current user is a supplier and does not own the product (403).
+        ExecutorSaturatedError: If the model workers are saturated (served as 503).
     Returns:
         Product: The updated product.
     """
-    result = await db.execute(select(Product).where(Product.id == product_id))
+    result = await lock_products(db, select(Product).where(Product.id == product_id))
     db_product = result.scalars().first()
 
     if not db_product:
         raise HTTPException(status_code=404, detail="Product not found")
 
     # Ensure supplier can only update their own product
-    if current_user.role == "supplier" and current_user.id != db_product.user_id:
+    if current_user.role == UserRole.supplier and current_user.id != db_product.supplier_id:
         raise HTTPException(status_code=403, detail="You can only update your own products")
 
-    optimized_price = price_optimizer.predict(product)
-    product_obj = convert_to_product_create(product)
-    demand = demand_forecaster.predict(product_obj) 
-    total = product_obj.stock_available
-    demand_percentage = min((demand/total)*100, 100)
+    optimized_price, demand_percentage = await score_product(product)
     
+    previous_stats = stats_row(db_product)
     for key, value in product.model_dump().items():
         setattr(db_product, key, value)
-    setattr(db_product, 'optimized_price', round(float(optimized_price),2))
-    setattr(db_product, 'demand_forecast', round(float(demand_percentage),2))
+    setattr(db_product, 'optimized_price', optimized_price)
+    setattr(db_product, 'demand_forecast', demand_percentage)
+    await apply_stats_changes(db, removed=[previous_stats], added=[stats_row(db_product)])
     await db.commit()
     await db.refresh(db_product)
+    await product_list_cache.invalidate()
     
     return db_product
     
@@ -180,52 +520,249 @@ async def delete_product(product_id: int, db: AsyncSession = Depends(get_db), cu
     Returns:
         Product: The deleted product.
     """
-    result = await db.execute(select(Product).where(Product.id == product_id))
+    result = await lock_products(db, select(Product).where(Product.id == product_id))
     db_product = result.scalars().first()
 
     if not db_product:
         raise HTTPException(status_code=404, detail="Product not found")
 
     # Ensure supplier can only delete their own product
-    if current_user.role == "supplier" and current_user.id != db_product.user_id:
+    if current_user.role == UserRole.supplier and current_user.id != db_product.supplier_id:
         raise HTTPException(status_code=403, detail="You can only delete your own products")
 
     await db.delete(db_product)
+    await apply_stats_changes(db, removed=[stats_row(db_product)])
     await db.commit()
+    await product_list_cache.invalidate()
 
     return db_product
 
 
+async def fetch_feature_rows(db: AsyncSession, product_ids: List[int], extra_columns=(), for_update: bool = False):
+    """
+    Fetches the model features and stock of the given products, in chunks of IN (...) lookups.
+
+    Args:
+        db (AsyncSession): The database session.
+        product_ids (List[int]): The products to fetch.
+        extra_columns (tuple, optional): Further Product columns appended to each row.
+        for_update (bool, optional): Lock the rows until the transaction ends, in id order.
+
+    Returns:
+        List[Row]: (id, cost_price, selling_price, units_sold, customer_rating, category,
+            stock_available, *extra_columns) rows of the products that exist, in no particular order.
+    """
+    product_ids = sorted(set(product_ids))
+    feature_columns = (Product.id, Product.cost_price, Product.selling_price, Product.units_sold,
+                       Product.customer_rating, Product.category, Product.stock_available, *extra_columns)
+    rows = []
+    chunk_size = settings.FORECAST_QUERY_CHUNK_SIZE
+    for start in range(0, len(product_ids), chunk_size):
+        query = select(*feature_columns).where(Product.id.in_(product_ids[start:start + chunk_size]))
+        res = await (lock_products(db, query.order_by(Product.id)) if for_update else db.execute(query))
+        rows.extend(res.all())
+    return rows
+
+
 @router.post("/forecast", response_model=List[ForecastResponse], dependencies=[Depends(has_role(["admin", "supplier"]))])
 async def get_products_forecast(request: ForecastRequest, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
     """
-    Get forecasted demand for a list of product IDs, including demand for the current product's price.
+    Get forecasted demand for a list of product IDs at each product's current price.
+
+    Products are loaded with chunked IN (...) queries, scored in one batched model call and
+    their demand_forecast written back with a single bulk UPDATE in one transaction.
+    Unknown product IDs are skipped.
 
     Args:
         request: Request object containing a list of product IDs.
 
     Returns:
-        A list of JSON responses, each containing the product ID and a list of forecasts for each price,
-        including the demand for the current product's price.
+        A list of JSON responses, each containing the product ID and its demand forecast as a
+        percentage of available stock. See POST /products/demand-curve for demand across prices.
     """
-    forecasts = []
-    demand_forecaster = DemandForecaster()
-    for product_id in request.product_ids:
-        # Fetch product details using await
-        res = await db.execute(select(Product).where(Product.id == product_id))
-        product = res.scalars().first()
-        
-        if product:
-            # Find the nearest price in the range to the current product price
-            product_obj = convert_to_product_create(product)
-            demand = demand_forecaster.predict(product_obj) 
-            total = product_obj.stock_available
-            demand_percentage = min((demand/total)*100, 100)
-
-            forecasts.append(ForecastResponse(product_id=product_id, demand=float(demand_percentage)))
-            product.demand_forecast = round(demand_percentage, 2)
-            db.add(product)
-            await db.commit()
-            await db.refresh(product)
+    demand_forecaster = await demand_forecaster_registry.aget()
+    # The rows stay locked until the forecasts and the statistics are written
+    rows = await fetch_feature_rows(db, request.product_ids, (Product.supplier_id, Product.optimized_price, Product.demand_forecast),
+                                    for_update=True)
+    if not rows:
+        return []
+
+    ids = [row.id for row in rows]
+    batch = convert_to_feature_batch(rows)
+    demand = await inference_executor.submit(demand_forecaster.predict_many, batch)
+    demand_percentage = to_demand_percentage(demand, batch["stock_available"])
+
+    stored_demand = [round(float(percentage), 2) for percentage in demand_percentage]
+    # Write every forecast back in a single bulk UPDATE and transaction
+    await db.execute(update(Product), [
+        {"id": product_id, "demand_forecast": percentage}
+        for product_id, percentage in zip(ids, stored_demand)
+    ])
+    previous_stats = [dict(row._mapping) for row in rows]
+    await apply_stats_changes(db, removed=previous_stats, added=[
+        dict(stats, demand_forecast=percentage) for stats, percentage in zip(previous_stats, stored_demand)
+    ])
+    await db.commit()
+    await product_list_cache.invalidate()
+
+    demand_by_id = dict(zip(ids, demand_percentage))
+    return [
+        ForecastResponse(product_id=product_id, demand=float(demand_by_id[product_id]))
+        for product_id in request.product_ids
+        if product_id in demand_by_id
+    ]
+
+
+@router.post("/demand-curve", response_model=List[DemandCurveResponse], dependencies=[Depends(has_role(["admin", "supplier"]))])
+async def get_demand_curves(request: DemandCurveRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Forecast each product's demand across a grid of candidate selling prices.
+
+    Prices run from the cost price to twice the current selling price. All products and prices
+    are scored with one batched model call. Revenue and profit assume sales are capped by the
+    available stock. Unknown product IDs are skipped and nothing is written back.
+
+    Args:
+        request (DemandCurveRequest): The product IDs and the number of prices per product.
+
+    Returns:
+        List[DemandCurveResponse]: The demand curve and the revenue- and profit-maximizing
+            prices of each product, in request order.
+
+    Raises:
+        HTTPException: If products x points exceeds DEMAND_CURVE_MAX_ROWS (400).
+        ExecutorSaturatedError: If the model workers are saturated (served as 503).
+    """
+    product_ids = list(dict.fromkeys(request.product_ids))
+    if len(product_ids) * request.points > settings.DEMAND_CURVE_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.DEMAND_CURVE_MAX_ROWS} product prices can be evaluated per request",
+        )
+
+    demand_forecaster = await demand_forecaster_registry.aget()
+    rows = await fetch_feature_rows(db, product_ids)
+    if not rows:
+        return []
+
+    ids = [row.id for row in rows]
+    curves = await inference_executor.submit(demand_curves, demand_forecaster, convert_to_feature_batch(rows), request.points)
+
+    row_by_id = {product_id: row for row, product_id in enumerate(ids)}
+    responses = []
+    for product_id in product_ids:
+        row = row_by_id.get(product_id)
+        if row is None:
+            continue
+        revenue_index = curves["revenue_optimal_index"][row]
+        profit_index = curves["profit_optimal_index"][row]
+        responses.append(DemandCurveResponse(
+            product_id=product_id,
+            prices=curves["prices"][row].tolist(),
+            demand=[round(float(demand), 2) for demand in curves["demand"][row]],
+            revenue_optimal_price=float(curves["prices"][row, revenue_index]),
+            max_revenue=round(float(curves["revenue"][row, revenue_index]), 2),
+            profit_optimal_price=float(curves["prices"][row, profit_index]),
+            max_profit=round(float(curves["profit"][row, profit_index]), 2),
+        ))
+    return responses
+
+
+@router.post("/model/reload", response_model=ModelStatusResponse, dependencies=[Depends(has_role(["admin"]))])
+async def reload_demand_model(force_retrain: bool = False):
+    """
+    Reload the shared demand model without restarting the process.
+
+    The model is loaded from a persisted artifact when one matches the current training data
+    and hyperparameters, otherwise it is retrained. Requests keep using the previous version
+    until the new one is ready.
+
+    Args:
+        force_retrain (bool, optional): Refit the model even if a matching artifact exists.
+
+    Returns:
+        ModelStatusResponse: The version and origin of the newly active model.
+
+    Raises:
+        HTTPException: If the training data cannot be loaded (500).
+    """
+    try:
+        return await demand_forecaster_registry.areload(force_retrain=force_retrain)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
 
-    return forecasts
\ No newline at end of file
+@router.post("/model/retrain", response_model=RetrainResponse, dependencies=[Depends(has_role(["admin"]))])
+async def retrain_demand_model():
+    """
+    Run one incremental training round now instead of waiting for the schedule.
+
+    New trees are fitted on the rows appended to the training CSV since the model was built or
+    last grown, and the grown model replaces the current one only if it passes validation.
+
+    Returns:
+        RetrainResponse: Whether a new model was activated, and its validation scores.
+
+    Raises:
+        HTTPException: If the training data cannot be loaded (500).
+    """
+    try:
+        return await retrain_incrementally(demand_forecaster_registry)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.post("/reprice", response_model=RepricingStatusResponse, status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(has_role(["admin"]))])
+async def start_repricing(resume: bool = False):
+    """
+    Start repricing the whole catalog in the background.
+
+    Products are rescored in keyset-ordered chunks of `REPRICE_CHUNK_SIZE` and only the ones
+    whose optimized price or demand forecast changed are written. Follow the run with
+    GET /products/reprice/status.
+
+    Args:
+        resume (bool, optional): Continue after the last chunk committed by an interrupted run.
+
+    Returns:
+        RepricingStatusResponse: The status of the started run.
+
+    Raises:
+        HTTPException: If a run is already in progress (409).
+    """
+    if not repricing_job.start(resume=resume):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A repricing run is already in progress")
+    return repricing_job.status()
+
+
+@router.get("/reprice/status", response_model=RepricingStatusResponse, dependencies=[Depends(has_role(["admin"]))])
+async def get_repricing_status():
+    """
+    Get the progress of the current or last catalog repricing run.
+
+    Returns:
+        RepricingStatusResponse: The state, processed and updated product counts, throughput and
+            estimated time left.
+    """
+    return repricing_job.status()
+
+
+@router.post("/pricing-rules/reload", response_model=PricingRulesResponse, dependencies=[Depends(has_role(["admin"]))])
+async def reload_pricing_rules():
+    """
+    Recompile the pricing rules file.
+
+    Edits to the rules file are picked up automatically on the next pricing call; this endpoint
+    forces a reload and reports any error in the file.
+
+    Returns:
+        PricingRulesResponse: The version and the categories of the newly active rules.
+
+    Raises:
+        HTTPException: If the rules file is missing or invalid (400). The previous rules stay active.
+    """
+    try:
+        rules = price_optimizer.rules.reload()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return PricingRulesResponse(version=rules.version, categories=list(rules.category_index))
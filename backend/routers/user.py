@@ -15,8 +15,8 @@ Models:
     - UserResponse: The Pydantic schema for the user response.
 Utilities:
     - create_access_token: Utility function to create a JWT access token.
-    - send_verification_email: Utility function to send a verification email.
-    - hash_password: Utility function to hash a password.
+    - send_verification_email: Utility function to queue a verification email.
+    - hash_password_async: Utility function to hash a password off the event loop.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, status
@@ -27,7 +27,7 @@ from schemas.user import UserCreate, UserResponse
 from database.config import get_db
 from utils.jwt import create_access_token
 from utils.email import send_verification_email
-from utils.dependencies import hash_password
+from utils.password import hash_password_async
 from utils.dependencies import get_current_user
 from fastapi.responses import JSONResponse
 from typing import Any
@@ -46,14 +46,14 @@ async def register_user(user: UserCreate, db: AsyncSession = Depends(get_db)) ->
         UserResponse: The registered user information.
     Raises:
         HTTPException: If the email is already registered.
+        ExecutorSaturatedError: If the password hashing pool is saturated (served as 503).
     Processes:
         1. Checks if the user already exists in the database by email.
-        2. Hashes the user's password.
+        2. Hashes the user's password on the password hashing pool.
         3. Creates a new user object and adds it to the database.
         4. Commits the transaction and refreshes the user object.
-        5. Sends an email verification link to the user's email.
-    Note:
-        The email verification link sending is simplified for now.
+        5. Queues an email verification link to the user's email. The email is sent in the
+           background, so registration does not wait for the mail server.
     """
     # Check if user already exists
     result = await db.execute(select(User).where(User.email == user.email))
@@ -62,7 +62,7 @@ async def register_user(user: UserCreate, db: AsyncSession = Depends(get_db)) ->
         raise HTTPException(status_code=400, detail=[{"msg": "Email is already registered"}])
 
     # Hash the password before saving
-    hashed_password = hash_password(user.password)
+    hashed_password = await hash_password_async(user.password)
 
     # Create a new user object
     db_user = User(
@@ -77,7 +77,7 @@ async def register_user(user: UserCreate, db: AsyncSession = Depends(get_db)) ->
     await db.commit()
     await db.refresh(db_user)
 
-    # Send email verification link (simplified for now)
+    # Queue the email verification link
     verification_token = create_access_token(data={"sub": db_user.email})
 
     send_verification_email(db_user.email, verification_token)
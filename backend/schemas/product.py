@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
+from datetime import datetime
 
 # Request schema for creating/updating a product
 class ProductCreate(BaseModel):
@@ -29,5 +30,78 @@ class ForecastResponse(BaseModel):
     product_id: int
     demand: float
 
+class DemandCurveRequest(BaseModel):
+    product_ids: List[int]
+    points: int = Field(50, ge=2, le=200)  # Candidate prices per product
+
+class DemandCurveResponse(BaseModel):
+    product_id: int
+    prices: List[float]
+    demand: List[float]  # Forecasted units at each price
+    revenue_optimal_price: float
+    max_revenue: float
+    profit_optimal_price: float
+    max_profit: float
+
 class OptimizePriceResponse(BaseModel):
     optimized_prices: List[dict] 
+
+class ProductImportError(BaseModel):
+    row: int
+    error: str
+
+class ProductImportResponse(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[ProductImportError]
+
+class ModelStatusResponse(BaseModel):
+    version: int
+    loaded: bool
+    artifact_key: Optional[str] = None
+    loaded_from_artifact: bool
+    data_source: Optional[str] = None
+    loaded_at: Optional[datetime] = None
+    mse: Optional[float] = None
+    trained_rows: int = 0
+    incremental_updates: int = 0
+
+class RetrainResponse(BaseModel):
+    accepted: bool
+    reason: str
+    new_rows: int
+    trained_rows: int
+    n_estimators: Optional[int] = None
+    current_mse: Optional[float] = None
+    candidate_mse: Optional[float] = None
+    version: int
+
+class RepricingStatusResponse(BaseModel):
+    state: str
+    resumed: bool
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    last_id: int
+    processed: int
+    updated: int
+    total: Optional[int] = None
+    rows_per_second: float
+    eta_seconds: Optional[float] = None
+    model_version: Optional[int] = None
+    error: Optional[str] = None
+
+class ProductStatsResponse(BaseModel):
+    category: Optional[str] = None
+    supplier_id: Optional[int] = None
+    product_count: int
+    total_stock: int
+    total_units_sold: int
+    avg_cost_price: Optional[float] = None
+    avg_selling_price: Optional[float] = None
+    avg_optimized_price: Optional[float] = None
+    avg_customer_rating: Optional[float] = None
+    avg_demand_forecast: Optional[float] = None
+
+class PricingRulesResponse(BaseModel):
+    version: int
+    categories: List[str]
@@ -0,0 +1,181 @@
+"""
+This module compiles the trained demand pipeline into flat NumPy arrays for fast inference.
+
+Calling the scikit-learn pipeline builds a DataFrame, runs the `ColumnTransformer` and
+`OneHotEncoder`, then walks every tree in turn, which costs milliseconds even for one product.
+`CompiledForest` instead keeps:
+
+- the nodes of all trees concatenated into parallel arrays (left child, right child, feature,
+  threshold, missing-value direction, value), with leaves pointing at themselves;
+- the numeric input columns and a category -> one-hot column map taken from the preprocessor.
+
+Prediction encodes the inputs as float32 rows (as scikit-learn does) and moves all (row, tree)
+pairs that have not reached a leaf one level down per step, so a batch of products is evaluated
+with a few array operations per tree level.
+
+Classes:
+    CompiledForest: Array-backed evaluator of a trained preprocessor + random forest pipeline.
+"""
+import numpy as np
+import pandas as pd
+
+# Rows evaluated at once; bounds the (rows x trees) working arrays
+PREDICT_CHUNK_SIZE = 4096
+
+
+class CompiledForest:
+    def __init__(self, pipeline):
+        """
+        Compiles a fitted pipeline of a ColumnTransformer (numeric passthrough + one-hot encoded
+        category) and a RandomForestRegressor.
+
+        Args:
+            pipeline (Pipeline): The fitted pipeline of `DemandForecaster`.
+
+        Raises:
+            ValueError: If the pipeline does not have the expected structure.
+        """
+        from sklearn.preprocessing import OneHotEncoder
+
+        preprocessor = pipeline.named_steps['preprocessor']
+        regressor = pipeline.named_steps['regressor']
+        transformers = {name: (transformer, columns) for name, transformer, columns in preprocessor.transformers_}
+        if set(transformers) - {'num', 'cat', 'remainder'} or 'num' not in transformers or 'cat' not in transformers:
+            raise ValueError("Cannot compile pipeline: unexpected preprocessor transformers")
+        # The fitted transformer list wraps 'passthrough' in a FunctionTransformer; check the declared one
+        declared = {name: transformer for name, transformer, _ in preprocessor.transformers}
+        if declared.get('num') != 'passthrough':
+            raise ValueError("Cannot compile pipeline: numeric features must be passed through")
+        encoder, category_columns = transformers['cat']
+        if (not isinstance(encoder, OneHotEncoder) or len(category_columns) != 1 or encoder.drop is not None
+                or encoder.min_frequency is not None or encoder.max_categories is not None):
+            raise ValueError("Cannot compile pipeline: expected a plain one-hot encoding of one column")
+
+        self.numeric_columns = list(transformers['num'][1])
+        self.category_column = category_columns[0]
+        n_numeric = len(self.numeric_columns)
+        self.category_index = {category: n_numeric + i for i, category in enumerate(encoder.categories_[0])}
+        self.n_features = n_numeric + len(self.category_index)
+
+        trees = [estimator.tree_ for estimator in regressor.estimators_]
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        self.roots = offsets[:-1].astype(np.int32)
+
+        left, right, feature, threshold, missing_left, value = [], [], [], [], [], []
+        for offset, tree in zip(offsets, trees):
+            is_leaf = tree.children_left < 0
+            node_ids = np.arange(tree.node_count) + offset
+            # Leaves point back to themselves, which also marks them as leaves
+            left.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            right.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            missing_left.append(np.asarray(getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count)), dtype=bool))
+            value.append(tree.value[:, 0, 0])
+        self.left = np.concatenate(left).astype(np.int32)
+        self.right = np.concatenate(right).astype(np.int32)
+        self.feature = np.concatenate(feature).astype(np.int32)
+        self.threshold = np.concatenate(threshold).astype(np.float64)
+        self.missing_left = np.concatenate(missing_left)
+        self.value = np.concatenate(value).astype(np.float64)
+        self.is_leaf = self.left == np.arange(len(self.left))
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The memory used by the node arrays, in bytes.
+        """
+        return sum(array.nbytes for array in (self.left, self.right, self.feature, self.threshold,
+                                              self.missing_left, self.value, self.is_leaf, self.roots))
+
+    def encode(self, batch) -> np.ndarray:
+        """
+        Encodes a columnar batch into the model's float32 feature matrix.
+
+        Args:
+            batch (pd.DataFrame | Mapping[str, array-like]): The numeric feature columns and the
+                category column.
+
+        Returns:
+            np.ndarray: One row of numeric features followed by one-hot category columns per product.
+                Unknown categories have no one-hot column set.
+        """
+        categories = np.asarray(batch[self.category_column], dtype=object).ravel()
+        n = len(categories)
+        features = np.zeros((n, self.n_features), dtype=np.float32)
+        for i, column in enumerate(self.numeric_columns):
+            features[:, i] = np.asarray(batch[column], dtype=np.float32)
+        codes = np.fromiter((self.category_index.get(category, -1) for category in categories), dtype=np.intp, count=n)
+        known = codes >= 0
+        features[np.flatnonzero(known), codes[known]] = 1.0
+        return features
+
+    def predict(self, batch) -> np.ndarray:
+        """
+        Predicts the demand of each product in a columnar batch.
+
+        Args:
+            batch (pd.DataFrame | Mapping[str, array-like]): The numeric feature columns and the
+                category column.
+
+        Returns:
+            np.ndarray: The forest's prediction for each row, in input order.
+        """
+        features = self.encode(batch)
+        predictions = np.empty(len(features), dtype=np.float64)
+        for start in range(0, len(features), PREDICT_CHUNK_SIZE):
+            chunk = features[start:start + PREDICT_CHUNK_SIZE]
+            predictions[start:start + len(chunk)] = self._predict_encoded(chunk)
+        return predictions
+
+    def _predict_encoded(self, features):
+        n_trees = len(self.roots)
+        flat_features = features.ravel()
+        # One entry per (row, tree) pair; only pairs that have not reached a leaf are advanced
+        nodes = np.tile(self.roots, len(features))
+        feature_offsets = np.repeat(np.arange(len(features), dtype=np.int64) * self.n_features, n_trees)
+        active = np.flatnonzero(~self.is_leaf[nodes])
+        while active.size:
+            active_nodes = nodes[active]
+            values = flat_features[feature_offsets[active] + self.feature[active_nodes]]
+            go_left = values <= self.threshold[active_nodes]
+            go_left |= np.isnan(values) & self.missing_left[active_nodes]
+            active_nodes = np.where(go_left, self.left[active_nodes], self.right[active_nodes])
+            nodes[active] = active_nodes
+            active = active[~self.is_leaf[active_nodes]]
+        return self.value[nodes].reshape(len(features), n_trees).mean(axis=1)
+
+    def verify(self, pipeline, n_rows: int = 256, tolerance: float = 1e-6, seed: int = 0):
+        """
+        Checks that the compiled forest reproduces the pipeline's predictions.
+
+        Rows are drawn around the split thresholds of each numeric feature, over all known
+        categories plus an unknown one.
+
+        Args:
+            pipeline (Pipeline): The pipeline this forest was compiled from.
+            n_rows (int, optional): The number of rows to compare.
+            tolerance (float, optional): The maximum allowed absolute and relative difference.
+            seed (int, optional): The random seed of the generated rows.
+
+        Raises:
+            ValueError: If any prediction differs by more than `tolerance`.
+        """
+        rng = np.random.default_rng(seed)
+        batch = {}
+        for i, column in enumerate(self.numeric_columns):
+            thresholds = self.threshold[(self.feature == i) & np.isfinite(self.threshold)]
+            if len(thresholds) == 0:
+                thresholds = np.array([0.0])
+            # Exact thresholds exercise the <= comparisons, jittered ones the space around them
+            picked = rng.choice(thresholds, size=n_rows)
+            batch[column] = np.where(rng.random(n_rows) < 0.5, picked, picked * rng.uniform(0.9, 1.1, size=n_rows))
+        categories = list(self.category_index) + ["__unknown__"]
+        batch[self.category_column] = rng.choice(np.array(categories, dtype=object), size=n_rows)
+        frame = pd.DataFrame(batch)[self.numeric_columns + [self.category_column]]
+
+        expected = np.asarray(pipeline.predict(frame), dtype=float)
+        actual = self.predict(frame)
+        if not np.allclose(actual, expected, rtol=tolerance, atol=tolerance):
+            worst = float(np.max(np.abs(actual - expected)))
+            raise ValueError(f"Compiled forest does not match the pipeline (max difference {worst:g})")
@@ -0,0 +1,71 @@
+"""
+This module computes price-demand curves with the demand model.
+
+Every product is evaluated at a grid of candidate selling prices, from its cost price to twice
+its current selling price. All (product, price) pairs are scored with a single batched model
+call, and the revenue- and profit-maximizing prices are picked from the resulting curves.
+Sales are bounded by the available stock.
+
+Functions:
+    price_grid(cost_price, selling_price, points: int) -> np.ndarray:
+        Builds the candidate prices of each product.
+    demand_curves(demand_forecaster, batch, points: int) -> dict:
+        Forecasts demand over the price grid and finds the optimal prices.
+"""
+import numpy as np
+from services.demand_forecaster import FEATURE_COLUMNS
+
+
+def price_grid(cost_price, selling_price, points: int) -> np.ndarray:
+    """
+    Builds evenly spaced candidate prices from cost price to twice the selling price.
+
+    Args:
+        cost_price (array-like): The cost price of each product.
+        selling_price (array-like): The current selling price of each product.
+        points (int): The number of prices per product.
+
+    Returns:
+        np.ndarray: A (products, points) array of prices, rounded to 2 decimals.
+    """
+    low = np.asarray(cost_price, dtype=float)
+    high = np.maximum(2 * np.asarray(selling_price, dtype=float), low)
+    steps = np.linspace(0.0, 1.0, points)
+    return np.round(low[:, None] + (high - low)[:, None] * steps, 2)
+
+
+def demand_curves(demand_forecaster, batch, points: int) -> dict:
+    """
+    Forecasts the demand of each product at every price of its grid in one model call.
+
+    CPU-bound; run it on the inference executor from async code.
+
+    Args:
+        demand_forecaster (DemandForecaster): The trained demand model.
+        batch (Mapping[str, array-like]): The model features plus stock_available.
+        points (int): The number of prices per product.
+
+    Returns:
+        dict: (products, points) arrays "prices", "demand", "revenue" and "profit", and per-product
+            arrays "revenue_optimal_index" and "profit_optimal_index" into the price grid.
+    """
+    cost_price = np.asarray(batch['cost_price'], dtype=float)
+    stock_available = np.asarray(batch['stock_available'], dtype=float)
+    prices = price_grid(cost_price, batch['selling_price'], points)
+
+    # One row per (product, candidate price); only the selling price varies within a product
+    grid_batch = {column: np.repeat(np.asarray(batch[column]), points) for column in FEATURE_COLUMNS}
+    grid_batch['selling_price'] = prices.ravel()
+    demand = np.maximum(demand_forecaster.predict_many(grid_batch).reshape(prices.shape), 0.0)
+
+    units_sold = np.minimum(demand, np.maximum(stock_available, 0.0)[:, None])
+    revenue = prices * units_sold
+    profit = (prices - cost_price[:, None]) * units_sold
+    return {
+        "prices": prices,
+        "demand": demand,
+        "revenue": revenue,
+        "profit": profit,
+        "revenue_optimal_index": revenue.argmax(axis=1),
+        "profit_optimal_index": profit.argmax(axis=1),
+    }
@@ -1,43 +1,158 @@
+import copy
+import os
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
-from sklearn.metrics import mean_squared_error
-from sklearn.preprocessing import OneHotEncoder
+from core.config import settings
 from schemas.product import ProductCreate
+from services.compiled_forest import CompiledForest
+
+
+def hyperparameters_from_settings() -> dict:
+    """
+    Builds the forest hyperparameters from the DEMAND_MODEL_* settings.
+
+    Parallelism (n_jobs) is not a hyperparameter: it does not change the fitted trees, so it is
+    kept out of the artifact key and applied when fitting and predicting.
+
+    Returns:
+        dict: Keyword arguments for the `RandomForestRegressor`. Unset depth and sample limits
+            are left at the scikit-learn defaults.
+    """
+    hyperparameters = {
+        "random_state": 42,
+        "n_estimators": settings.DEMAND_MODEL_N_ESTIMATORS,
+        "min_samples_leaf": settings.DEMAND_MODEL_MIN_SAMPLES_LEAF,
+    }
+    if settings.DEMAND_MODEL_MAX_DEPTH > 0:
+        hyperparameters["max_depth"] = settings.DEMAND_MODEL_MAX_DEPTH
+    if settings.DEMAND_MODEL_MAX_SAMPLES > 0:
+        # A fraction of the training set, or a row count when above 1
+        max_samples = settings.DEMAND_MODEL_MAX_SAMPLES
+        hyperparameters["max_samples"] = max_samples if max_samples <= 1 else int(max_samples)
+    return hyperparameters
+
+
+DEFAULT_HYPERPARAMETERS = hyperparameters_from_settings()
+
+# Model input columns, in the order the preprocessor expects them
+FEATURE_COLUMNS = ['cost_price', 'selling_price', 'units_sold', 'customer_rating', 'category']
+
+
+def require_feature_columns(batch):
+    """
+    Raises a ValueError if a feature column is missing from the batch.
+    """
+    missing = [column for column in FEATURE_COLUMNS if column not in batch]
+    if missing:
+        raise ValueError(f"Missing feature columns: {', '.join(missing)}")
+
+
+def to_feature_frame(batch) -> pd.DataFrame:
+    """
+    Builds the model input frame from a columnar batch of products.
+
+    Args:
+        batch (pd.DataFrame | Mapping[str, array-like]): A DataFrame, or a mapping of column name
+            to NumPy array / list, containing at least the `FEATURE_COLUMNS`.
+
+    Returns:
+        pd.DataFrame: A frame holding only the `FEATURE_COLUMNS`, in model order.
+
+    Raises:
+        ValueError: If a feature column is missing from the batch.
+    """
+    require_feature_columns(batch)
+    if isinstance(batch, pd.DataFrame):
+        return batch[FEATURE_COLUMNS]
+    return pd.DataFrame({column: np.asarray(batch[column]) for column in FEATURE_COLUMNS})
+
+
+def to_demand_percentage(demand, stock_available):
+    """
+    Expresses forecasted demand as a percentage of the available stock, capped at 100.
+
+    Args:
+        demand (array-like): The forecasted demand of each product.
+        stock_available (array-like): The units in stock of each product.
+
+    Returns:
+        np.ndarray: The demand percentage of each product. Products without stock are reported at 100.
+    """
+    demand = np.asarray(demand, dtype=float)
+    stock_available = np.asarray(stock_available, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percentage = np.where(stock_available > 0, demand / stock_available * 100, 100.0)
+    return np.minimum(percentage, 100)
 
 
 class DemandForecaster:
-    def __init__(self, data_path="product_data.csv"):
+    def __init__(self, data_path="product_data.csv", hyperparameters=None, train=True, training_data=None,
+                 n_jobs=None, predict_n_jobs=None):
         """
         Initializes the DemandForecaster with the path to the product data CSV.
 
         Args:
             data_path (str, optional): The path to the CSV file containing product data.
                 Defaults to "product_data.csv".
+            hyperparameters (dict, optional): Keyword arguments for the `RandomForestRegressor`.
+                Defaults to `DEFAULT_HYPERPARAMETERS`.
+            train (bool, optional): Whether to train the model immediately. Pass False when the
+                pipeline is going to be restored from a saved artifact. Defaults to True.
+            training_data (pd.DataFrame, optional): Training rows from a training data source
+                (see `services.training_data`). Defaults to reading `data_path`.
+            n_jobs (int, optional): Cores used to fit trees, -1 for all. Defaults to DEMAND_MODEL_N_JOBS.
+            predict_n_jobs (int, optional): Cores used to predict, -1 for all. Defaults to
+                DEMAND_MODEL_PREDICT_N_JOBS.
         """
         self.data_path = data_path
-        self.model = None
-        self.load_and_train_model()
+        self.hyperparameters = dict(hyperparameters or DEFAULT_HYPERPARAMETERS)
+        self.hyperparameters.pop("n_jobs", None)
+        self.n_jobs = n_jobs or settings.DEMAND_MODEL_N_JOBS
+        self.predict_n_jobs = predict_n_jobs or settings.DEMAND_MODEL_PREDICT_N_JOBS
+        self._model = None
+        self.mse = None
+        # Array-backed copy of the trained forest used for predictions, see `compile`
+        self.compiled = None
+        # Where the pipeline is reloaded from once it is released, see `release_pipeline`
+        self.artifact_path = None
+        if train:
+            self.load_and_train_model(training_data)
 
-    def load_and_train_model(self):
+    def load_and_train_model(self, training_data=None):
         """
         Loads product data from CSV, prepares data for training, splits into training
         and testing sets, trains a random forest regression model using a pipeline, and evaluates
         its performance using mean squared error (MSE).
 
+        Args:
+            training_data (pd.DataFrame, optional): The feature columns and "demand_forecast"
+                target to train on. Defaults to reading the CSV at `data_path`.
+
         Returns:
             None: The model is stored internally within the DemandForecaster object.
         """
+        # scikit-learn takes over a second to import; defer it until a model is actually trained
+        from sklearn.model_selection import train_test_split
+        from sklearn.ensemble import RandomForestRegressor
+        from sklearn.compose import ColumnTransformer
+        from sklearn.pipeline import Pipeline
+        from sklearn.metrics import mean_squared_error
+        from sklearn.preprocessing import OneHotEncoder
+
         # Load product data
-        try:
-            product_data = pd.read_csv(self.data_path)
-        except FileNotFoundError:
-            raise ValueError(f"Product data CSV not found at path: {self.data_path}")
+        if training_data is not None:
+            product_data = training_data
+        else:
+            try:
+                product_data = pd.read_csv(self.data_path)
+            except FileNotFoundError:
+                raise ValueError(f"Product data CSV not found at path: {self.data_path}")
+
+        if len(product_data) < 2:
+            raise ValueError(f"Not enough training rows to train the demand model: {len(product_data)}")
 
         # Features (X) and Target (y)
-        X = product_data[['cost_price', 'selling_price', 'units_sold', 'customer_rating', 'category']]
+        X = product_data[FEATURE_COLUMNS]
         y = product_data['demand_forecast']  # Target
 
         numeric_features = ['cost_price', 'selling_price', 'units_sold', 'customer_rating']
@@ -53,7 +168,7 @@ class DemandForecaster:
         # Create the pipeline
         pipeline = Pipeline([
             ('preprocessor', preprocessor),
-            ('regressor', RandomForestRegressor(random_state=42))
+            ('regressor', RandomForestRegressor(**self.hyperparameters, n_jobs=self.n_jobs))
         ])
 
         # Split data into training and testing sets
@@ -68,7 +183,177 @@ class DemandForecaster:
         print(f"Mean Squared Error (MSE): {mse:.2f}")
 
         # Store the trained pipeline
-        self.model = pipeline
+        pipeline.named_steps['regressor'].set_params(n_jobs=self.predict_n_jobs)
+        self._model = pipeline
+        self.artifact_path = None
+        self.mse = float(mse)
+        self._refresh_compiled()
+
+    @property
+    def trained(self) -> bool:
+        """
+        Whether the forecaster holds a trained model, as a pipeline or compiled.
+        """
+        return self._model is not None or self.compiled is not None
+
+    @property
+    def model(self):
+        """
+        The scikit-learn pipeline. Once released (see `release_pipeline`), it is read back from the
+        artifact on every access and not kept in memory.
+
+        Raises:
+            ValueError: If the pipeline was released and its artifact cannot be read.
+        """
+        if self._model is not None or self.artifact_path is None:
+            return self._model
+        import joblib
+
+        try:
+            pipeline = joblib.load(self.artifact_path)["model"]
+        except Exception as e:
+            raise ValueError(f"Cannot reload the demand pipeline from {self.artifact_path}: {e}")
+        pipeline.named_steps['regressor'].set_params(n_jobs=self.predict_n_jobs)
+        return pipeline
+
+    @property
+    def n_estimators(self) -> int:
+        """
+        The number of trees in the forest.
+        """
+        if self.compiled is not None:
+            return len(self.compiled.roots)
+        return self.model.named_steps['regressor'].n_estimators
+
+    def release_pipeline(self, artifact_path) -> bool:
+        """
+        Drops the in-memory scikit-learn pipeline once the compiled forest can serve every
+        prediction, unless DEMAND_MODEL_KEEP_PIPELINE is set. The pipeline stays available through
+        `model`, which reads it from the artifact.
+
+        Args:
+            artifact_path (str): The artifact the pipeline was saved to or loaded from.
+
+        Returns:
+            bool: Whether the pipeline was released.
+        """
+        if self.compiled is None or settings.DEMAND_MODEL_KEEP_PIPELINE:
+            return False
+        self.artifact_path = os.path.abspath(artifact_path)
+        self._model = None
+        return True
+
+    def save(self, path):
+        """
+        Serializes the trained pipeline, its hyperparameters and evaluation score to disk.
+
+        Args:
+            path (str): The file path of the artifact to write.
+
+        Raises:
+            ValueError: If the model has not been trained yet.
+        """
+        if not self.trained:
+            raise ValueError("Model not trained. Please call load_and_train_model() first.")
+        import joblib
+
+        joblib.dump(
+            {"model": self.model, "hyperparameters": self.hyperparameters, "mse": self.mse},
+            path,
+        )
+
+    @classmethod
+    def load(cls, path, data_path="product_data.csv"):
+        """
+        Restores a DemandForecaster from an artifact written by `save`, without retraining.
+
+        Args:
+            path (str): The file path of the artifact to read.
+            data_path (str, optional): The training data the artifact was built from.
+
+        Returns:
+            DemandForecaster: A forecaster holding the deserialized pipeline.
+        """
+        import joblib
+
+        artifact = joblib.load(path)
+        forecaster = cls(data_path=data_path, hyperparameters=artifact["hyperparameters"], train=False)
+        forecaster._model = artifact["model"]
+        forecaster._model.named_steps['regressor'].set_params(n_jobs=forecaster.predict_n_jobs)
+        forecaster.mse = artifact.get("mse")
+        forecaster._refresh_compiled()
+        return forecaster
+
+    def compile(self) -> CompiledForest:
+        """
+        Compiles the trained pipeline into a `CompiledForest` and uses it for predictions from
+        now on. The compiled forest is checked against the pipeline before it is used.
+
+        Returns:
+            CompiledForest: The compiled forest.
+
+        Raises:
+            ValueError: If the model has not been trained yet, cannot be compiled, or the
+                compiled forest does not reproduce the pipeline's predictions.
+        """
+        if self._model is None:
+            raise ValueError("Model not trained. Please call load_and_train_model() first.")
+        compiled = CompiledForest(self._model)
+        compiled.verify(self._model)
+        self.compiled = compiled
+        return compiled
+
+    def _refresh_compiled(self):
+        self.compiled = None
+        if settings.DEMAND_MODEL_COMPILED:
+            try:
+                self.compile()
+            except ValueError as e:
+                print(f"Using the scikit-learn pipeline for predictions: {e}")
+
+    def warm_start(self, batch, target, n_new_trees):
+        """
+        Grows a copy of the forest with trees fitted on new observations only.
+
+        The fitted preprocessor is reused as is, so categories first seen in `batch` are
+        encoded like unknown categories; a full retrain is needed to learn them as features.
+        The existing trees are kept unchanged and this forecaster is not modified.
+
+        Args:
+            batch (pd.DataFrame | Mapping[str, array-like]): Columnar product features, see
+                `to_feature_frame`.
+            target (array-like): The observed demand of each row.
+            n_new_trees (int): The number of trees to add.
+
+        Returns:
+            DemandForecaster: A new forecaster holding the grown pipeline, compiled if enabled.
+
+        Raises:
+            ValueError: If the model has not been trained yet or a feature column is missing.
+        """
+        if not self.trained:
+            raise ValueError("Model not trained. Please call load_and_train_model() first.")
+
+        # A released pipeline is read back from the artifact, which already gives a private copy
+        pipeline = copy.deepcopy(self._model) if self._model is not None else self.model
+        preprocessor = pipeline.named_steps['preprocessor']
+        regressor = pipeline.named_steps['regressor']
+        features = preprocessor.transform(to_feature_frame(batch))
+        max_samples = regressor.max_samples
+        params = {"warm_start": True, "n_estimators": regressor.n_estimators + n_new_trees, "n_jobs": self.n_jobs}
+        if isinstance(max_samples, int) and max_samples > features.shape[0]:
+            # A row count above the new batch size cannot be bootstrapped
+            params["max_samples"] = None
+        regressor.set_params(**params)
+        regressor.fit(features, np.asarray(target, dtype=float))
+        regressor.set_params(warm_start=False, n_jobs=self.predict_n_jobs, max_samples=max_samples)
+
+        candidate = DemandForecaster(data_path=self.data_path, hyperparameters=self.hyperparameters, train=False,
+                                     n_jobs=self.n_jobs, predict_n_jobs=self.predict_n_jobs)
+        candidate._model = pipeline
+        candidate.mse = self.mse
+        candidate._refresh_compiled()
+        return candidate
 
     def predict(self, productObj: ProductCreate):
         """
@@ -84,26 +369,41 @@ class DemandForecaster:
             ValueError: If the model has not been trained yet.
         """
         product = productObj.dict()
-        if self.model is None:
+        if not self.trained:
             raise ValueError("Model not trained. Please call load_and_train_model() first.")
 
-        # Ensure the order of features matches the training data and the preprocessor
-        product_features = [[
-            product['cost_price'],
-            product['selling_price'],
-            product['units_sold'],
-            product['customer_rating'],
-            product['category']
-        ]]
-
-        product_features_df = pd.DataFrame(product_features, columns=[
-            'cost_price', 'selling_price', 'units_sold', 'customer_rating', 'category'
-        ])
-        
         # Predict demand forecast
         try:
-            demand_forecast = self.model.predict(product_features_df)[0]
-            return demand_forecast
+            return self.predict_many({column: [product[column]] for column in FEATURE_COLUMNS})[0]
         except Exception as e:
             print(f"Error during prediction: {e}")
-            return None  
\ No newline at end of file
+            return None
+
+    def predict_many(self, batch):
+        """
+        Predicts the demand forecast for a whole batch of products in a single model call.
+
+        Args:
+            batch (pd.DataFrame | Mapping[str, array-like]): Columnar product features, see
+                `to_feature_frame`.
+
+        Returns:
+            np.ndarray: The predicted demand forecast of each row, in input order.
+
+        Raises:
+            ValueError: If the model has not been trained yet or a feature column is missing.
+        """
+        if not self.trained:
+            raise ValueError("Model not trained. Please call load_and_train_model() first.")
+
+        # The compiled forest wins on small batches; scikit-learn's C tree walk wins on large ones,
+        # when the pipeline is still in memory
+        require_feature_columns(batch)
+        if self.compiled is not None and (
+                self._model is None or len(batch[FEATURE_COLUMNS[0]]) <= settings.DEMAND_MODEL_COMPILED_MAX_BATCH):
+            return self.compiled.predict(batch)
+
+        features = to_feature_frame(batch)
+        if len(features) == 0:
+            return np.empty(0, dtype=float)
+        return np.asarray(self._model.predict(features), dtype=float)
@@ -0,0 +1,165 @@
+"""
+This module grows the demand model with rows appended to its training CSV, without a full retrain.
+
+The training CSV is treated as an append-only log of observed demand. The registry records how
+many of its rows the active model has learned (`trained_rows`) and the artifact key of those rows.
+Each round reloads the training data and, if the learned rows are unchanged, takes the rows after
+them as new observations: part of them is held out, `RETRAIN_TREES_PER_UPDATE` trees fitted on
+the rest are added to a copy of the active forest (`DemandForecaster.warm_start`), and the grown
+model is swapped in only if its MSE on the held-out rows is at most `RETRAIN_MAX_MSE_RATIO` times
+the current model's. Rejected rows are retried with the next round.
+
+An accepted model is persisted under the artifact key of all the rows it has learned, so a
+restart loads it instead of retraining, and another worker reaching the same rows loads it
+instead of growing its own. If learned rows were edited or removed, or the forest reached
+`RETRAIN_MAX_ESTIMATORS`, rounds are skipped until a full reload (POST /products/model/reload).
+
+Functions:
+    grow_forecaster(forecaster, new_rows, key, artifact_dir, ...) -> Tuple[DemandForecaster, dict]:
+        Grows a copy of the forest, validates it and persists it if accepted.
+    retrain_incrementally(registry: ModelRegistry) -> dict:
+        Runs one incremental training round against the registry.
+    run_retrain_schedule(registry: ModelRegistry, interval: float):
+        Runs `retrain_incrementally` every `interval` seconds until cancelled.
+"""
+import asyncio
+import os
+from typing import Optional, Tuple
+import pandas as pd
+from core.config import settings
+from services.demand_forecaster import DemandForecaster
+from services.inference_executor import training_executor
+from services.model_registry import ModelRegistry, artifact_path, demand_forecaster_registry
+from services.training_data import TARGET_COLUMN, compute_data_key
+
+# One round at a time per process; rounds of other workers are reconciled through the artifacts
+_retrain_lock = asyncio.Lock()
+
+
+def grow_forecaster(forecaster: DemandForecaster, new_rows: pd.DataFrame, key: str, artifact_dir: str,
+                    n_new_trees: int, max_estimators: int, validation_fraction: float,
+                    max_mse_ratio: float) -> Tuple[Optional[DemandForecaster], dict]:
+    """
+    Grows a copy of the forest on part of the new rows, scores both models on the rest and
+    persists the grown model under `key` if it passes validation.
+
+    CPU-bound; runs in a worker process when submitted to the training executor.
+
+    Args:
+        forecaster (DemandForecaster): The active model.
+        new_rows (pd.DataFrame): The training rows appended since the model was built.
+        key (str): The artifact key of all the rows the grown model will have learned.
+        artifact_dir (str): The directory where trained pipelines are persisted.
+        n_new_trees (int): The number of trees to add.
+        max_estimators (int): The forest size above which a full reload is required.
+        validation_fraction (float): The share of new rows held out for validation.
+        max_mse_ratio (float): The largest accepted ratio of grown to current validation MSE.
+
+    Returns:
+        Tuple[Optional[DemandForecaster], dict]: The grown model, or None if it was rejected, and
+            the reason, forest size and both validation MSEs.
+    """
+    from sklearn.metrics import mean_squared_error
+    from sklearn.model_selection import train_test_split
+
+    report = {"n_estimators": forecaster.n_estimators, "current_mse": None, "candidate_mse": None}
+    if forecaster.n_estimators + n_new_trees > max_estimators:
+        return None, dict(report, reason="The forest reached RETRAIN_MAX_ESTIMATORS; run a full reload")
+
+    train, validation = train_test_split(new_rows, test_size=validation_fraction, random_state=42)
+    candidate = forecaster.warm_start(train, train[TARGET_COLUMN], n_new_trees)
+    current_mse = float(mean_squared_error(validation[TARGET_COLUMN], forecaster.predict_many(validation)))
+    candidate_mse = float(mean_squared_error(validation[TARGET_COLUMN], candidate.predict_many(validation)))
+    report.update(current_mse=current_mse, candidate_mse=candidate_mse)
+    if candidate_mse > current_mse * max_mse_ratio:
+        return None, dict(report, reason="The grown model did not pass validation")
+    candidate.mse = candidate_mse
+
+    path = artifact_path(artifact_dir, key)
+    os.makedirs(artifact_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    candidate.save(tmp_path)
+    try:
+        # Publish only if no other process built a model for these rows first; if one did, use it
+        os.link(tmp_path, path)
+        reason = "Accepted"
+    except FileExistsError:
+        candidate = DemandForecaster.load(path)
+        reason = "Accepted; using the model another process built for these rows"
+    finally:
+        os.remove(tmp_path)
+    candidate.release_pipeline(path)
+    return candidate, dict(report, n_estimators=candidate.n_estimators, reason=reason)
+
+
+async def retrain_incrementally(registry: ModelRegistry = demand_forecaster_registry) -> dict:
+    """
+    Runs one incremental training round and swaps the grown model in if it validates.
+
+    Args:
+        registry (ModelRegistry, optional): The registry holding the model to grow.
+
+    Returns:
+        dict: Whether a new model was activated and why, the number of new rows, the rows
+            learned, the forest size, both validation MSEs and the active registry version.
+
+    Raises:
+        ValueError: If the training data cannot be loaded.
+        ExecutorSaturatedError: If the training executor has no capacity.
+    """
+    async with _retrain_lock:
+        forecaster = await registry.aget()
+        base_version = registry.version
+        trained_rows = registry.trained_rows
+        training_data = await registry.source.load()
+
+        report = {
+            "accepted": False,
+            "new_rows": max(len(training_data) - trained_rows, 0),
+            "trained_rows": trained_rows,
+            "n_estimators": None,
+            "current_mse": None,
+            "candidate_mse": None,
+            "version": base_version,
+        }
+        learned = training_data.iloc[:trained_rows]
+        if len(learned) < trained_rows or compute_data_key(learned, registry.hyperparameters) != registry.artifact_key:
+            return dict(report, reason="Rows the model learned were changed or removed; run a full reload")
+        if report["new_rows"] < max(settings.RETRAIN_MIN_NEW_ROWS, 2):
+            return dict(report, reason=f"Waiting for {settings.RETRAIN_MIN_NEW_ROWS} new rows")
+
+        key = compute_data_key(training_data, registry.hyperparameters)
+        if os.path.exists(artifact_path(registry.artifact_dir, key)):
+            # Another worker, or an earlier run, already built a model for these rows
+            status = await registry.areload()
+            return dict(report, accepted=True, reason="Loaded the model already built for these rows",
+                        trained_rows=status["trained_rows"], version=status["version"])
+
+        candidate, outcome = await training_executor.submit(
+            grow_forecaster, forecaster, training_data.iloc[trained_rows:], key, registry.artifact_dir,
+            settings.RETRAIN_TREES_PER_UPDATE, settings.RETRAIN_MAX_ESTIMATORS,
+            settings.RETRAIN_VALIDATION_FRACTION, settings.RETRAIN_MAX_MSE_RATIO,
+        )
+        report.update(outcome)
+        if candidate is None:
+            return report
+        if not registry.swap_incremental(candidate, key, len(training_data), base_version):
+            return dict(report, reason="The model was reloaded during training", version=registry.version)
+
+        print(f"Demand model grown to {candidate.n_estimators} trees with {report['new_rows']} new rows "
+              f"(validation MSE {report['current_mse']:.2f} -> {report['candidate_mse']:.2f})")
+        return dict(report, accepted=True, trained_rows=len(training_data), version=registry.version)
+
+
+async def run_retrain_schedule(registry: ModelRegistry = demand_forecaster_registry,
+                               interval: float = settings.RETRAIN_INTERVAL_SECONDS):
+    """
+    Runs `retrain_incrementally` every `interval` seconds until the task is cancelled.
+    Errors are logged and the schedule continues.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await retrain_incrementally(registry)
+        except Exception as e:
+            print(f"Incremental retraining failed: {e}")
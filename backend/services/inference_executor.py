@@ -0,0 +1,39 @@
+"""
+This module defines the worker pools used for machine learning work.
+
+Model inference runs on a thread pool (the forest's predict releases the GIL for most of its
+work) and model training runs on a process pool so it can use other cores without competing
+with request handling. Both pools have bounded queues and reject work with
+`ExecutorSaturatedError` when full.
+
+Variables:
+    inference_executor: Bounded thread pool for model predictions.
+    training_executor: Bounded process pool for model training and artifact loading.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from core.config import settings
+from utils.executors import BoundedExecutor
+
+inference_executor = BoundedExecutor(
+    lambda: ThreadPoolExecutor(
+        max_workers=settings.INFERENCE_THREAD_WORKERS or min(4, os.cpu_count() or 1),
+        thread_name_prefix="inference",
+    ),
+    max_pending=settings.INFERENCE_MAX_PENDING,
+    name="inference",
+)
+
+training_executor = BoundedExecutor(
+    lambda: ProcessPoolExecutor(max_workers=settings.TRAINING_PROCESS_WORKERS),
+    max_pending=settings.TRAINING_MAX_PENDING,
+    name="training",
+)
+
+
+def shutdown_executors():
+    """
+    Shuts down the inference and training pools. Called when the application stops.
+    """
+    inference_executor.shutdown(wait=False)
+    training_executor.shutdown(wait=False)
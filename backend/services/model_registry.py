@@ -0,0 +1,243 @@
+"""
+This module provides a process-wide registry for the trained demand forecasting model.
+
+The registry trains the `DemandForecaster` at most once per distinct training set: the
+training data is read from a training data source (see `services.training_data`) and every
+trained pipeline is persisted under `MODEL_ARTIFACT_DIR`, keyed by a hash of the training rows
+and the model hyperparameters, so later processes load the artifact instead of refitting the
+forest. All routes share the single loaded instance returned by `get()`.
+
+Loading and training run on the training process pool when requested from async code
+(`aget`, `areload`), so the event loop keeps serving other requests meanwhile.
+
+Between full rebuilds the active model may be grown with rows appended to the training CSV (see
+`services.incremental_training`); `trained_rows` is the number of training rows it has learned.
+
+Functions:
+    build_forecaster: Loads a matching artifact or trains and persists a new model.
+
+Classes:
+    ModelRegistry: Holds the active DemandForecaster and supports versioned reloads.
+
+Variables:
+    demand_forecaster_registry: The shared registry used by the API routes.
+"""
+import asyncio
+import os
+import threading
+from datetime import datetime
+from core.config import settings
+from services.demand_forecaster import DemandForecaster, DEFAULT_HYPERPARAMETERS
+from services.inference_executor import training_executor
+from services.training_data import CsvTrainingSource, compute_data_key
+
+
+def artifact_path(artifact_dir, key):
+    """
+    Returns the file path of the artifact stored under `key`.
+    """
+    return os.path.join(artifact_dir, f"demand_forecaster-{key[:16]}.joblib")
+
+
+def build_forecaster(training_data, key, artifact_dir, hyperparameters, force_retrain=False):
+    """
+    Loads the persisted model stored under `key`, or trains and persists a new one. Runs in a
+    worker process when submitted to the training executor. The returned forecaster keeps only
+    its compiled forest in memory when it has one (see `DemandForecaster.release_pipeline`).
+
+    Args:
+        training_data (pd.DataFrame): The training rows, as loaded from a training data source.
+        key (str): The artifact key of the training rows and hyperparameters.
+        artifact_dir (str): The directory where trained pipelines are persisted.
+        hyperparameters (dict): Keyword arguments for the `RandomForestRegressor`.
+        force_retrain (bool, optional): Refit the forest even if a matching artifact exists.
+
+    Returns:
+        tuple: The DemandForecaster, its artifact key, and whether it was loaded from disk.
+    """
+    path = artifact_path(artifact_dir, key)
+    if not force_retrain and os.path.exists(path):
+        try:
+            forecaster = DemandForecaster.load(path)
+            forecaster.release_pipeline(path)
+            return forecaster, key, True
+        except Exception as e:
+            print(f"Could not load model artifact {path}, retraining: {e}")
+
+    forecaster = DemandForecaster(hyperparameters=hyperparameters, training_data=training_data)
+    os.makedirs(artifact_dir, exist_ok=True)
+    # Write to a temporary file first so concurrent workers never read a partial artifact
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    forecaster.save(tmp_path)
+    os.replace(tmp_path, path)
+    forecaster.release_pipeline(path)
+    return forecaster, key, False
+
+
+class ModelRegistry:
+    def __init__(self, source, artifact_dir, hyperparameters=None):
+        """
+        Initializes an empty registry. Nothing is trained or loaded until first use.
+
+        Args:
+            source (TrainingDataSource): Where the model's training data is read from.
+            artifact_dir (str): The directory where trained pipelines are persisted.
+            hyperparameters (dict, optional): Keyword arguments for the `RandomForestRegressor`.
+        """
+        self.source = source
+        self.artifact_dir = artifact_dir
+        self.hyperparameters = dict(hyperparameters or DEFAULT_HYPERPARAMETERS)
+        self.version = 0
+        self.artifact_key = None
+        self.loaded_from_artifact = False
+        self.loaded_at = None
+        self.trained_rows = 0
+        self.incremental_updates = 0
+        self._forecaster = None
+        self._lock = threading.Lock()
+        self._async_lock = asyncio.Lock()
+
+    def get(self) -> DemandForecaster:
+        """
+        Returns the shared DemandForecaster, loading or training it in the calling thread on
+        first use. Intended for scripts; async code should use `aget`.
+
+        Returns:
+            DemandForecaster: The active forecaster.
+        """
+        forecaster = self._forecaster
+        if forecaster is None:
+            with self._lock:
+                if self._forecaster is None:
+                    training_data = self.source.read()
+                    built = build_forecaster(*self._build_args(training_data))
+                    self._activate(*built, len(training_data))
+                forecaster = self._forecaster
+        return forecaster
+
+    async def aget(self) -> DemandForecaster:
+        """
+        Returns the shared DemandForecaster, loading or training it on the training executor on
+        first use. Concurrent callers wait for the same build.
+
+        Returns:
+            DemandForecaster: The active forecaster.
+
+        Raises:
+            ExecutorSaturatedError: If the training executor has no capacity.
+        """
+        if self._forecaster is None:
+            async with self._async_lock:
+                if self._forecaster is None:
+                    training_data = await self.source.load()
+                    built = await training_executor.submit(build_forecaster, *self._build_args(training_data))
+                    with self._lock:
+                        if self._forecaster is None:
+                            self._activate(*built, len(training_data))
+        return self._forecaster
+
+    def reload(self, data_path=None, force_retrain=False):
+        """
+        Builds a new model version in the calling thread and atomically swaps it in.
+
+        Args:
+            data_path (str, optional): A training CSV to use from now on. Defaults to the current source.
+            force_retrain (bool, optional): Refit the forest even if a matching artifact exists.
+
+        Returns:
+            dict: The registry status after the reload.
+        """
+        source = CsvTrainingSource(data_path) if data_path else self.source
+        training_data = source.read()
+        built = build_forecaster(*self._build_args(training_data, force_retrain))
+        with self._lock:
+            self.source = source
+            self._activate(*built, len(training_data))
+        return self.status()
+
+    async def areload(self, data_path=None, force_retrain=False):
+        """
+        Builds a new model version on the training executor and atomically swaps it in for all
+        routes. The current model keeps serving requests while the new one is loaded or trained.
+
+        Args:
+            data_path (str, optional): A training CSV to use from now on. Defaults to the current source.
+            force_retrain (bool, optional): Refit the forest even if a matching artifact exists.
+
+        Returns:
+            dict: The registry status after the reload.
+
+        Raises:
+            ExecutorSaturatedError: If the training executor has no capacity.
+        """
+        source = CsvTrainingSource(data_path) if data_path else self.source
+        training_data = await source.load()
+        built = await training_executor.submit(build_forecaster, *self._build_args(training_data, force_retrain))
+        with self._lock:
+            self.source = source
+            self._activate(*built, len(training_data))
+        return self.status()
+
+    def status(self):
+        """
+        Returns a summary of the active model.
+
+        Returns:
+            dict: The model version, artifact key, origin, load time, MSE and incremental
+                training progress.
+        """
+        forecaster = self._forecaster
+        return {
+            "version": self.version,
+            "loaded": forecaster is not None,
+            "artifact_key": self.artifact_key,
+            "loaded_from_artifact": self.loaded_from_artifact,
+            "data_source": self.source.describe(),
+            "loaded_at": self.loaded_at,
+            "mse": forecaster.mse if forecaster is not None else None,
+            "trained_rows": self.trained_rows,
+            "incremental_updates": self.incremental_updates,
+        }
+
+    def _build_args(self, training_data, force_retrain=False):
+        # The key is hashed here so that only plain data is sent to the training process
+        key = compute_data_key(training_data, self.hyperparameters)
+        return training_data, key, self.artifact_dir, self.hyperparameters, force_retrain
+
+    def swap_incremental(self, forecaster, key, trained_rows, base_version):
+        """
+        Atomically activates a model grown from version `base_version`, unless another version
+        was activated since then.
+
+        Args:
+            forecaster (DemandForecaster): The grown model.
+            key (str): The artifact key of all the rows the grown model has learned.
+            trained_rows (int): The number of training rows the grown model has learned.
+            base_version (int): The registry version the model was grown from.
+
+        Returns:
+            bool: Whether the model was activated.
+        """
+        with self._lock:
+            if self.version != base_version:
+                return False
+            self._forecaster = forecaster
+            self.artifact_key = key
+            self.loaded_from_artifact = False
+            self.loaded_at = datetime.now()
+            self.trained_rows = trained_rows
+            self.incremental_updates += 1
+            self.version += 1
+            return True
+
+    def _activate(self, forecaster, key, loaded_from_artifact, trained_rows):
+        self._forecaster = forecaster
+        self.artifact_key = key
+        self.loaded_from_artifact = loaded_from_artifact
+        self.loaded_at = datetime.now()
+        self.trained_rows = trained_rows
+        self.incremental_updates = 0
+        self.version += 1
+
+
+demand_forecaster_registry = ModelRegistry(CsvTrainingSource(settings.PRODUCT_DATA_PATH), settings.MODEL_ARTIFACT_DIR)
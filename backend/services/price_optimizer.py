@@ -1,30 +1,51 @@
 
-import pandas as pd
 import numpy as np
+import pandas as pd
+from core.config import settings
 from schemas.product import ProductCreate
+from services.pricing_rules import PricingRuleSet
+
+PRICING_INPUTS = ('cost_price', 'selling_price', 'units_sold', 'customer_rating', 'category')
+VARIATION_MODES = ("hash", "random", "off")
+
+
+def stable_unit_interval(batch) -> np.ndarray:
+    """
+    Maps the pricing inputs of each product to a number in [0, 1) that only depends on those inputs.
+
+    The inputs are hashed with `pd.util.hash_pandas_object`, which uses a fixed key, so the
+    result is the same across calls, processes and restarts.
+
+    Args:
+        batch (pd.DataFrame | Mapping[str, array-like]): Columnar product data with the `PRICING_INPUTS`.
+
+    Returns:
+        np.ndarray: One value in [0, 1) per product.
+    """
+    frame = pd.DataFrame({
+        column: np.asarray(batch[column], dtype=float)
+        for column in PRICING_INPUTS if column != 'category'
+    })
+    frame['category'] = pd.Series(np.asarray(batch['category'], dtype=object)).astype(str).str.lower().str.strip()
+    hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    # The top 53 bits fill a double's mantissa exactly
+    return (hashes >> np.uint64(11)).astype(float) * 2.0 ** -53
 
 class PriceOptimizer:
     """
     Enhanced rule-based price optimizer to make it more responsive to specific
     factors like customer rating and less constrained by strict realism.
+
+    The business rules are declared in the pricing rules file (see `services.pricing_rules`)
+    and evaluated over whole columns of products at once.
     """
     
-    def __init__(self):
-        # Category-based markup percentages (starting points)
-        self.category_markups = {
-            'food & beverages': 0.65,     # 65% markup
-            'electronics': 0.45,          # 45% markup
-            'apparel': 0.60,              # 60% markup
-            'health': 0.50,               # 50% markup
-            'fitness': 0.40,              # 40% markup
-            'outdoor & sports': 0.45,     # 45% markup
-            'home automation': 0.55,      # 55% markup
-            'wearables': 0.50,            # 50% markup
-            'office supplies': 0.40,      # 40% markup
-            'pet supplies': 0.50,         # 50% markup
-            'transportation': 0.35,       # 35% markup
-            'accessories': 0.55           # 55% markup
-        }
+    def __init__(self, rules_path=None, variation_mode=None):
+        # Category markups, rating and volume premiums and price limits, hot-reloaded from the rules file
+        self.rules = PricingRuleSet(rules_path or settings.PRICING_RULES_PATH)
+        self.variation_mode = variation_mode or settings.PRICING_VARIATION_MODE
+        if self.variation_mode not in VARIATION_MODES:
+            raise ValueError(f"Unknown pricing variation mode {self.variation_mode!r}, expected one of {VARIATION_MODES}")
         print("✅ Enhanced Price Optimizer Ready!")
     
     def predict(self, productObj: ProductCreate):
@@ -33,50 +54,52 @@ class PriceOptimizer:
         influence from high ratings and less rigid constraints.
         """
         product = productObj.dict()
-        
-        # Get base markup for category
-        category_key = product['category'].lower().strip()
-        base_markup = self.category_markups.get(category_key, 0.45)  # Default 45%
-        
-        # --- ENHANCED RATING PREMIUM ---
-        # Make rating bonus more continuous and impactful
-        rating_bonus = 0.0
-        if product['customer_rating'] >= 3.0: # Only apply bonus for ratings 3.0 and above
-            # Scale bonus from 0 to 20% (0.20) as rating goes from 3.0 to 5.0
-            # Higher ratings will have a significantly larger impact now
-            rating_bonus = max(0.0, (product['customer_rating'] - 3.0) / 2.0 * 0.20)
-        
-        # Performance adjustment: If selling well vs current price, can optimize up
-        volume_bonus = 0.0
-        # If units sold is high, it means demand is strong, so we can potentially price higher.
-        # Let's make this also a bit more dynamic or impactful.
-        if product['units_sold'] > 200: # Very high volume
-            volume_bonus = 0.05
-        elif product['units_sold'] > 100: # High volume
-            volume_bonus = 0.02
-        
-        # Calculate total markup
-        total_markup = base_markup + rating_bonus + volume_bonus
-        
-        # --- RELAXED CONSTRAINTS FOR TOTAL MARKUP ---
-        total_markup = min(total_markup, 1.20)  # Cap at 120% markup (less "realistic" but allows for higher prices)
-        total_markup = max(total_markup, 0.10)  # Minimum 10% markup (slightly lower than before)
-        
+        batch = {column: [product[column]] for column in PRICING_INPUTS}
+        return float(self.predict_many(batch)[0])
+
+    @property
+    def deterministic(self) -> bool:
+        """
+        Whether the same inputs and rules always produce the same price, so prices may be cached.
+        """
+        return self.variation_mode != "random"
+
+    def predict_many(self, batch):
+        """
+        Generate optimal prices for a whole batch of products at once.
+
+        Applies the same business rules as `predict`, evaluated over entire columns.
+
+        Args:
+            batch (pd.DataFrame | Mapping[str, array-like]): Columnar product data with
+                cost_price, selling_price, units_sold, customer_rating and category.
+
+        Returns:
+            np.ndarray: The optimal price of each row, rounded to 2 decimals, in input order.
+        """
+        rules = self.rules.get()
+        cost_price = np.asarray(batch['cost_price'], dtype=float)
+        selling_price = np.asarray(batch['selling_price'], dtype=float)
+        units_sold = np.asarray(batch['units_sold'], dtype=float)
+        customer_rating = np.asarray(batch['customer_rating'], dtype=float)
+
+        # Category markup plus rating premium and volume bonus, within the markup limits
+        total_markup = rules.total_markup(batch['category'], customer_rating, units_sold)
+
         # Calculate optimal price based on cost price and total markup
         # High cost price will inherently lead to a high optimal price due to multiplication
-        optimal_price = product['cost_price'] * (1 + total_markup)
-        
-        # Add small random variation to make it look ML-generated (±2%)
-        variation = np.random.uniform(-0.02, 0.02)
-        optimal_price = optimal_price * (1 + variation)
-        
-        # Final constraints
-        min_profit_price = product['cost_price'] * 1.10 # Minimum 10% profit (relaxed from 15%)
-        # --- RELAXED MAX PRICE CONSTRAINT ---
-        # Allow price to go up to 50% above current selling price,
-        # or even more if the current selling price is very low compared to cost.
-        max_current_price_limit = product['selling_price'] * 1.50 
-        
-        optimal_price = max(min_profit_price, min(optimal_price, max_current_price_limit))
-        
-        return round(optimal_price, 2)
+        optimal_price = cost_price * (1 + total_markup)
+
+        # Add small variation to make it look ML-generated. In "hash" mode it is derived from the
+        # product's inputs, so repeated calls agree
+        if self.variation_mode == "hash":
+            variation = rules.variation * (2 * stable_unit_interval(batch) - 1)
+            optimal_price = optimal_price * (1 + variation)
+        elif self.variation_mode == "random":
+            variation = np.random.uniform(-rules.variation, rules.variation, size=len(optimal_price))
+            optimal_price = optimal_price * (1 + variation)
+
+        # Final constraints: minimum profit and maximum increase over the current selling price
+        optimal_price = rules.apply_price_limits(optimal_price, cost_price, selling_price)
+
+        return np.round(optimal_price, 2)
@@ -0,0 +1,197 @@
+"""
+This module provides the data-driven rule table behind the PriceOptimizer.
+
+Pricing rules (category markups, the customer rating premium curve, sales volume tiers and the
+markup / price limits) are declared in a JSON file and compiled once into NumPy lookup arrays,
+so whole columns of products are priced with a handful of vectorized operations. The rule file
+is watched for changes and recompiled on the next use, so rules can change without a deploy.
+
+Rule file format (see pricing_rules.json):
+    category_markups: Markup per lowercased category name.
+    default_markup: Markup of categories not listed above.
+    rating_curve: [rating, premium] points, linearly interpolated. Ratings below the first point
+        and missing ratings get no premium, ratings above the last point get the last premium.
+    volume_tiers: {"units_sold_above", "bonus"} tiers. The highest tier whose threshold is
+        exceeded applies.
+    markup_limits: The {"min", "max"} total markup.
+    price_limits: {"min_cost_multiplier", "max_selling_price_multiplier"} bounds of the final price.
+    variation: The amplitude of the multiplicative price variation, e.g. 0.02 for ±2%.
+
+Classes:
+    CompiledPricingRules: A rule table compiled into lookup arrays.
+    PricingRuleSet: Loads the rule file and hot-reloads it when it changes.
+"""
+import json
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+
+class CompiledPricingRules:
+    def __init__(self, rules: dict, version: int = 1):
+        """
+        Compiles a rule table into lookup arrays.
+
+        Args:
+            rules (dict): The rule table, in the rule file format.
+            version (int, optional): The version number of this rule table.
+
+        Raises:
+            ValueError: If the rule table is incomplete or inconsistent.
+        """
+        try:
+            categories = sorted(rules["category_markups"])
+            self.category_index = {category: index for index, category in enumerate(categories)}
+            # The last slot holds the default markup for unknown categories
+            self.category_markups = np.array(
+                [rules["category_markups"][category] for category in categories] + [rules["default_markup"]],
+                dtype=float,
+            )
+
+            rating_points = sorted(rules["rating_curve"])
+            self.rating_x = np.array([point[0] for point in rating_points], dtype=float)
+            self.rating_y = np.array([point[1] for point in rating_points], dtype=float)
+
+            tiers = sorted(rules["volume_tiers"], key=lambda tier: tier["units_sold_above"])
+            self.volume_thresholds = np.array([tier["units_sold_above"] for tier in tiers], dtype=float)
+            self.volume_bonuses = np.array([0.0] + [tier["bonus"] for tier in tiers], dtype=float)
+
+            self.min_markup = float(rules["markup_limits"]["min"])
+            self.max_markup = float(rules["markup_limits"]["max"])
+            self.min_cost_multiplier = float(rules["price_limits"]["min_cost_multiplier"])
+            self.max_selling_price_multiplier = float(rules["price_limits"]["max_selling_price_multiplier"])
+            self.variation = float(rules["variation"])
+        except (KeyError, IndexError, TypeError) as e:
+            raise ValueError(f"Invalid pricing rules: {e!r}")
+        if len(self.rating_x) == 0:
+            raise ValueError("Invalid pricing rules: rating_curve needs at least one point")
+        if self.min_markup > self.max_markup:
+            raise ValueError("Invalid pricing rules: markup_limits min is above max")
+        # A product without a rating must still get a markup, as it did before the rule table
+        probe = self.total_markup([""], [np.nan], [0.0])
+        if not np.isfinite(probe).all():
+            raise ValueError("Invalid pricing rules: a product without a customer rating gets no markup")
+        self.version = version
+
+    def category_codes(self, categories) -> np.ndarray:
+        """
+        Maps category names to indices into `category_markups`.
+
+        Each distinct name is normalized and looked up once; unknown categories map to the
+        default markup slot.
+
+        Args:
+            categories (array-like): The category name of each product.
+
+        Returns:
+            np.ndarray: The category code of each product.
+        """
+        codes, uniques = pd.factorize(pd.Series(np.asarray(categories, dtype=object)), use_na_sentinel=False)
+        default_code = len(self.category_markups) - 1
+        unique_codes = np.array(
+            [self.category_index.get(str(name).lower().strip(), default_code) for name in uniques],
+            dtype=np.intp,
+        )
+        return unique_codes[codes]
+
+    def total_markup(self, categories, customer_rating, units_sold) -> np.ndarray:
+        """
+        Computes the clipped total markup (category markup + rating premium + volume bonus) of each product.
+        Missing (None or NaN) ratings get no rating premium.
+        """
+        base_markup = self.category_markups[self.category_codes(categories)]
+        customer_rating = np.asarray(customer_rating, dtype=float)
+        rating_bonus = np.where(
+            np.isnan(customer_rating), 0.0,
+            np.interp(customer_rating, self.rating_x, self.rating_y, left=0.0),
+        )
+        volume_bonus = self.volume_bonuses[np.searchsorted(self.volume_thresholds, units_sold, side="left")]
+        return np.clip(base_markup + rating_bonus + volume_bonus, self.min_markup, self.max_markup)
+
+    def apply_price_limits(self, price, cost_price, selling_price) -> np.ndarray:
+        """
+        Bounds prices between the minimum profit price and the maximum price relative to the current selling price.
+        """
+        min_profit_price = cost_price * self.min_cost_multiplier
+        max_current_price_limit = selling_price * self.max_selling_price_multiplier
+        return np.maximum(min_profit_price, np.minimum(price, max_current_price_limit))
+
+
+class PricingRuleSet:
+    def __init__(self, path: str):
+        """
+        Initializes the rule set. The rule file is read on first use.
+
+        Args:
+            path (str): The path to the JSON rule file.
+        """
+        self.path = path
+        self._rules = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Whether a rule table has been compiled.
+        """
+        return self._rules is not None
+
+    def get(self) -> CompiledPricingRules:
+        """
+        Returns the compiled rules, recompiling them first if the rule file changed.
+
+        If a changed rule file is invalid, the previous rules stay active.
+
+        Returns:
+            CompiledPricingRules: The active rules.
+
+        Raises:
+            ValueError: If the rule file cannot be loaded and no rules were loaded before.
+        """
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if self._rules is None or mtime != self._mtime:
+            with self._lock:
+                if self._rules is None or mtime != self._mtime:
+                    try:
+                        self._load(mtime)
+                    except ValueError as e:
+                        if self._rules is None:
+                            raise
+                        print(f"Keeping pricing rules version {self._rules.version}: {e}")
+                        self._mtime = mtime
+        return self._rules
+
+    def reload(self) -> CompiledPricingRules:
+        """
+        Recompiles the rule file even if it did not change.
+
+        Returns:
+            CompiledPricingRules: The newly active rules.
+
+        Raises:
+            ValueError: If the rule file is missing or invalid. The previous rules stay active.
+        """
+        with self._lock:
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            self._load(mtime)
+        return self._rules
+
+    def _load(self, mtime):
+        try:
+            with open(self.path) as f:
+                rules = json.load(f)
+        except FileNotFoundError:
+            raise ValueError(f"Pricing rules not found at path: {self.path}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid pricing rules JSON: {e}")
+        version = self._rules.version + 1 if self._rules is not None else 1
+        self._rules = CompiledPricingRules(rules, version)
+        self._mtime = mtime
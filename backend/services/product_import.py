@@ -0,0 +1,88 @@
+"""
+This module parses and validates bulk product uploads.
+
+Uploads use the columns of `product_data.csv` and are read in chunks, so the whole file never
+needs to be held in memory. Each chunk is validated column-wise; valid rows are returned as a
+columnar frame ready for batched scoring, invalid rows as per-row error messages.
+
+Functions:
+    read_product_chunks(file, import_format: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+        Lazily reads an uploaded CSV or NDJSON file in chunks.
+    validate_product_chunk(chunk: pd.DataFrame) -> Tuple[pd.DataFrame, List[dict]]:
+        Splits a chunk into valid products and per-row validation errors.
+"""
+from typing import Iterator, List, Tuple
+import numpy as np
+import pandas as pd
+
+TEXT_COLUMNS = ['name', 'category']
+NUMERIC_COLUMNS = ['cost_price', 'selling_price']
+INTEGER_COLUMNS = ['stock_available', 'units_sold']
+REQUIRED_COLUMNS = TEXT_COLUMNS + NUMERIC_COLUMNS + INTEGER_COLUMNS
+IMPORT_COLUMNS = ['name', 'description', 'cost_price', 'selling_price', 'category',
+                  'stock_available', 'units_sold', 'customer_rating']
+DEFAULT_CUSTOMER_RATING = 4.0
+
+
+def read_product_chunks(file, import_format: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Lazily reads an uploaded product file in chunks.
+
+    Args:
+        file (BinaryIO): The uploaded file.
+        import_format (str): Either "csv" or "ndjson".
+        chunk_size (int): The number of rows per chunk.
+
+    Returns:
+        Iterator[pd.DataFrame]: The chunks, indexed by 0-based row number within the file.
+    """
+    if import_format == "ndjson":
+        return iter(pd.read_json(file, lines=True, chunksize=chunk_size, dtype=False))
+    return iter(pd.read_csv(file, chunksize=chunk_size, dtype={column: str for column in ['name', 'description', 'category']}))
+
+
+def validate_product_chunk(chunk: pd.DataFrame) -> Tuple[pd.DataFrame, List[dict]]:
+    """
+    Validates a chunk of uploaded products column-wise.
+
+    Args:
+        chunk (pd.DataFrame): A chunk produced by `read_product_chunks`.
+
+    Returns:
+        Tuple[pd.DataFrame, List[dict]]: The valid rows with the `IMPORT_COLUMNS` coerced to their
+            column types, and an error entry ({"row", "error"}) for each invalid row. Rows are
+            numbered from 1, excluding any header line.
+    """
+    chunk = chunk.reindex(columns=list(dict.fromkeys(IMPORT_COLUMNS + list(chunk.columns))))
+    errors = pd.Series("", index=chunk.index, dtype=object)
+
+    def reject(mask, message):
+        mask = mask & (errors == "")
+        errors[mask] = message
+
+    for column in TEXT_COLUMNS:
+        values = chunk[column].astype("string").str.strip()
+        reject(values.isna() | (values == ""), f"{column} is required")
+        chunk[column] = values
+
+    for column in NUMERIC_COLUMNS + INTEGER_COLUMNS + ['customer_rating']:
+        raw = chunk[column]
+        values = pd.to_numeric(raw, errors='coerce')
+        if column in REQUIRED_COLUMNS:
+            reject(raw.isna(), f"{column} is required")
+        reject(raw.notna() & values.isna(), f"{column} must be a number")
+        reject(values < 0, f"{column} must not be negative")
+        if column in INTEGER_COLUMNS:
+            reject(values.notna() & (values % 1 != 0), f"{column} must be an integer")
+        chunk[column] = values
+
+    valid = errors == ""
+    products = chunk.loc[valid, IMPORT_COLUMNS].copy()
+    products['description'] = products['description'].fillna("").astype(str)
+    products['customer_rating'] = products['customer_rating'].fillna(DEFAULT_CUSTOMER_RATING).astype(float)
+    products[INTEGER_COLUMNS] = products[INTEGER_COLUMNS].astype(np.int64)
+    products['name'] = products['name'].astype(str)
+    products['category'] = products['category'].astype(str)
+
+    row_errors = [{"row": int(row) + 1, "error": error} for row, error in errors[~valid].items()]
+    return products, row_errors
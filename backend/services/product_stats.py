@@ -0,0 +1,228 @@
+"""
+This module maintains the per-category, per-supplier product statistics.
+
+The `product_stats` table holds running sums and counts for each (category, supplier) pair.
+Every product write adds the difference it makes to the affected rows, in the same transaction
+as the write, with atomic `column = column + delta` upserts: a new product adds its values, a
+deleted one subtracts them and an update subtracts the old values and adds the new ones. Reading
+the statistics therefore costs one small GROUP BY over the (category, supplier) rows instead of a
+scan of the products table.
+
+The old values must be read with `lock_products`: read without a lock, two concurrent writes of
+the same product would both subtract the values it had before either of them.
+
+Functions:
+    stats_row(product: Product) -> dict:
+        Extracts the fields the statistics depend on from a product.
+    stats_deltas(removed, added) -> List[dict]:
+        Computes the per-(category, supplier) changes of removing and adding products.
+    lock_products(db: AsyncSession, statement):
+        Executes a SELECT of products with their rows locked until the transaction ends.
+    apply_stats_changes(db: AsyncSession, removed, added):
+        Adds the changes of a product write to the statistics.
+    rebuild_product_stats(db: AsyncSession) -> int:
+        Recomputes the statistics from the products table.
+    ensure_product_stats(session_factory):
+        Builds the statistics if the table is empty but products exist.
+    read_product_stats(db: AsyncSession, group_by: str) -> List[dict]:
+        Returns counts, totals and averages per category, supplier or both.
+"""
+from typing import Iterable, List
+import pandas as pd
+from sqlalchemy import delete, func, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from database.config import async_session
+from models.product import Product
+from models.product_stats import ProductStats
+from utils.bulk import bulk_increment
+
+STATS_KEYS = ["category", "supplier_id"]
+# Statistics column -> product field it sums
+SUM_COLUMNS = {
+    "sum_cost_price": "cost_price",
+    "sum_selling_price": "selling_price",
+    "sum_optimized_price": "optimized_price",
+    "total_stock": "stock_available",
+    "total_units_sold": "units_sold",
+    "sum_customer_rating": "customer_rating",
+    "sum_demand_forecast": "demand_forecast",
+}
+# Statistics column -> nullable product field whose non-null values it counts
+COUNT_COLUMNS = {
+    "optimized_price_count": "optimized_price",
+    "customer_rating_count": "customer_rating",
+    "demand_forecast_count": "demand_forecast",
+}
+INTEGER_COLUMNS = ["product_count", "total_stock", "total_units_sold"] + list(COUNT_COLUMNS)
+STATS_INPUTS = STATS_KEYS + list(dict.fromkeys(SUM_COLUMNS.values()))
+STATS_GROUPINGS = {
+    "category": ["category"],
+    "supplier": ["supplier_id"],
+    "category_supplier": ["category", "supplier_id"],
+}
+# Average reported -> (sum column, count column)
+AVERAGES = {
+    "avg_cost_price": ("sum_cost_price", "product_count"),
+    "avg_selling_price": ("sum_selling_price", "product_count"),
+    "avg_optimized_price": ("sum_optimized_price", "optimized_price_count"),
+    "avg_customer_rating": ("sum_customer_rating", "customer_rating_count"),
+    "avg_demand_forecast": ("sum_demand_forecast", "demand_forecast_count"),
+}
+
+
+def stats_row(product: Product) -> dict:
+    """
+    Returns the fields of `product` the statistics depend on.
+    """
+    return {field: getattr(product, field) for field in STATS_INPUTS}
+
+
+def stats_deltas(removed: Iterable[dict] = (), added: Iterable[dict] = ()) -> List[dict]:
+    """
+    Computes how removing and adding products changes each (category, supplier) row.
+
+    Args:
+        removed (Iterable[dict]): The previous values of deleted or updated products.
+        added (Iterable[dict]): The new values of created or updated products.
+
+    Returns:
+        List[dict]: One row of `ProductStats` deltas per affected (category, supplier) pair; pairs
+            whose values do not change are left out.
+    """
+    frames = []
+    for rows, sign in ((removed, -1), (added, 1)):
+        products = pd.DataFrame(list(rows), columns=STATS_INPUTS)
+        if products.empty:
+            continue
+        delta = pd.DataFrame({
+            "category": products["category"].fillna("").astype(str),
+            "supplier_id": pd.to_numeric(products["supplier_id"]).fillna(0).astype(int),
+            "product_count": sign,
+        })
+        for column, field in SUM_COLUMNS.items():
+            delta[column] = sign * pd.to_numeric(products[field]).fillna(0.0)
+        for column, field in COUNT_COLUMNS.items():
+            delta[column] = sign * products[field].notna().astype(int)
+        frames.append(delta)
+    if not frames:
+        return []
+
+    deltas = pd.concat(frames, ignore_index=True).groupby(STATS_KEYS, as_index=False).sum()
+    deltas = deltas.astype({column: int for column in INTEGER_COLUMNS})
+    changed = deltas.drop(columns=STATS_KEYS).ne(0).any(axis=1)
+    return deltas[changed].to_dict("records")
+
+
+async def lock_products(db: AsyncSession, statement):
+    """
+    Executes a SELECT of products with the selected rows locked until the transaction ends, so
+    that a write computes its statistics delta from the values it replaces.
+
+    PostgreSQL locks the rows with FOR UPDATE; lock them in a fixed order (e.g. by id) when
+    selecting several. SQLite has no row locks and ignores FOR UPDATE, so its database write
+    lock is taken first, with an UPDATE that changes nothing.
+
+    Args:
+        db (AsyncSession): The database session of the write.
+        statement (Select): The SELECT of products or product columns.
+
+    Returns:
+        Result: The result of `statement`, with ORM objects already in the session refreshed.
+    """
+    if db.bind.dialect.name == "sqlite":
+        await db.execute(text("UPDATE product_stats SET product_count = product_count WHERE 0"))
+    return await db.execute(statement.with_for_update().execution_options(populate_existing=True))
+
+
+async def apply_stats_changes(db: AsyncSession, removed: Iterable[dict] = (), added: Iterable[dict] = ()):
+    """
+    Adds the changes of a product write to the statistics, in the session's transaction.
+    Call it before committing the write, with the products' fields as returned by `stats_row`.
+
+    Args:
+        db (AsyncSession): The database session of the write.
+        removed (Iterable[dict]): The previous values of deleted or updated products.
+        added (Iterable[dict]): The new values of created or updated products.
+    """
+    deltas = stats_deltas(removed, added)
+    if not deltas:
+        return
+    await bulk_increment(db, ProductStats.__table__, deltas, STATS_KEYS)
+    if any(row["product_count"] < 0 for row in deltas):
+        await db.execute(delete(ProductStats).where(ProductStats.product_count <= 0))
+
+
+async def rebuild_product_stats(db: AsyncSession) -> int:
+    """
+    Replaces the statistics with totals recomputed from the products table, in the session's
+    transaction. Scans every product; use it to initialize or repair the statistics.
+
+    Args:
+        db (AsyncSession): The database session.
+
+    Returns:
+        int: The number of (category, supplier) rows written.
+    """
+    columns = [
+        func.coalesce(Product.category, "").label("category"),
+        func.coalesce(Product.supplier_id, 0).label("supplier_id"),
+        func.count().label("product_count"),
+    ]
+    for column, field in SUM_COLUMNS.items():
+        columns.append(func.coalesce(func.sum(getattr(Product, field)), 0).label(column))
+    for column, field in COUNT_COLUMNS.items():
+        columns.append(func.count(getattr(Product, field)).label(column))
+    totals = select(*columns).group_by(columns[0], columns[1])
+
+    await db.execute(delete(ProductStats))
+    await db.execute(insert(ProductStats).from_select([column.name for column in columns], totals))
+    return await db.scalar(select(func.count()).select_from(ProductStats))
+
+
+async def ensure_product_stats(session_factory=async_session):
+    """
+    Builds the statistics when the table is empty but products exist, e.g. on the first start
+    after the table was added.
+    """
+    async with session_factory() as db:
+        if await db.scalar(select(ProductStats.category).limit(1)) is not None:
+            return
+        if await db.scalar(select(Product.id).limit(1)) is None:
+            return
+        groups = await rebuild_product_stats(db)
+        await db.commit()
+    print(f"Product statistics built for {groups} category/supplier pairs")
+
+
+async def read_product_stats(db: AsyncSession, group_by: str = "category") -> List[dict]:
+    """
+    Returns the product statistics per category, supplier or (category, supplier) pair.
+
+    Args:
+        db (AsyncSession): The database session.
+        group_by (str, optional): "category", "supplier" or "category_supplier".
+
+    Returns:
+        List[dict]: Per group, the keys (None when not grouped on or not set), the product count,
+            stock and units sold totals, and the average prices, rating and demand forecast
+            (None when no product has a value), rounded to 2 decimals.
+    """
+    keys = [getattr(ProductStats, key) for key in STATS_GROUPINGS[group_by]]
+    totals = [func.sum(getattr(ProductStats, column)).label(column)
+              for column in ["product_count"] + list(SUM_COLUMNS) + list(COUNT_COLUMNS)]
+    result = await db.execute(select(*keys, *totals).group_by(*keys).order_by(*keys))
+
+    stats = []
+    for row in result.mappings():
+        group = {"category": row.get("category") or None, "supplier_id": row.get("supplier_id") or None}
+        group.update(
+            product_count=int(row["product_count"]),
+            total_stock=int(row["total_stock"]),
+            total_units_sold=int(row["total_units_sold"]),
+        )
+        for name, (sum_column, count_column) in AVERAGES.items():
+            count = row[count_column]
+            group[name] = round(row[sum_column] / count, 2) if count else None
+        stats.append(group)
+    return stats
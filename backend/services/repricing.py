@@ -0,0 +1,246 @@
+"""
+This module reprices the whole product catalog in the background.
+
+A run walks the products table in primary key order with keyset queries (`id > last_id ...
+LIMIT chunk_size`), scores each chunk with one batched call to each model and writes the new
+optimized prices and demand forecasts back with a single bulk UPDATE per chunk. Only products
+whose values changed are written, so with deterministic pricing a rerun against unchanged
+rules and model touches few rows.
+
+After every committed chunk the cursor is saved to a checkpoint file; a run started with
+`resume=True` continues after the last committed product instead of starting over. The
+checkpoint is removed when a run completes. Chunks that change products update the product
+statistics in the same transaction and invalidate the product listing cache.
+
+Classes:
+    RepricingJob: Runs catalog repricing and tracks its progress.
+"""
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+import numpy as np
+from sqlalchemy import func, update
+from sqlalchemy.future import select
+from core.config import settings
+from database.config import async_session
+from models.product import Product
+from services.inference_executor import inference_executor
+from services.model_registry import ModelRegistry, demand_forecaster_registry
+from services.product_stats import apply_stats_changes, lock_products
+from services.scoring import score_products
+from utils.checkpoint import clear_checkpoint, read_checkpoint, write_checkpoint
+from utils.mapper import convert_to_feature_batch
+from utils.response_cache import product_list_cache
+
+REPRICE_COLUMNS = (Product.id, Product.cost_price, Product.selling_price, Product.units_sold,
+                   Product.customer_rating, Product.category, Product.stock_available,
+                   Product.optimized_price, Product.demand_forecast, Product.supplier_id)
+
+
+class RepricingJob:
+    def __init__(self, price_optimizer, registry: ModelRegistry = demand_forecaster_registry,
+                 session_factory=async_session, chunk_size: int = settings.REPRICE_CHUNK_SIZE,
+                 checkpoint_path: str = settings.REPRICE_CHECKPOINT_PATH):
+        """
+        Initializes an idle job.
+
+        Args:
+            price_optimizer (PriceOptimizer): The pricing rules.
+            registry (ModelRegistry, optional): The registry holding the demand model.
+            session_factory (optional): Creates the database sessions. Defaults to `async_session`.
+            chunk_size (int, optional): Products scored and written per chunk and transaction.
+            checkpoint_path (str, optional): Where the cursor is saved after every chunk.
+        """
+        self.price_optimizer = price_optimizer
+        self.registry = registry
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+        self.checkpoint_path = checkpoint_path
+        self._task = None
+        self._reset()
+
+    def _reset(self, last_id: int = 0, checkpoint: Optional[dict] = None):
+        checkpoint = checkpoint or {}
+        self.state = "idle"
+        self.resumed = bool(checkpoint)
+        self.started_at = checkpoint.get("started_at")
+        self.finished_at = None
+        self.last_id = last_id
+        self.processed = int(checkpoint.get("processed", 0))
+        self.updated = int(checkpoint.get("updated", 0))
+        self.total = None
+        self.model_version = None
+        self.error = None
+        self._processed_this_run = 0
+        self._clock = None
+        self._elapsed = None
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether a run is in progress.
+        """
+        return self.state == "running" or (self._task is not None and not self._task.done())
+
+    def status(self) -> dict:
+        """
+        Returns the progress of the current or last run.
+
+        Returns:
+            dict: The state ("idle", "running", "completed", "failed" or "cancelled"), start and
+                finish times, the cursor, the processed, updated and total product counts, the
+                throughput of this run, the estimated seconds left, the demand model version used
+                and the error of a failed run.
+        """
+        elapsed = self._elapsed
+        if elapsed is None:
+            elapsed = time.perf_counter() - self._clock if self._clock is not None else 0.0
+        rows_per_second = self._processed_this_run / elapsed if elapsed > 0 else 0.0
+        eta_seconds = None
+        if self.state == "running" and self.total is not None and rows_per_second > 0:
+            eta_seconds = round(max(self.total - self.processed, 0) / rows_per_second, 1)
+        return {
+            "state": self.state,
+            "resumed": self.resumed,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "last_id": self.last_id,
+            "processed": self.processed,
+            "updated": self.updated,
+            "total": self.total,
+            "rows_per_second": round(rows_per_second, 1),
+            "eta_seconds": eta_seconds,
+            "model_version": self.model_version,
+            "error": self.error,
+        }
+
+    def start(self, resume: bool = False) -> bool:
+        """
+        Starts a run as a background task of the running event loop.
+
+        Args:
+            resume (bool, optional): Continue after the cursor of an interrupted run.
+
+        Returns:
+            bool: False if a run is already in progress, True otherwise.
+        """
+        if self.running:
+            return False
+        self._task = asyncio.create_task(self.run(resume=resume))
+        self.state = "running"
+        return True
+
+    async def cancel(self):
+        """
+        Cancels the background run, if any. Its checkpoint is kept so it can be resumed.
+        """
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def run(self, resume: bool = False, on_progress: Optional[Callable[[dict], None]] = None) -> dict:
+        """
+        Reprices every product, one keyset-ordered chunk at a time.
+
+        Failures are recorded in the status rather than raised, so that a background run does not
+        lose them; the chunks committed before the failure are kept and can be resumed.
+
+        Args:
+            resume (bool, optional): Continue after the cursor of an interrupted run.
+            on_progress (Callable[[dict], None], optional): Called with the status after every chunk.
+
+        Returns:
+            dict: The final status, see `status`.
+        """
+        checkpoint = read_checkpoint(self.checkpoint_path) if resume else None
+        self._reset(int(checkpoint.get("last_id", 0)) if checkpoint else 0, checkpoint)
+        self.state = "running"
+        self.started_at = self.started_at or datetime.now(timezone.utc).isoformat()
+        try:
+            demand_forecaster = await self.registry.aget()
+            self.model_version = self.registry.version
+            async with self.session_factory() as session:
+                remaining = await session.scalar(select(func.count()).select_from(Product).where(Product.id > self.last_id))
+            self.total = self.processed + remaining
+            # Throughput covers the chunks only, not loading the model
+            self._clock = time.perf_counter()
+
+            while True:
+                async with self.session_factory() as session:
+                    if not await self._reprice_chunk(session, demand_forecaster):
+                        break
+                write_checkpoint(self.checkpoint_path, {
+                    "last_id": self.last_id,
+                    "processed": self.processed,
+                    "updated": self.updated,
+                    "started_at": self.started_at,
+                })
+                if on_progress is not None:
+                    on_progress(self.status())
+
+            clear_checkpoint(self.checkpoint_path)
+            self.state = "completed"
+        except asyncio.CancelledError:
+            self.state = "cancelled"
+            raise
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e)
+            print(f"Catalog repricing failed after product {self.last_id}: {e}")
+        finally:
+            if self._clock is not None:
+                self._elapsed = time.perf_counter() - self._clock
+            self.finished_at = datetime.now(timezone.utc).isoformat()
+        return self.status()
+
+    async def _reprice_chunk(self, session, demand_forecaster) -> bool:
+        """
+        Scores the next chunk after the cursor and writes back the changed products.
+
+        Returns:
+            bool: False once there are no products left.
+        """
+        # The chunk stays locked until its prices and statistics are written, so concurrent API
+        # writes cannot change the values its statistics delta subtracts
+        res = await lock_products(
+            session, select(*REPRICE_COLUMNS).where(Product.id > self.last_id).order_by(Product.id).limit(self.chunk_size)
+        )
+        rows = res.all()
+        if not rows:
+            return False
+
+        ids = [row.id for row in rows]
+        current_price = [row.optimized_price for row in rows]
+        current_demand = [row.demand_forecast for row in rows]
+        optimized_price, demand_forecast = await inference_executor.submit(
+            score_products, self.price_optimizer, demand_forecaster, convert_to_feature_batch(rows)
+        )
+
+        # NULLs become NaN, which never compares equal, so unscored products are always written
+        changed = ((optimized_price != np.array(current_price, dtype=float))
+                   | (demand_forecast != np.array(current_demand, dtype=float)))
+        changed_rows = np.flatnonzero(changed)
+        if len(changed_rows):
+            await session.execute(update(Product), [
+                {"id": ids[i], "optimized_price": float(optimized_price[i]), "demand_forecast": float(demand_forecast[i])}
+                for i in changed_rows
+            ])
+            previous_stats = [dict(rows[i]._mapping) for i in changed_rows]
+            await apply_stats_changes(session, removed=previous_stats, added=[
+                dict(stats, optimized_price=float(optimized_price[i]), demand_forecast=float(demand_forecast[i]))
+                for stats, i in zip(previous_stats, changed_rows)
+            ])
+        # Also ends an unchanged chunk's transaction, releasing its locks
+        await session.commit()
+        if len(changed_rows):
+            await product_list_cache.invalidate()
+
+        self.last_id = ids[-1]
+        self.processed += len(rows)
+        self.updated += len(changed_rows)
+        self._processed_this_run += len(rows)
+        return True
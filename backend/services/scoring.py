@@ -0,0 +1,105 @@
+"""
+This module combines the pricing and demand models to score batches of products.
+
+Single products are scored through `score_memo`, which remembers the result for each
+combination of scoring inputs, pricing rules version and demand model version, so saving a
+product whose relevant fields did not change does not run the models again.
+
+Functions:
+    score_products(price_optimizer, demand_forecaster, batch) -> Tuple[np.ndarray, np.ndarray]:
+        Computes the optimized price and demand forecast percentage of every product in a batch.
+Classes:
+    ScoreMemo: A thread-safe LRU memo of single-product scores.
+"""
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+import numpy as np
+from core.config import settings
+from schemas.product import ProductCreate
+from services.demand_forecaster import to_demand_percentage
+
+SCORING_INPUTS = ('cost_price', 'selling_price', 'units_sold', 'customer_rating', 'category', 'stock_available')
+
+
+def score_products(price_optimizer, demand_forecaster, batch) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scores a columnar batch of products with one call to each model.
+
+    CPU-bound; run it on the inference executor from async code.
+
+    Args:
+        price_optimizer (PriceOptimizer): The pricing rules.
+        demand_forecaster (DemandForecaster): The trained demand model.
+        batch (pd.DataFrame | Mapping[str, array-like]): The model features plus stock_available.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The optimized prices and the demand forecasts as a
+            percentage of available stock, both rounded to 2 decimals.
+    """
+    optimized_price = price_optimizer.predict_many(batch)
+    demand = demand_forecaster.predict_many(batch)
+    demand_percentage = to_demand_percentage(demand, batch['stock_available'])
+    return np.round(optimized_price, 2), np.round(demand_percentage, 2)
+
+
+class ScoreMemo:
+    def __init__(self, max_size: int):
+        """
+        Initializes an empty memo.
+
+        Args:
+            max_size (int): The maximum number of remembered scores; the least recently used entry
+                is evicted first. 0 disables the memo.
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(product: ProductCreate, rules_version: int, model_version: int) -> tuple:
+        """
+        Builds the memo key of a product: its scoring inputs plus the versions of both models.
+
+        The category is kept exactly as given: the demand model's encoder is case-sensitive, so
+        "Electronics" and "electronics" can forecast differently.
+        """
+        values = product.model_dump(include=set(SCORING_INPUTS))
+        return (rules_version, model_version) + tuple(values[column] for column in SCORING_INPUTS)
+
+    def get(self, key: tuple) -> Optional[Tuple[float, Optional[float]]]:
+        """
+        Returns the remembered (optimized_price, demand_forecast) for `key`, or None.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: tuple, value: Tuple[float, Optional[float]]):
+        """
+        Remembers the (optimized_price, demand_forecast) of `key`.
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Forgets every remembered score.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+score_memo = ScoreMemo(settings.SCORE_MEMO_SIZE)
@@ -0,0 +1,94 @@
+"""
+This module provides the training data sources of the demand model.
+
+A source produces a frame with the model's `FEATURE_COLUMNS` and the `TARGET_COLUMN` (observed
+demand in units), and nothing else the model does not need. `CsvTrainingSource` reads the
+columns of a CSV file such as `product_data.csv`.
+
+The `products` table is not a source: its demand_forecast column is written by the model itself,
+so training on it would fit the model to its own predictions. A database source needs a table of
+observed sales first; until one exists, the demand model trains from PRODUCT_DATA_PATH.
+
+Functions:
+    compute_data_key(frame: pd.DataFrame, hyperparameters: dict) -> str:
+        Hashes training data and hyperparameters into a model artifact key.
+Classes:
+    TrainingDataSource: Base class of the sources.
+    CsvTrainingSource: Training data from a CSV file.
+"""
+import asyncio
+import hashlib
+import json
+import pandas as pd
+from services.demand_forecaster import FEATURE_COLUMNS
+
+TARGET_COLUMN = 'demand_forecast'
+TRAINING_COLUMNS = FEATURE_COLUMNS + [TARGET_COLUMN]
+
+
+def compute_data_key(frame: pd.DataFrame, hyperparameters: dict) -> str:
+    """
+    Computes the artifact key of a model trained on `frame` with `hyperparameters`.
+
+    Args:
+        frame (pd.DataFrame): Training data holding the `TRAINING_COLUMNS`.
+        hyperparameters (dict): The model hyperparameters.
+
+    Returns:
+        str: A SHA-256 hex digest of the training rows and the hyperparameters.
+    """
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(frame[TRAINING_COLUMNS], index=False).to_numpy().tobytes())
+    digest.update(json.dumps(hyperparameters, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class TrainingDataSource:
+    """
+    Base class of the demand model training data sources.
+    """
+
+    def describe(self) -> str:
+        """
+        Returns a short description of the source for status reports.
+        """
+        raise NotImplementedError
+
+    async def load(self) -> pd.DataFrame:
+        """
+        Loads the training data without blocking the event loop.
+
+        Returns:
+            pd.DataFrame: The `TRAINING_COLUMNS` of every training row.
+
+        Raises:
+            ValueError: If the data cannot be loaded.
+        """
+        raise NotImplementedError
+
+    def read(self) -> pd.DataFrame:
+        """
+        Loads the training data in the calling thread. Must not be called from a running event loop.
+        """
+        return asyncio.run(self.load())
+
+
+class CsvTrainingSource(TrainingDataSource):
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): The path to a CSV file with the `TRAINING_COLUMNS`.
+        """
+        self.path = path
+
+    def describe(self) -> str:
+        return f"csv:{self.path}"
+
+    async def load(self) -> pd.DataFrame:
+        return await asyncio.to_thread(self.read)
+
+    def read(self) -> pd.DataFrame:
+        try:
+            return pd.read_csv(self.path, usecols=TRAINING_COLUMNS)[TRAINING_COLUMNS]
+        except FileNotFoundError:
+            raise ValueError(f"Product data CSV not found at path: {self.path}")
@@ -0,0 +1,87 @@
+"""
+Checks that the incrementally maintained product statistics survive concurrent writes.
+
+Run from the backend directory with `python -m pytest tests`. The app runs against a temporary
+SQLite database; the demand model is trained from product_data.csv on first use.
+"""
+import asyncio
+import os
+import tempfile
+
+_tmp_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_tmp_dir, 'app.db')}"
+os.environ.setdefault("MODEL_ARTIFACT_DIR", os.path.join(_tmp_dir, "model_artifacts"))
+os.environ["REPRICE_CHECKPOINT_PATH"] = os.path.join(_tmp_dir, "reprice_checkpoint.json")
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+import httpx
+from sqlalchemy import select
+import main
+from database.config import async_session
+from models.product_stats import ProductStats
+from models.user import User, UserRole
+from services.product_stats import rebuild_product_stats
+from utils.password import pwd_context
+
+PRODUCT = {"name": "Lamp", "description": "Desk lamp", "cost_price": 10, "selling_price": 20, "category": "Electronics",
+           "stock_available": 100, "units_sold": 150, "customer_rating": 4.5}
+STATS_COLUMNS = ["product_count", "total_stock", "total_units_sold", "sum_cost_price", "sum_selling_price",
+                 "sum_optimized_price", "optimized_price_count", "sum_customer_rating", "customer_rating_count",
+                 "sum_demand_forecast", "demand_forecast_count"]
+
+
+async def read_stats():
+    async with async_session() as session:
+        rows = (await session.execute(select(ProductStats))).scalars()
+        return sorted((row.category, row.supplier_id, *[round(getattr(row, column), 6) for column in STATS_COLUMNS])
+                      for row in rows)
+
+
+async def login(client, email):
+    response = await client.post("/auth/login", data={"username": email, "password": "secret"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run_concurrent_writes():
+    async with main.lifespan(main.app):
+        async with async_session() as session:
+            for email, role in (("admin@example.com", UserRole.admin), ("supplier@example.com", UserRole.supplier)):
+                session.add(User(email=email, hashed_password=pwd_context.hash("secret"), full_name=role.value,
+                                 is_verified=True, role=role))
+            await session.commit()
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(main.app), base_url="http://test") as client:
+            admin = await login(client, "admin@example.com")
+            supplier = await login(client, "supplier@example.com")
+            ids = []
+            for i in range(3):
+                response = await client.post("/products/", json=dict(PRODUCT, name=f"Lamp {i}"), headers=supplier)
+                ids.append(response.json()["id"])
+
+            responses = await asyncio.gather(
+                *[client.put(f"/products/{ids[0]}", headers=admin, json=dict(
+                    PRODUCT, stock_available=10 + 7 * i, category=("Electronics", "Home")[i % 2]))
+                  for i in range(10)],
+                *[client.post("/products/forecast", json={"product_ids": ids}, headers=admin) for _ in range(4)],
+                client.post("/products/reprice", headers=admin),
+                *[client.delete(f"/products/{ids[2]}", headers=admin) for _ in range(3)],
+            )
+            for _ in range(200):
+                if (await client.get("/products/reprice/status", headers=admin)).json()["state"] != "running":
+                    break
+                await asyncio.sleep(0.05)
+
+        incremental = await read_stats()
+        async with async_session() as session:
+            await rebuild_product_stats(session)
+            await session.commit()
+        return [response.status_code for response in responses], incremental, await read_stats()
+
+
+def test_concurrent_writes_keep_stats_equal_to_rebuild():
+    status_codes, incremental, rebuilt = asyncio.run(run_concurrent_writes())
+
+    assert all(code < 500 for code in status_codes), status_codes
+    # Exactly one of the concurrent deletes finds the product
+    assert sorted(status_codes).count(404) == 2
+    assert incremental == rebuilt
@@ -0,0 +1,111 @@
+"""
+This module provides bulk write helpers for large batches of rows.
+
+Functions:
+    bulk_insert(session: AsyncSession, table: Table, rows: List[dict]) -> None:
+        Inserts many rows in the session's transaction, using COPY on PostgreSQL.
+    bulk_upsert(session: AsyncSession, table: Table, rows: List[dict], index_elements: List[str]) -> None:
+        Inserts many rows, updating the existing rows that conflict on `index_elements`.
+    bulk_increment(session: AsyncSession, table: Table, rows: List[dict], index_elements: List[str]) -> None:
+        Inserts many rows, adding their values to the existing rows that conflict on `index_elements`.
+"""
+from typing import List
+from sqlalchemy import Table, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+UPSERT_DIALECTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+async def bulk_insert(session: AsyncSession, table: Table, rows: List[dict]) -> None:
+    """
+    Inserts many rows in the session's current transaction.
+
+    On asyncpg connections the rows are loaded with `COPY` (`copy_records_to_table`); on other
+    drivers a single executemany `INSERT` is issued. Column defaults are not applied, so every
+    row must provide the same keys.
+
+    Args:
+        session (AsyncSession): The database session.
+        table (Table): The target table.
+        rows (List[dict]): The rows to insert, keyed by column name.
+    """
+    if not rows:
+        return
+    connection = await session.connection()
+    if connection.dialect.driver == "asyncpg":
+        columns = list(rows[0])
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table.name,
+            records=[tuple(row[column] for column in columns) for row in rows],
+            columns=columns,
+        )
+    else:
+        await session.execute(insert(table), rows)
+
+
+async def bulk_upsert(session: AsyncSession, table: Table, rows: List[dict], index_elements: List[str]) -> None:
+    """
+    Inserts many rows with `INSERT ... ON CONFLICT (index_elements) DO UPDATE`, so that re-loading
+    the same keys overwrites them instead of failing.
+
+    Args:
+        session (AsyncSession): The database session.
+        table (Table): The target table.
+        rows (List[dict]): The rows to upsert, keyed by column name.
+        index_elements (List[str]): The columns of the unique constraint to upsert on.
+
+    Raises:
+        NotImplementedError: If the database dialect has no ON CONFLICT support.
+    """
+    if not rows:
+        return
+    statement = await dialect_insert(session, table)
+    statement = statement.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={column: statement.excluded[column] for column in rows[0] if column not in index_elements},
+    )
+    await session.execute(statement, rows)
+
+
+async def bulk_increment(session: AsyncSession, table: Table, rows: List[dict], index_elements: List[str]) -> None:
+    """
+    Inserts many rows with `INSERT ... ON CONFLICT (index_elements) DO UPDATE SET column = column
+    + excluded.column`, so that the values of each row are added to an existing row with the same
+    keys. Each update is atomic, so concurrent increments of the same row are not lost.
+
+    Args:
+        session (AsyncSession): The database session.
+        table (Table): The target table.
+        rows (List[dict]): The rows to add, keyed by column name. Every non-key column must be numeric.
+        index_elements (List[str]): The columns of the unique constraint to upsert on.
+
+    Raises:
+        NotImplementedError: If the database dialect has no ON CONFLICT support.
+    """
+    if not rows:
+        return
+    statement = await dialect_insert(session, table)
+    statement = statement.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={column: table.c[column] + statement.excluded[column] for column in rows[0] if column not in index_elements},
+    )
+    await session.execute(statement, rows)
+
+
+async def dialect_insert(session: AsyncSession, table: Table):
+    """
+    Returns the dialect-specific INSERT of `table`, which supports ON CONFLICT.
+
+    Raises:
+        NotImplementedError: If the database dialect has no ON CONFLICT support.
+    """
+    connection = await session.connection()
+    insert_factory = UPSERT_DIALECTS.get(connection.dialect.name)
+    if insert_factory is None:
+        raise NotImplementedError(f"Upsert is not supported for the {connection.dialect.name} dialect")
+    return insert_factory(table)
@@ -0,0 +1,49 @@
+"""
+This module persists the progress of long-running batch jobs.
+
+Checkpoints are small JSON documents written atomically (to a temporary file, then renamed), so
+a job killed mid-write never leaves a truncated checkpoint behind.
+
+Functions:
+    read_checkpoint(path: str) -> Optional[dict]:
+        Returns the checkpoint stored at `path`, or None.
+    write_checkpoint(path: str, checkpoint: dict):
+        Atomically replaces the checkpoint stored at `path`.
+    clear_checkpoint(path: str):
+        Removes the checkpoint stored at `path`, if any.
+"""
+import json
+import os
+from typing import Optional
+
+
+def read_checkpoint(path: str) -> Optional[dict]:
+    """
+    Returns the checkpoint stored at `path`, or None if there is none or it is unreadable.
+    """
+    try:
+        with open(path) as f:
+            checkpoint = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return checkpoint if isinstance(checkpoint, dict) else None
+
+
+def write_checkpoint(path: str, checkpoint: dict):
+    """
+    Atomically replaces the checkpoint stored at `path`.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def clear_checkpoint(path: str):
+    """
+    Removes the checkpoint stored at `path`, if any.
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
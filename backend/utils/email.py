@@ -1,13 +1,36 @@
 """
 This module provides utility functions for sending emails.
+
+Emails are not sent from the request handler: `send_verification_email` only enqueues the
+message on `email_queue`. A background worker sends due emails in batches over one persistent
+SMTP connection (reconnecting when the server drops it). Failed sends are put back on the queue
+with a due time, using exponential backoff, so they stay visible in the metrics and are flushed
+on shutdown. When the server cannot be reached, the worker also waits an exponentially growing
+delay before connecting again, instead of trying a connection for every queued email. For local
+testing, point SMTP_HOST/SMTP_PORT at an SMTP stand-in such as
+`python -m aiosmtpd -n -l localhost:8025` with SMTP_USE_SSL=false.
+
 Functions:
     send_verification_email(to_email: str, token: str):
+        Enqueues a verification email for the given address.
+Classes:
+    EmailQueue: Background queue and SMTP sender.
 Environment Variables:
     SENDER_EMAIL: The email address used to send emails.
-    SENDER_EMAIL_PASSWORD: The password for the sender email.
+    SENDER_EMAIL_PASSWORD: The password for the sender email. Leave unset to skip SMTP login.
     SERVER: The server URL to be included in the email body.
+    SMTP_HOST, SMTP_PORT, SMTP_USE_SSL: The SMTP server. Defaults to smtp.gmail.com:465 over SSL.
+    SMTP_TIMEOUT: The SMTP connection and command timeout in seconds.
+    EMAIL_BATCH_SIZE: The maximum number of emails sent per batch.
+    EMAIL_MAX_RETRIES: How many times a failed email is retried before it is dropped.
+    EMAIL_RETRY_BASE_DELAY: The delay in seconds before the first retry; doubled for each further retry.
+    EMAIL_RETRY_MAX_DELAY: The longest delay in seconds between retries and between connection attempts.
 """
+import asyncio
+import heapq
+import itertools
 import smtplib
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
@@ -18,11 +41,261 @@ load_dotenv()
 SENDER_EMAIL = os.getenv("SENDER_EMAIL")
 SENDER_EMAIL_PASSWORD = os.getenv("SENDER_EMAIL_PASSWORD")
 SERVER = os.getenv("SERVER") #eg. http://localhost:3000
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", 465))
+SMTP_USE_SSL = os.getenv("SMTP_USE_SSL", "true").lower() == "true"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", 10))
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", 50))
+EMAIL_MAX_RETRIES = int(os.getenv("EMAIL_MAX_RETRIES", 5))
+EMAIL_RETRY_BASE_DELAY = float(os.getenv("EMAIL_RETRY_BASE_DELAY", 2))
+EMAIL_RETRY_MAX_DELAY = float(os.getenv("EMAIL_RETRY_MAX_DELAY", 300))
+
+
+class EmailQueue:
+    def __init__(self, host: str, port: int, use_ssl: bool, username: str = None, password: str = None,
+                 batch_size: int = 50, max_retries: int = 5, retry_base_delay: float = 2.0,
+                 retry_max_delay: float = 300.0, timeout: float = 10.0):
+        """
+        Initializes the queue. The worker starts with `start()` or on the first enqueued email.
+
+        Args:
+            host (str): The SMTP server host.
+            port (int): The SMTP server port.
+            use_ssl (bool): Connect with SMTP over SSL instead of plain SMTP.
+            username (str, optional): The SMTP login. Login is skipped without a password.
+            password (str, optional): The SMTP password.
+            batch_size (int, optional): The maximum number of emails sent per batch.
+            max_retries (int, optional): How many times a failed email is retried.
+            retry_base_delay (float, optional): The delay in seconds before the first retry.
+            retry_max_delay (float, optional): The longest delay in seconds between retries and
+                between connection attempts.
+            timeout (float, optional): The SMTP connection and command timeout in seconds.
+        """
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.username = username
+        self.password = password
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.timeout = timeout
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.in_flight = 0
+        # (due time, sequence, (from_email, to_email, message, attempts)), ordered by due time
+        self._pending = []
+        self._sequence = itertools.count()
+        self._wakeup = None
+        self._idle = None
+        self._worker = None
+        self._flushing = False
+        self._connect_failures = 0
+        self._connect_at = 0.0
+        self._smtp = None
+        self._smtp_lock = threading.Lock()
+
+    def enqueue(self, from_email: str, to_email: str, message: str, attempts: int = 0, delay: float = 0.0):
+        """
+        Queues an email for sending and returns immediately.
+
+        Args:
+            from_email (str): The envelope sender.
+            to_email (str): The recipient.
+            message (str): The full message, as produced by `Message.as_string()`.
+            attempts (int, optional): The number of failed attempts so far.
+            delay (float, optional): Seconds to wait before the email is sent.
+        """
+        self._ensure_worker()
+        due = asyncio.get_running_loop().time() + delay
+        heapq.heappush(self._pending, (due, next(self._sequence), (from_email, to_email, message, attempts)))
+        self._idle.clear()
+        self._wakeup.set()
+
+    async def start(self):
+        """
+        Starts the background worker on the running event loop.
+        """
+        self._ensure_worker()
+
+    async def stop(self, timeout: float = 10.0):
+        """
+        Sends the queued emails, including the ones waiting for a retry, without waiting for their
+        retry delays, then stops the worker and closes the SMTP connection. Each email gets one
+        more attempt; emails still unsent after `timeout` seconds are dropped and reported.
+        """
+        if self._worker is None:
+            return
+        self._flushing = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        if self._pending or self.in_flight:
+            print(f"Email queue stopped with {len(self._pending) + self.in_flight} unsent emails")
+        self._worker.cancel()
+        self._worker = None
+        self._pending = []
+        self._flushing = False
+        await asyncio.to_thread(self._disconnect)
+
+    def metrics(self):
+        """
+        Returns the queue depth and send counters.
+        """
+        waiting_retries = sum(1 for _, _, item in self._pending if item[3] > 0)
+        return {
+            "depth": len(self._pending),
+            "waiting_retries": waiting_retries,
+            "in_flight": self.in_flight,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "connect_failures": self._connect_failures,
+        }
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._idle = asyncio.Event()
+            if not self._pending:
+                self._idle.set()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    def _next_batch(self, now: float):
+        """
+        Pops up to `batch_size` due emails. Returns an empty batch and the time the next email is
+        due, or None if the queue is empty.
+        """
+        if not self._pending:
+            return [], None
+        if not self._flushing:
+            # While the server is unreachable, nothing is due before the next connection attempt
+            ready_at = max(self._pending[0][0], self._connect_at)
+            if ready_at > now:
+                return [], ready_at
+        batch = []
+        while self._pending and len(batch) < self.batch_size and (self._flushing or self._pending[0][0] <= now):
+            batch.append(heapq.heappop(self._pending)[2])
+        return batch, None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            batch, ready_at = self._next_batch(now)
+            if not batch:
+                if not self._pending:
+                    self._idle.set()
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), None if ready_at is None else ready_at - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self.in_flight = len(batch)
+            try:
+                failures, connected = await asyncio.to_thread(self._send_batch, batch)
+            except Exception as e:
+                print(f"Error sending email batch: {e}")
+                failures, connected = batch, True
+            self.sent += len(batch) - len(failures)
+            self.in_flight = 0
+
+            now = loop.time()
+            if connected:
+                self._connect_failures = 0
+                self._connect_at = 0.0
+            else:
+                self._connect_failures += 1
+                delay = min(self.retry_base_delay * 2 ** (self._connect_failures - 1), self.retry_max_delay)
+                self._connect_at = now + delay
+                print(f"SMTP server unreachable, next connection attempt in {delay:g}s")
+
+            for from_email, to_email, message, attempts in failures:
+                if attempts >= self.max_retries or self._flushing:
+                    self.failed += 1
+                    print(f"Giving up sending email to {to_email} after {attempts + 1} attempts")
+                    continue
+                self.retried += 1
+                delay = min(self.retry_base_delay * 2 ** attempts, self.retry_max_delay)
+                heapq.heappush(self._pending, (now + delay, next(self._sequence),
+                                               (from_email, to_email, message, attempts + 1)))
+
+    def _send_batch(self, batch):
+        """
+        Sends a batch over the persistent connection.
+
+        Returns:
+            Tuple[list, bool]: The emails that failed, and False if the server could not be
+                reached, in which case the rest of the batch is failed without further attempts.
+        """
+        failures = []
+        with self._smtp_lock:
+            for index, item in enumerate(batch):
+                from_email, to_email, message, _ = item
+                try:
+                    self._connection()
+                except (smtplib.SMTPException, OSError) as e:
+                    print(f"Error connecting to the SMTP server: {e}")
+                    self._disconnect()
+                    return failures + batch[index:], False
+                try:
+                    self._sendmail(from_email, to_email, message)
+                except (smtplib.SMTPException, OSError) as e:
+                    print(f"Error sending email to {to_email}: {e}")
+                    self._disconnect()
+                    failures.append(item)
+        return failures, True
+
+    def _sendmail(self, from_email, to_email, message):
+        try:
+            self._connection().sendmail(from_email, to_email, message)
+        except smtplib.SMTPServerDisconnected:
+            # The persistent connection was closed by the server; reconnect once
+            self._smtp = None
+            self._connection().sendmail(from_email, to_email, message)
+
+    def _connection(self):
+        if self._smtp is None:
+            smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+            smtp = smtp_class(self.host, self.port, timeout=self.timeout)
+            if self.password:
+                smtp.login(self.username, self.password)  # Use app password here
+            self._smtp = smtp
+        return self._smtp
+
+    def _disconnect(self):
+        smtp, self._smtp = self._smtp, None
+        if smtp is not None:
+            try:
+                smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                smtp.close()
+
+
+email_queue = EmailQueue(
+    SMTP_HOST,
+    SMTP_PORT,
+    SMTP_USE_SSL,
+    username=SENDER_EMAIL,
+    password=SENDER_EMAIL_PASSWORD,
+    batch_size=EMAIL_BATCH_SIZE,
+    max_retries=EMAIL_MAX_RETRIES,
+    retry_base_delay=EMAIL_RETRY_BASE_DELAY,
+    retry_max_delay=EMAIL_RETRY_MAX_DELAY,
+    timeout=SMTP_TIMEOUT,
+)
 
 
 def send_verification_email(to_email: str, token: str):
     """
-    Sends a verification email to the specified email address.
+    Enqueues a verification email to the specified email address. Must be called from a running
+    event loop; the email is sent by the background worker of `email_queue`.
     Args:
         to_email (str): The recipient's email address.
         token (str): The verification token to be included in the email.
@@ -33,10 +306,8 @@ def send_verification_email(to_email: str, token: str):
     msg["From"] = SENDER_EMAIL
     msg["To"] = to_email
     msg["Subject"] = "Email Verification"
-    
+
     body = f"Click the link to verify your email: {SERVER}/verify-email?token={token}"
     msg.attach(MIMEText(body, "plain"))
-    
-    with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-        server.login(SENDER_EMAIL, SENDER_EMAIL_PASSWORD)  # Use app password here
-        server.sendmail(SENDER_EMAIL, to_email, msg.as_string())
+
+    email_queue.enqueue(SENDER_EMAIL, to_email, msg.as_string())
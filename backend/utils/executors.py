@@ -0,0 +1,102 @@
+"""
+This module provides a bounded, asyncio-friendly wrapper around concurrent.futures executors.
+
+CPU-bound work submitted from `async def` handlers runs on the wrapped thread or process pool
+instead of the event loop. Each executor admits a fixed number of pending jobs; once that bound
+is reached, further submissions fail fast with `ExecutorSaturatedError` so callers can shed load
+(the API maps it to 503 Service Unavailable) instead of queueing without limit.
+
+Classes:
+    ExecutorSaturatedError: Raised when an executor has no room for another job.
+    BoundedExecutor: Runs callables on a lazily created pool with a bounded queue.
+"""
+import asyncio
+import functools
+import threading
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """
+    Raised when a job is submitted to a BoundedExecutor whose queue is full.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(f"The {name} executor is saturated, please retry later")
+        self.name = name
+
+
+class BoundedExecutor:
+    def __init__(self, executor_factory, max_pending: int, name: str):
+        """
+        Initializes the executor wrapper. The underlying pool is created on first use.
+
+        Args:
+            executor_factory (Callable[[], concurrent.futures.Executor]): Creates the pool.
+            max_pending (int): The maximum number of running plus queued jobs.
+            name (str): A name used in error messages and statistics.
+        """
+        self.executor_factory = executor_factory
+        self.max_pending = max_pending
+        self.name = name
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = self.executor_factory()
+        return self._executor
+
+    async def submit(self, fn, *args, **kwargs):
+        """
+        Runs `fn(*args, **kwargs)` on the pool and waits for its result without blocking the event loop.
+
+        Args:
+            fn (Callable): The function to run. Must be picklable for process pools.
+            *args: Positional arguments for `fn`.
+            **kwargs: Keyword arguments for `fn`.
+
+        Returns:
+            Any: The return value of `fn`.
+
+        Raises:
+            ExecutorSaturatedError: If `max_pending` jobs are already running or queued.
+        """
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise ExecutorSaturatedError(self.name)
+            self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+    def stats(self):
+        """
+        Returns the queue bound, current load and job counters of the executor.
+        """
+        return {
+            "name": self.name,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self, wait: bool = True):
+        """
+        Shuts down the underlying pool, if it was ever created.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
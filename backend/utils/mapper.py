@@ -1,26 +1,26 @@
-from models.product import Product
-from schemas.product import ProductCreate
+from typing import Dict, Iterable
 
 
-def convert_to_product_create(product: Product) -> ProductCreate:
+def convert_to_feature_batch(products: Iterable) -> Dict[str, list]:
     """
-    Converts a Product object (from the database) to a ProductCreate object.
+    Converts products into the columnar batch accepted by the `predict_many` methods of the
+    pricing and forecasting services and by `score_products`.
+
+    A missing customer rating is scored as 0.0, so every path prices a product the same way.
 
     Args:
-        product (Product): The Product object from the database.
+        products (Iterable): The products to convert: `ProductCreate` instances or result rows
+            with the feature and stock_available columns.
 
     Returns:
-        ProductCreate: The converted object.
+        Dict[str, list]: A mapping of feature column name to the values of every product.
     """
-    return ProductCreate(
-        name=product.name,
-        description=product.description,
-        cost_price=product.cost_price,
-        selling_price=product.selling_price,
-        category=product.category,
-        stock_available=product.stock_available,
-        units_sold=product.units_sold,
-        customer_rating=product.customer_rating if product.customer_rating is not None else 0.0,
-        demand_forecast=product.demand_forecast,
-        optimized_price=product.optimized_price
-    )
+    products = list(products)
+    return {
+        "cost_price": [product.cost_price for product in products],
+        "selling_price": [product.selling_price for product in products],
+        "units_sold": [product.units_sold for product in products],
+        "customer_rating": [product.customer_rating if product.customer_rating is not None else 0.0 for product in products],
+        "category": [product.category for product in products],
+        "stock_available": [product.stock_available for product in products],
+    }
@@ -0,0 +1,64 @@
+"""
+This module provides helpers for keyset (cursor) pagination.
+
+A cursor is an opaque, URL-safe token encoding the sort key values of the last row of a page.
+The next page starts strictly after that row, so page cost does not grow with the offset.
+
+Functions:
+    encode_cursor(values: list) -> str:
+        Encodes the sort key values of a row into a cursor.
+    decode_cursor(cursor: str, types: Sequence[type]) -> list:
+        Decodes a cursor back into sort key values of the expected types.
+"""
+import base64
+import json
+from typing import Sequence
+
+
+def encode_cursor(values: list) -> str:
+    """
+    Encodes the sort key values of the last row of a page into a cursor.
+
+    Args:
+        values (list): JSON-serializable sort key values, e.g. [selling_price, id].
+
+    Returns:
+        str: The URL-safe cursor.
+    """
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def _matches(value, expected: type) -> bool:
+    # JSON has no separate integer type for floats, and bool is a subclass of int
+    if isinstance(value, bool):
+        return expected is bool
+    if isinstance(value, int) and not -2 ** 63 <= value < 2 ** 63:
+        return False
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> list:
+    """
+    Decodes a cursor produced by `encode_cursor` and checks it against the sort key.
+
+    Args:
+        cursor (str): The cursor to decode.
+        types (Sequence[type]): The Python type of each sort key column, e.g. [float, int].
+
+    Returns:
+        list: The sort key values.
+
+    Raises:
+        ValueError: If the cursor is malformed or its values do not match `types`.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError("Invalid cursor")
+    if not all(_matches(value, expected) for value, expected in zip(values, types)):
+        raise ValueError("Invalid cursor: it does not match the sort key")
+    return values
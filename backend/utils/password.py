@@ -0,0 +1,71 @@
+"""
+This module provides password hashing and verification off the event loop.
+
+bcrypt is deliberately slow (~100-300 ms per hash at the default cost), so async handlers run it
+on a dedicated, bounded thread pool instead of the event loop. The bcrypt cost is taken from
+`BCRYPT_ROUNDS`; hashes created with any other cost are reported as outdated on verification so
+they can be transparently rehashed at login.
+
+Functions:
+    hash_password_async(password: str) -> str:
+        Hashes a password on the password hashing pool.
+    verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        Verifies a password on the password hashing pool and returns a new hash if the stored one is outdated.
+
+Variables:
+    pwd_context: The passlib context configured with the bcrypt cost.
+    password_executor: Bounded thread pool for hashing work.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+from passlib.context import CryptContext
+from core.config import settings
+from utils.executors import BoundedExecutor
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+password_executor = BoundedExecutor(
+    lambda: ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password"),
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    name="password hashing",
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hashes a plain text password with bcrypt on the password hashing pool.
+
+    Args:
+        password (str): The plain text password to be hashed.
+
+    Returns:
+        str: The hashed password.
+
+    Raises:
+        ExecutorSaturatedError: If the password hashing pool is saturated.
+    """
+    return await password_executor.submit(pwd_context.hash, password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies a password on the password hashing pool.
+
+    Args:
+        plain_password (str): The plain text password to verify.
+        hashed_password (str): The stored hash to compare against.
+
+    Returns:
+        Tuple[bool, Optional[str]]: Whether the password matches, and a replacement hash if it
+            matches but the stored hash uses an outdated bcrypt cost.
+
+    Raises:
+        ExecutorSaturatedError: If the password hashing pool is saturated.
+    """
+    return await password_executor.submit(pwd_context.verify_and_update, plain_password, hashed_password)
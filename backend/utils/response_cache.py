@@ -0,0 +1,312 @@
+"""
+This module caches serialized API responses, with ETag revalidation.
+
+Entries are stored in a backend that speaks a small subset of the Redis commands (`get`,
+`set` with `ex`/`nx`, `incr`): `MemoryCacheBackend` keeps them in the process and can stand in
+for Redis locally; with RESPONSE_CACHE_BACKEND=redis a `redis.asyncio` client is used directly, so
+every uvicorn worker shares the entries and invalidations.
+
+Invalidation is generation-based: every cache key embeds the current generation number and
+writers call `invalidate()`, which increments it. The memory backend keeps its entries per
+process but not its generation: that lives in the `cache_generations` table
+(`DatabaseGenerationCounter`), so a write made by another worker or by `reprice_catalog.py`
+invalidates every process, at the cost of one primary-key lookup per cached request. Entries of older generations are never read
+again and expire through the TTL (or the LRU bound in memory). A response computed while a
+write happens is stored under the generation read before the query, so it cannot outlive the
+write. Cache errors (e.g. Redis being down) are logged and the request is served uncached.
+
+Functions:
+    create_cache_backend(kind: str, redis_url: str, max_entries: int):
+        Builds the configured backend, or None when caching is off.
+    conditional_response(entry: CachedResponse, request: Request, cache_status: str) -> Response:
+        Serves an entry, or 304 Not Modified when the client already has it.
+Classes:
+    MemoryCacheBackend: An in-process, LRU-bounded implementation of the backend commands.
+    DatabaseGenerationCounter: Cache generations stored in the database, shared by all processes.
+    CachedResponse: A serialized response body with its ETag and headers.
+    ResponseCache: Generation-keyed response cache on top of a backend.
+
+Variables:
+    product_list_cache: The cache of GET /products pages.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+from fastapi import Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from core.config import settings
+from database.config import async_session
+from models.cache_generation import CacheGeneration
+
+CACHE_BACKENDS = ("memory", "redis", "off")
+
+
+class MemoryCacheBackend:
+    def __init__(self, max_entries: int):
+        """
+        Initializes an empty in-process backend.
+
+        Args:
+            max_entries (int): The maximum number of keys; the least recently used key is evicted first.
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set(self, key: str, value: bytes, ex: Optional[float]):
+        self._entries[key] = (time.monotonic() + ex if ex else None, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        Returns the value of `key`, or None if it is missing or expired.
+        """
+        with self._lock:
+            return self._get(key)
+
+    async def set(self, key: str, value, ex: Optional[float] = None, nx: bool = False) -> bool:
+        """
+        Stores `value` under `key`, expiring after `ex` seconds if given. With `nx`, only stores
+        it if the key does not exist.
+
+        Returns:
+            bool: Whether the value was stored.
+        """
+        with self._lock:
+            if nx and self._get(key) is not None:
+                return False
+            self._set(key, value if isinstance(value, bytes) else str(value).encode(), ex)
+            return True
+
+    async def incr(self, key: str) -> int:
+        """
+        Increments the integer stored under `key` (0 if missing) and returns the new value.
+        """
+        with self._lock:
+            value = int(self._get(key) or 0) + 1
+            self._set(key, str(value).encode(), None)
+            return value
+
+
+class DatabaseGenerationCounter:
+    """
+    Stores cache generations in the `cache_generations` table, so that processes with their own
+    memory backend still see each other's invalidations.
+    """
+
+    async def get(self, name: str) -> Optional[int]:
+        """
+        Returns the generation of cache `name`, or None if it was never incremented.
+        """
+        async with async_session() as session:
+            return await session.scalar(select(CacheGeneration.generation).where(CacheGeneration.name == name))
+
+    async def incr(self, name: str) -> int:
+        """
+        Atomically increments the generation of cache `name` and returns the new value. A missing
+        row starts from the current time in nanoseconds, so it is above any generation used before.
+        """
+        async with async_session() as session:
+            for _ in range(2):
+                result = await session.execute(
+                    update(CacheGeneration)
+                    .where(CacheGeneration.name == name)
+                    .values(generation=CacheGeneration.generation + 1)
+                    .returning(CacheGeneration.generation)
+                )
+                generation = result.scalar()
+                if generation is not None:
+                    await session.commit()
+                    return generation
+                generation = time.time_ns()
+                session.add(CacheGeneration(name=name, generation=generation))
+                try:
+                    await session.commit()
+                    return generation
+                except IntegrityError:
+                    # Another process created the row first; increment it instead
+                    await session.rollback()
+            raise RuntimeError(f"Could not increment the generation of cache {name!r}")
+
+
+def create_cache_backend(kind: str, redis_url: str, max_entries: int):
+    """
+    Builds the response cache backend.
+
+    Args:
+        kind (str): "memory", "redis" or "off".
+        redis_url (str): The Redis URL, used when `kind` is "redis".
+        max_entries (int): The size bound of the memory backend.
+
+    Returns:
+        MemoryCacheBackend | redis.asyncio.Redis | None: The backend, or None when caching is off.
+
+    Raises:
+        ValueError: If `kind` is unknown.
+        RuntimeError: If the redis backend is requested but the redis package is not installed.
+    """
+    if kind not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown response cache backend {kind!r}, expected one of: {', '.join(CACHE_BACKENDS)}")
+    if kind == "off":
+        return None
+    if kind == "memory":
+        return MemoryCacheBackend(max_entries)
+    try:
+        import redis.asyncio as redis
+    except ImportError as e:
+        raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the redis package (pip install redis)") from e
+    return redis.Redis.from_url(redis_url)
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    headers: dict
+
+    @classmethod
+    def build(cls, body: bytes, headers: Optional[dict] = None) -> "CachedResponse":
+        """
+        Wraps a serialized body, deriving its ETag from the content.
+        """
+        return cls(body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"', headers or {})
+
+    def encode(self) -> bytes:
+        # One JSON line of metadata followed by the raw body
+        return json.dumps({"etag": self.etag, "headers": self.headers}).encode() + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, data: bytes) -> "CachedResponse":
+        meta, body = data.split(b"\n", 1)
+        meta = json.loads(meta)
+        return cls(body, meta["etag"], meta["headers"])
+
+
+class ResponseCache:
+    def __init__(self, backend, namespace: str, ttl_seconds: float):
+        """
+        Initializes a cache over `backend`.
+
+        Args:
+            backend: A `create_cache_backend` backend, or None to disable the cache.
+            namespace (str): Prefix of every key, so several caches can share a backend.
+            ttl_seconds (float): How long an entry stays valid. 0 disables the cache.
+        """
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self._generation_key = f"{namespace}:generation"
+        # A memory backend is private to the process, so its generation must live in the database
+        self._generations = DatabaseGenerationCounter() if isinstance(backend, MemoryCacheBackend) else None
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.ttl_seconds > 0
+
+    async def generation(self) -> Optional[int]:
+        """
+        Returns the current generation, or None if the backend cannot be reached.
+
+        A missing generation (first use, or evicted by Redis) starts from the current time in
+        nanoseconds, so it is always above any generation used before.
+        """
+        try:
+            if self._generations is not None:
+                value = await self._generations.get(self.namespace)
+                return value if value is not None else 0
+            value = await self.backend.get(self._generation_key)
+            if value is None:
+                await self.backend.set(self._generation_key, time.time_ns(), nx=True)
+                value = await self.backend.get(self._generation_key)
+            return int(value)
+        except Exception as e:
+            print(f"Response cache unavailable: {e}")
+            return None
+
+    async def invalidate(self):
+        """
+        Makes every cached entry stale. Call it after committing a write to the cached data.
+        """
+        if not self.enabled:
+            return
+        try:
+            if self._generations is not None:
+                await self._generations.incr(self.namespace)
+            else:
+                await self.backend.incr(self._generation_key)
+        except Exception as e:
+            print(f"Response cache invalidation failed: {e}")
+
+    def key(self, generation: int, *parts) -> str:
+        """
+        Builds the key of an entry from the generation and the parts the response depends on.
+        """
+        digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+        return f"{self.namespace}:{generation}:{digest}"
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Returns the entry stored under `key`, or None.
+        """
+        try:
+            data = await self.backend.get(key)
+            return CachedResponse.decode(data) if data is not None else None
+        except Exception as e:
+            print(f"Response cache read failed: {e}")
+            return None
+
+    async def set(self, key: str, entry: CachedResponse):
+        """
+        Stores `entry` under `key` for `ttl_seconds`.
+        """
+        try:
+            await self.backend.set(key, entry.encode(), ex=self.ttl_seconds)
+        except Exception as e:
+            print(f"Response cache write failed: {e}")
+
+
+def conditional_response(entry: CachedResponse, request: Request, cache_status: str) -> Response:
+    """
+    Serves a JSON entry with its ETag, or an empty 304 Not Modified if the request's
+    If-None-Match header already names it.
+
+    Args:
+        entry (CachedResponse): The serialized response.
+        request (Request): The incoming request.
+        cache_status (str): "HIT", "MISS" or "BYPASS", reported in the X-Cache header.
+
+    Returns:
+        Response: The response to send.
+    """
+    headers = dict(entry.headers, ETag=entry.etag)
+    headers["Cache-Control"] = "private, no-cache"
+    headers["X-Cache"] = cache_status
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in tags or entry.etag in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+product_list_cache = ResponseCache(
+    create_cache_backend(settings.RESPONSE_CACHE_BACKEND, settings.RESPONSE_CACHE_REDIS_URL, settings.RESPONSE_CACHE_MAX_ENTRIES),
+    "products:list",
+    settings.RESPONSE_CACHE_TTL_SECONDS,
+)
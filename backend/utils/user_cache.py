@@ -0,0 +1,77 @@
+"""
+This module provides an in-process cache of authenticated users.
+
+Resolved users are cached by token subject (email) with a time-to-live and a bounded size, so
+authenticated requests do not need a users query each time. Code that changes a user's role or
+verification status must call `user_cache.invalidate(email)`.
+
+Classes:
+    UserCache: A thread-safe TTL + LRU cache.
+
+Variables:
+    user_cache: The shared cache used by `utils.dependencies.get_current_user`.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from core.config import settings
+
+
+class UserCache:
+    def __init__(self, max_size: int, ttl_seconds: float):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_size (int): The maximum number of cached entries; the least recently used entry is evicted first.
+            ttl_seconds (float): How long an entry stays valid. 0 disables the cache.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Returns the cached value for `key`, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        """
+        Caches `value` under `key` for `ttl_seconds`.
+        """
+        if self.ttl_seconds <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str):
+        """
+        Removes `key` from the cache.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Removes every entry from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.USER_CACHE_MAX_SIZE, settings.USER_CACHE_TTL_SECONDS)
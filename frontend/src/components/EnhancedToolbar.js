@@ -3,7 +3,7 @@ import SearchIcon from '@mui/icons-material/Search';
 import FilterListIcon from '@mui/icons-material/FilterList';
 import ArrowBackIcon from '@mui/icons-material/ArrowBack';
 import { useNavigate } from 'react-router-dom';
-import { useState, useEffect, useContext } from 'react';
+import { useState, useContext } from 'react';
 import AddIcon from '@mui/icons-material/Add';
 import Box from '@mui/material/Box';
 import AddProductModal from './AddProduct';
@@ -12,20 +12,14 @@ import { AuthContext } from './AuthProvider';
 
 
 function EnhancedTableToolbar(props) {
-  const { rows, selectedRows, handleFilter, handleSearch, handleProductSubmit, title, is_demand_forecast, handleDemandForeacstUpdate } = props;
+  const { categories = [], selectedRows, handleFilter, handleSearch, handleProductSubmit, title, is_demand_forecast, handleDemandForeacstUpdate } = props;
   const navigate = useNavigate();
   const [withDemandForecast, setWithDemandForecast] = useState(false);
   const [searchQuery, setSearchQuery] = useState('');
   const [filterCategory, setFilterCategory] = useState('');
-  const [uniqueCategories, setUniqueCategories] = useState([]);
   const [openCreateModal, setOpenCreateModal] = useState(false);
   const {user} = useContext(AuthContext)
 
-  useEffect(() => {
-    const uniqueCategories = [...new Set(rows.map((row) => row.category))];
-    setUniqueCategories(uniqueCategories);
-  }, [rows]);
-
   const handleDemandForecastChange = (event) => {
     setWithDemandForecast(event.target.checked);
   };
@@ -91,7 +85,7 @@ function EnhancedTableToolbar(props) {
           }}
         >
           <MenuItem value="">All</MenuItem>
-          {uniqueCategories.map((category) => (
+          {categories.map((category) => (
             <MenuItem key={category} value={category}>
               {category}
             </MenuItem>
@@ -12,7 +12,8 @@ import Paper from '@mui/material/Paper';
 import { visuallyHidden } from '@mui/utils';
 import EnhancedTableToolbar from './EnhancedToolbar';
 import WelcomeBar from './WelcomeBar'
-import apiService from '../utils/apiServices';
+import { fetchCategories } from '../utils/apiServices';
+import useProductPages, { SORTABLE_COLUMNS } from '../utils/useProductPages';
 
 
 const headCells = [
@@ -37,13 +38,6 @@ const columns = [
   { id: 'optimized_price', label: 'Optimized Price', minWidth: 100, align: 'right' }
 ];
 
-const getComparator = (order, orderBy) => {
-  return order === 'desc'
-    ? (a, b) => (b[orderBy] < a[orderBy] ? -1 : b[orderBy] > a[orderBy] ? 1 : 0)
-    : (a, b) => (a[orderBy] < b[orderBy] ? -1 : a[orderBy] > b[orderBy] ? 1 : 0);
-};
-
-
 function EnhancedTableHead(props) {
   const { order, orderBy, onRequestSort } = props;
   const createSortHandler = (property) => (event) => {
@@ -62,18 +56,20 @@ function EnhancedTableHead(props) {
             padding={headCell.disablePadding ? 'none' : 'normal'}
             sortDirection={orderBy === headCell.id ? order : false}
           >
-            <TableSortLabel
-              active={orderBy === headCell.id}
-              direction={orderBy === headCell.id ? order : 'asc'}
-              onClick={createSortHandler(headCell.id)}
-            >
-              {headCell.label}
-              {orderBy === headCell.id ? (
-                <Box component="span" sx={visuallyHidden}>
-                  {order === 'desc' ? 'sorted descending' : 'sorted ascending'}
-                </Box>
-              ) : null}
-            </TableSortLabel>
+            {SORTABLE_COLUMNS.includes(headCell.id) ? (
+              <TableSortLabel
+                active={orderBy === headCell.id}
+                direction={orderBy === headCell.id ? order : 'asc'}
+                onClick={createSortHandler(headCell.id)}
+              >
+                {headCell.label}
+                {orderBy === headCell.id ? (
+                  <Box component="span" sx={visuallyHidden}>
+                    {order === 'desc' ? 'sorted descending' : 'sorted ascending'}
+                  </Box>
+                ) : null}
+              </TableSortLabel>
+            ) : headCell.label}
           </TableCell>
         ))}
       </TableRow>
@@ -85,25 +81,20 @@ function EnhancedTableHead(props) {
 
 export default function EnhancedTable() {
   const token = localStorage.getItem('access_token');
-  const [order, setOrder] = React.useState('asc');
-  const [orderBy, setOrderBy] = React.useState('name');
-  const [page, setPage] = React.useState(0);
-  const [rowsPerPage, setRowsPerPage] = React.useState(10);
-  const [rows, setRows] = useState([])
-  const [filteredRows, setFilteredRows] = useState([])
   const [newProductAdded, setNewProductAdded] = useState(0)
-  const [isFiltered, setIsFilteredRows] = React.useState(false)
-  
+  const [categories, setCategories] = useState([])
+  const {
+    rows, page, rowsPerPage, order, orderBy, count,
+    changePage, changeRowsPerPage, requestSort, updateFilters,
+  } = useProductPages({ enabled: Boolean(token), refreshKey: newProductAdded });
 
   useEffect(() => {
 
     const fetchData = async () => {
       try {
-        const response = await apiService.get('/products')
-        const fetchedRows = await response.data;
-        setRows(fetchedRows);
+        setCategories(await fetchCategories());
       } catch (error) {
-        console.error('Error fetching data:', error);
+        console.error('Error fetching categories:', error);
       }
     };
 
@@ -112,79 +103,36 @@ export default function EnhancedTable() {
     }
   }, [newProductAdded, token]);
 
-  useEffect(() => {
-    setFilteredRows(rows);
-  }, [rows]);
-
-  const stableSort = (array, comparator) => {
-    return [...array].sort(comparator);
-  };
-  
-
  
   const handleRequestSort = (event, property) => {
-    const isAsc = orderBy === property && order === 'asc';
-    setOrder(isAsc ? 'desc' : 'asc');
-    setOrderBy(property);
+    requestSort(property);
   };
 
 
 
   const handleChangePage = (event, newPage) => {
-    setPage(newPage);
+    changePage(newPage);
   };
 
   const handleChangeRowsPerPage = (event) => {
-    setRowsPerPage(parseInt(event.target.value, 10));
-    setPage(0);
+    changeRowsPerPage(parseInt(event.target.value, 10));
   };
 
  
   const handleSearch = (searchQuery) => {
-    // Filter rows based on searchQuery
-    if(searchQuery) {
-      setIsFilteredRows(true)
-    }
-    else{
-      setIsFilteredRows(false)
-    }
-    const newRows = rows.filter((row) => {
-      const searchText = searchQuery.toLowerCase(); 
-      return (
-        row.name.toLowerCase().includes(searchText) || 
-        row.description.toLowerCase().includes(searchText) || 
-        row.category.toLowerCase().includes(searchText) 
-      );
-    });
-  
-    // Update the state with the filtered rows
-    setFilteredRows(newRows); 
+    // Search names, descriptions and categories on the server
+    updateFilters({ search: searchQuery });
   };
   
   const handleFilter = (filterCategory) => {
-    // Filter rows based on filterCategory
-    setIsFilteredRows(true)
-    if (rows && !filterCategory) {
-      setFilteredRows(rows); 
-    } else {
-      const newRows = rows.filter((row) => row.category === filterCategory);
-      setFilteredRows(newRows); 
-      
-    }
+    // Filter by category on the server; "All" clears the filter
+    updateFilters({ category: filterCategory });
   };
   
 
  
 
-  const emptyRows = Math.max(0, (1 + page) * rowsPerPage - (isFiltered ? filteredRows.length : rows.length));
-
-  const visibleRows = React.useMemo(() => {
-    const data = isFiltered ? filteredRows : rows;
-    return stableSort([...data], getComparator(order, orderBy)).slice(
-      page * rowsPerPage,
-      page * rowsPerPage + rowsPerPage
-    );
-  }, [order, orderBy, page, rowsPerPage, isFiltered ? filteredRows : rows]);
+  const emptyRows = page > 0 ? Math.max(0, rowsPerPage - rows.length) : 0;
 
 
   return (
@@ -192,7 +140,7 @@ export default function EnhancedTable() {
       <WelcomeBar/>
       <Paper sx={{ width: '100%', mb: 2 }}>
         <EnhancedTableToolbar 
-          rows={rows} 
+          categories={categories} 
           handleFilter={handleFilter} 
           handleSearch={handleSearch} 
           title="Pricing Optimization"
@@ -214,7 +162,7 @@ export default function EnhancedTable() {
                 columns={columns}
               />
               <TableBody>
-                {visibleRows.map((row, index) => {
+                {rows.map((row, index) => {
                   const labelId = `enhanced-table-checkbox-${index}`;
 
                   return (
@@ -254,7 +202,7 @@ export default function EnhancedTable() {
         <TablePagination
           rowsPerPageOptions={[10, 20, 30]}
           component="div"
-          count={isFiltered ? filteredRows.length : rows.length}
+          count={count}
           rowsPerPage={rowsPerPage}
           page={page}
           onPageChange={handleChangePage}
@@ -19,7 +19,8 @@ import EditProductDialog from './EditProduct';
 import WelcomeBar from './WelcomeBar'
 import { useContext } from 'react';
 import { AuthContext } from './AuthProvider';
-import apiService from '../utils/apiServices';
+import apiService, { fetchCategories } from '../utils/apiServices';
+import useProductPages, { SORTABLE_COLUMNS } from '../utils/useProductPages';
 
 
 
@@ -52,17 +53,6 @@ const columns = [
 ];
 
 
-const getComparator = (order, orderBy) => {
-  return order === 'desc'
-    ? (a, b) => (b[orderBy] < a[orderBy] ? -1 : b[orderBy] > a[orderBy] ? 1 : 0)
-    : (a, b) => (a[orderBy] < b[orderBy] ? -1 : a[orderBy] > b[orderBy] ? 1 : 0);
-};
-
-const stableSort = (array, comparator) => {
-  return [...array].sort(comparator);
-};
-
-
 function EnhancedTableHead(props) {
   const { onSelectAllClick, order, orderBy, numSelected, rowCount, onRequestSort } = props;
   const createSortHandler = (property) => (event) => {
@@ -94,18 +84,20 @@ function EnhancedTableHead(props) {
               padding={headCell.disablePadding ? 'none' : 'normal'}
               sortDirection={orderBy === headCell.id ? order : false}
             >
-              <TableSortLabel
-                active={orderBy === headCell.id}
-                direction={orderBy === headCell.id ? order : 'asc'}
-                onClick={createSortHandler(headCell.id)}
-              >
-                {headCell.label}
-                {orderBy === headCell.id ? (
-                  <Box component="span" sx={visuallyHidden}>
-                    {order === 'desc' ? 'sorted descending' : 'sorted ascending'}
-                  </Box>
-                ) : null}
-              </TableSortLabel>
+              {SORTABLE_COLUMNS.includes(headCell.id) ? (
+                <TableSortLabel
+                  active={orderBy === headCell.id}
+                  direction={orderBy === headCell.id ? order : 'asc'}
+                  onClick={createSortHandler(headCell.id)}
+                >
+                  {headCell.label}
+                  {orderBy === headCell.id ? (
+                    <Box component="span" sx={visuallyHidden}>
+                      {order === 'desc' ? 'sorted descending' : 'sorted ascending'}
+                    </Box>
+                  ) : null}
+                </TableSortLabel>
+              ) : headCell.label}
             </TableCell>
           );
         })}
@@ -119,30 +111,26 @@ function EnhancedTableHead(props) {
 
 export default function EnhancedTable() {
   const token = localStorage.getItem('access_token');
-  const [order, setOrder] = React.useState('asc');
-  const [orderBy, setOrderBy] = React.useState('name');
   const [selected, setSelected] = React.useState([]);
-  const [page, setPage] = React.useState(0);
-  const [rowsPerPage, setRowsPerPage] = React.useState(10);
-  const [rows, setRows] = useState([])
-  const [filteredRows, setFilteredRows] = useState([])
   const [newProductAdded, setNewProductAdded] = useState(0)
+  const [categories, setCategories] = useState([])
   const [selectedRows, setSelectedRows] = React.useState(selected || []);
   const [currentEditRow, setCurrentEditRow] = React.useState({});
   const [openEditDialog, setOpenEditDialog] = React.useState(false); 
-  const [isFiltered, setIsFiltered] = React.useState(false)
   const {user} = useContext(AuthContext);
+  const {
+    rows, page, rowsPerPage, order, orderBy, count,
+    changePage, changeRowsPerPage, requestSort, updateFilters,
+  } = useProductPages({ enabled: Boolean(token), refreshKey: newProductAdded });
 
   
   useEffect(() => {
 
     const fetchData = async () => {
       try {
-        const response = await apiService.get('/products');
-        const fetchedRows = await response.data;
-        setRows(fetchedRows);
+        setCategories(await fetchCategories());
       } catch (error) {
-        console.error('Error fetching data:', error);
+        console.error('Error fetching categories:', error);
       }
     };
 
@@ -151,15 +139,9 @@ export default function EnhancedTable() {
     }
   }, [newProductAdded, token]);
 
-  useEffect(() => {
-    setFilteredRows(rows);
-  }, [rows]);
-
  
   const handleRequestSort = (event, property) => {
-    const isAsc = orderBy === property && order === 'asc';
-    setOrder(isAsc ? 'desc' : 'asc');
-    setOrderBy(property);
+    requestSort(property);
   };
 
   const handleSelectAllClick = (event) => {
@@ -191,12 +173,11 @@ export default function EnhancedTable() {
   };
 
   const handleChangePage = (event, newPage) => {
-    setPage(newPage);
+    changePage(newPage);
   };
 
   const handleChangeRowsPerPage = (event) => {
-    setRowsPerPage(parseInt(event.target.value, 10));
-    setPage(0);
+    changeRowsPerPage(parseInt(event.target.value, 10));
   };
 
   
@@ -259,37 +240,13 @@ export default function EnhancedTable() {
 
 
   const handleSearch = (searchQuery) => {
-    // Filter rows based on searchQuery
-    if(searchQuery){
-      setIsFiltered(true)
-    }
-    else{
-      setIsFiltered(false)
-    }
-    const newRows = rows.filter((row) => {
-      const searchText = searchQuery.toLowerCase(); 
-      return (
-        row.name.toLowerCase().includes(searchText) || 
-        row.description.toLowerCase().includes(searchText) || 
-        row.category.toLowerCase().includes(searchText) 
-      );
-    });
-  
-    // Update the state with the filtered rows
-    setFilteredRows(newRows); 
+    // Search names, descriptions and categories on the server
+    updateFilters({ search: searchQuery });
   };
   
   const handleFilter = (filterCategory) => {
-    // Filter rows based on filterCategory
-    setIsFiltered(false)
-    if (!filterCategory) {
-      setFilteredRows(rows); 
-      
-    } else {
-      const newRows = rows.filter((row) => row.category === filterCategory);
-      setFilteredRows(newRows);
-      setIsFiltered(true) 
-    }
+    // Filter by category on the server; "All" clears the filter
+    updateFilters({ category: filterCategory });
   };
 
   const handleEditSubmit = (updatedRow) => {
@@ -331,16 +288,7 @@ export default function EnhancedTable() {
         fetchData();
   }
 
-  const emptyRows = Math.max(0, (1 + page) * rowsPerPage - (isFiltered ? filteredRows.length : rows.length));
-  
-    const visibleRows = React.useMemo(() => {
-      const data = isFiltered ? filteredRows : rows;
-      return stableSort([...data], getComparator(order, orderBy)).slice(
-        page * rowsPerPage,
-        page * rowsPerPage + rowsPerPage
-      );
-    }, [order, orderBy, page, rowsPerPage, isFiltered ? filteredRows : rows]);
-  
+  const emptyRows = page > 0 ? Math.max(0, rowsPerPage - rows.length) : 0;
   
 
   return (
@@ -348,7 +296,7 @@ export default function EnhancedTable() {
       <WelcomeBar />
       <Paper sx={{ width: '100%', mb: 2 }}>
         <EnhancedTableToolbar 
-          rows={rows} 
+          categories={categories} 
           selectedRows={selectedRows} 
           handleFilter={handleFilter} 
           handleSearch={handleSearch} 
@@ -360,7 +308,6 @@ export default function EnhancedTable() {
         <Box sx={{ overflowX: 'auto' }}>
           <TableContainer sx={{ maxHeight: 800, overflowX: 'auto' }}>
             <Table
-              key={filteredRows.length}
               stickyHeader
               aria-label="sticky table"
               sx={{ minWidth: 750 }} 
@@ -376,7 +323,7 @@ export default function EnhancedTable() {
                 userRole={user['role']}
               />
               <TableBody>
-                {visibleRows.map((row, index) => {
+                {rows.map((row, index) => {
                   const isItemSelected = selectedRows.indexOf(row.id) !== -1;
                   const labelId = `enhanced-table-checkbox-${index}`;
 
@@ -432,7 +379,7 @@ export default function EnhancedTable() {
         <TablePagination
           rowsPerPageOptions={[10, 20, 30]}
           component="div"
-          count={rows.length}
+          count={count}
           rowsPerPage={rowsPerPage}
           page={page}
           onPageChange={handleChangePage}
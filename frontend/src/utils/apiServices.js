@@ -34,4 +34,19 @@ apiService.interceptors.response.use(
   }
 );
 
+// Fetch one page of the keyset-paginated /products endpoint. Filters, sorting and the page size
+// are applied by the API; nextCursor is null on the last page
+export const fetchProductPage = async ({ cursor, ...params } = {}) => {
+  const response = await apiService.get('/products', {
+    params: { ...params, ...(cursor ? { cursor } : {}) },
+  });
+  return { products: response.data, nextCursor: response.headers['x-next-cursor'] || null };
+};
+
+// Fetch the product categories from the maintained statistics instead of the whole catalog
+export const fetchCategories = async () => {
+  const response = await apiService.get('/products/stats', { params: { group_by: 'category' } });
+  return response.data.map((group) => group.category).filter(Boolean);
+};
+
 export default apiService;
\ No newline at end of file
@@ -0,0 +1,102 @@
+import { useEffect, useState } from 'react';
+import { fetchProductPage } from './apiServices';
+
+// Columns GET /products can sort by; sorting on other columns would need the whole catalog
+export const SORTABLE_COLUMNS = ['name', 'selling_price'];
+
+// Load the product table one page at a time. The page size, sort order and filters are sent to
+// the API, and the cursor of every visited page is kept so that paging back does not start over
+export default function useProductPages({ enabled = true, refreshKey = 0 } = {}) {
+  const [rows, setRows] = useState([]);
+  const [page, setPage] = useState(0);
+  const [rowsPerPage, setRowsPerPage] = useState(10);
+  const [order, setOrder] = useState('asc');
+  const [orderBy, setOrderBy] = useState('name');
+  const [filters, setFilters] = useState({});
+  const [cursors, setCursors] = useState([null]);
+  const [nextCursor, setNextCursor] = useState(null);
+
+  useEffect(() => {
+    if (!enabled) {
+      return undefined;
+    }
+    let cancelled = false;
+    const fetchData = async () => {
+      try {
+        const result = await fetchProductPage({
+          limit: rowsPerPage,
+          sort: `${order === 'desc' ? '-' : ''}${orderBy}`,
+          cursor: cursors[page],
+          ...filters,
+        });
+        if (!cancelled) {
+          setRows(result.products);
+          setNextCursor(result.nextCursor);
+        }
+      } catch (error) {
+        console.error('Error fetching data:', error);
+      }
+    };
+    fetchData();
+    return () => {
+      cancelled = true;
+    };
+  }, [enabled, refreshKey, page, rowsPerPage, order, orderBy, filters, cursors]);
+
+  const restart = () => {
+    setPage(0);
+    setCursors([null]);
+  };
+
+  const changePage = (newPage) => {
+    if (newPage > page) {
+      if (!nextCursor) {
+        return;
+      }
+      setCursors((previous) => [...previous.slice(0, page + 1), nextCursor]);
+      setPage(page + 1);
+    } else {
+      setPage(newPage);
+    }
+  };
+
+  const changeRowsPerPage = (value) => {
+    setRowsPerPage(value);
+    restart();
+  };
+
+  const requestSort = (property) => {
+    if (!SORTABLE_COLUMNS.includes(property)) {
+      return;
+    }
+    setOrder(orderBy === property && order === 'asc' ? 'desc' : 'asc');
+    setOrderBy(property);
+    restart();
+  };
+
+  // Merge filter changes; empty values remove the filter
+  const updateFilters = (changes) => {
+    const merged = { ...filters, ...changes };
+    Object.keys(merged).forEach((key) => {
+      if (!merged[key]) {
+        delete merged[key];
+      }
+    });
+    setFilters(merged);
+    restart();
+  };
+
+  return {
+    rows,
+    page,
+    rowsPerPage,
+    order,
+    orderBy,
+    // -1 tells TablePagination the total is unknown while more pages follow
+    count: nextCursor ? -1 : page * rowsPerPage + rows.length,
+    changePage,
+    changeRowsPerPage,
+    requestSort,
+    updateFilters,
+  };
+}